@@ -0,0 +1,366 @@
+"""렌더링, 합성, 저장 경로 벤치마크
+
+합성 PDF와 스탬프를 만들어 pdf_to_image, insert_image_to_pdf, 일괄 저장(BatchExecutor)의
+시간, 최대 메모리(RSS), 출력 크기를 측정하고 JSON으로 기록합니다.
+각 측정은 새 프로세스에서 실행하므로 최대 메모리가 이전 측정의 영향을 받지 않습니다.
+
+사용법:
+    python -m benchmarks.run [--quick] [--dpi 150 300] [--output bench_results.json]
+    python -m benchmarks.run --compare 이전.json 새.json [--threshold 0.1]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    # Windows에는 resource 모듈이 없음
+    resource = None
+
+from core import batch, pdf_image_utils
+from core.config import RENDER_BACKEND, SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR
+from . import synthetic
+
+
+RESULTS_VERSION = 2
+
+# 스탬프 배치 (페이지 상대 단위)
+BENCH_STAMPS = [
+    {'name': 'small', 'x': 0.70, 'y': 0.85, 'width': 0.20, 'height': 0.06},
+    {'name': 'large', 'x': 0.10, 'y': 0.10, 'width': 0.50, 'height': 0.20},
+]
+
+
+def _peak_rss():
+    """현재 프로세스와 끝난 자식 프로세스(Poppler 등)의 최대 RSS (바이트)
+
+    Returns:
+        (자기 자신, 자식 프로세스 중 최대), 측정할 수 없으면 None
+    """
+    if resource is not None:
+        # 리눅스는 KB, macOS는 바이트 단위
+        unit = 1 if sys.platform == 'darwin' else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+        return own, children
+    try:
+        import psutil
+    except ImportError:
+        return None, None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', None), None
+
+
+def _stamps_for(corpus):
+    return [
+        {'path': corpus['stamps'][stamp['name']], 'x': stamp['x'], 'y': stamp['y'],
+         'width': stamp['width'], 'height': stamp['height']}
+        for stamp in BENCH_STAMPS
+    ]
+
+
+def _run_render(case, corpus, output_path):
+    pdf_path = corpus['pdfs'][case['pdf']]
+    if case['all_pages']:
+        pages = 0
+        for _ in pdf_image_utils.pdf_to_image(pdf_path, case['dpi'], -1):
+            pages += 1
+        return pages
+    pdf_image_utils.pdf_to_image(pdf_path, case['dpi'], 0)
+    return 1
+
+
+def _stamped_pages(case, pdf_path):
+    """스탬프를 넣은 페이지 수 (첫 페이지만이면 나머지 페이지는 변환 없이 복사되므로 세지 않음)"""
+    return pdf_image_utils.get_pdf_page_count(pdf_path) if case['all_pages'] else 1
+
+
+def _run_save(case, corpus, output_path):
+    pdf_path = corpus['pdfs'][case['pdf']]
+    page_size = pdf_image_utils.get_pdf_page_size(pdf_path, 0)
+    insert_infos = batch.relative_insert_infos(_stamps_for(corpus), page_size, case['dpi'])
+    pdf_image_utils.insert_image_to_pdf(
+        pdf_path, insert_infos, output_path, dpi=case['dpi'],
+        all_pages=case['all_pages'], engine=case['engine']
+    )
+    return _stamped_pages(case, pdf_path)
+
+
+def _run_batch(case, corpus, output_path):
+    # 같은 입력을 여러 번 복사해 일괄 저장과 같은 방식(프로세스 풀)으로 처리
+    output_dir = os.path.splitext(output_path)[0]
+    os.makedirs(output_dir, exist_ok=True)
+    pdf_path = corpus['pdfs'][case['pdf']]
+    jobs = []
+    for index in range(case['files']):
+        copy_path = os.path.join(output_dir, f'input_{index}.pdf')
+        shutil.copyfile(pdf_path, copy_path)
+        jobs.append({
+            'pdf_path': copy_path,
+            'save_path': batch.output_path_for(copy_path, output_dir),
+            'stamps': _stamps_for(corpus),
+            'dpi': case['dpi'],
+            'all_pages': case['all_pages'],
+            'engine': case['engine']
+        })
+    executor = batch.BatchExecutor(jobs, max_workers=case.get('workers'))
+    executor.start()
+    for _ in jobs:
+        kind, _, job, result = executor.events.get()
+        if kind == 'error':
+            executor.cancel()
+            raise RuntimeError(f'{job["pdf_path"]}: {result}')
+    executor.shutdown()
+    return _stamped_pages(case, pdf_path) * len(jobs)
+
+
+def _output_bytes(output_path):
+    """출력 파일(또는 일괄 저장 출력 폴더의 결과 파일들) 크기 합계"""
+    if os.path.isfile(output_path):
+        return os.path.getsize(output_path)
+    output_dir = os.path.splitext(output_path)[0]
+    if not os.path.isdir(output_dir):
+        return None
+    return sum(
+        os.path.getsize(os.path.join(output_dir, name))
+        for name in os.listdir(output_dir) if name.endswith('_edited.pdf')
+    )
+
+
+_RUNNERS = {
+    'render': _run_render,
+    'save': _run_save,
+    'batch': _run_batch,
+}
+
+
+def _measure(case, corpus, output_path, results):
+    """측정용 자식 프로세스에서 실행"""
+    try:
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        pages = _RUNNERS[case['kind']](case, corpus, output_path)
+        wall = time.perf_counter() - started_wall
+        cpu = time.process_time() - started_cpu
+        peak_rss, child_peak_rss = _peak_rss()
+        results.put({
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'pages': pages,
+            'peak_rss_bytes': peak_rss,
+            'child_peak_rss_bytes': child_peak_rss,
+            'output_bytes': _output_bytes(output_path),
+            'error': None
+        })
+    except Exception as e:
+        results.put({'error': f'{type(e).__name__}: {e}'})
+
+
+def run_case(case, corpus, work_dir, repeat=1):
+    """한 측정 항목을 repeat번 실행하고 결과를 요약
+
+    시간은 가장 빠른 값과 중앙값, 메모리는 가장 큰 값을 기록합니다.
+    pages_processed와 pages_per_s는 렌더링하거나 스탬프를 넣은 페이지 기준입니다.
+    """
+    context = multiprocessing.get_context('spawn')
+    runs = []
+    for attempt in range(repeat):
+        output_path = os.path.join(work_dir, f'{case["id"].replace("/", "_")}_{attempt}.pdf')
+        results = context.Queue()
+        process = context.Process(target=_measure, args=(case, corpus, output_path, results))
+        process.start()
+        result = results.get()
+        process.join()
+        if result['error'] is not None:
+            return dict(case, error=result['error'])
+        runs.append(result)
+
+    walls = [run['wall_s'] for run in runs]
+    peaks = [run['peak_rss_bytes'] for run in runs if run['peak_rss_bytes'] is not None]
+    child_peaks = [run['child_peak_rss_bytes'] for run in runs if run['child_peak_rss_bytes'] is not None]
+    pages = runs[0]['pages']
+    best = min(walls)
+    return dict(
+        case,
+        wall_s=best,
+        wall_median_s=statistics.median(walls),
+        wall_runs=walls,
+        cpu_s=min(run['cpu_s'] for run in runs),
+        pages_processed=pages,
+        pages_per_s=pages / best if best > 0 else None,
+        peak_rss_bytes=max(peaks) if peaks else None,
+        child_peak_rss_bytes=max(child_peaks) if child_peaks else None,
+        output_bytes=runs[0]['output_bytes'],
+        error=None
+    )
+
+
+def build_cases(dpis, page_counts, engines, page_sizes=tuple(synthetic.PAGE_SIZES), batch_files=8, quick=False):
+    """측정 항목 목록 생성
+
+    각 항목의 id는 실행 간 비교에 쓰이는 고정 키입니다.
+    """
+    cases = []
+    kinds = ('vector', 'scanned')
+    for dpi in dpis:
+        for page_size in page_sizes:
+            for kind in kinds:
+                for pages in page_counts:
+                    pdf = f'{kind}_{pages}p_{page_size}'
+                    modes = (False,) if pages == 1 else (False, True)
+                    for all_pages in modes:
+                        mode = 'all' if all_pages else 'first'
+                        cases.append({'id': f'render/{pdf}/{mode}/{dpi}dpi', 'kind': 'render',
+                                      'pdf': pdf, 'dpi': dpi, 'all_pages': all_pages})
+                        for engine in engines:
+                            cases.append({'id': f'save/{engine}/{pdf}/{mode}/{dpi}dpi', 'kind': 'save',
+                                          'pdf': pdf, 'dpi': dpi, 'all_pages': all_pages, 'engine': engine})
+        if quick:
+            continue
+        # 일괄 저장: 첫 번째 페이지 크기의 가장 긴 문서를 여러 개 복사해 프로세스 풀로 처리
+        pdf = f'vector_{max(page_counts)}p_{page_sizes[0]}'
+        for engine in engines:
+            cases.append({'id': f'batch/{engine}/{pdf}x{batch_files}/all/{dpi}dpi', 'kind': 'batch',
+                          'pdf': pdf, 'dpi': dpi, 'all_pages': True, 'engine': engine,
+                          'files': batch_files})
+    return cases
+
+
+def _environment():
+    """결과 비교에 필요한 실행 환경 정보"""
+    versions = {}
+    for module in ('PIL', 'PyPDF2', 'pdf2image', 'pypdfium2'):
+        try:
+            versions[module] = getattr(__import__(module), '__version__', None)
+        except ImportError:
+            versions[module] = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'render_backend': RENDER_BACKEND,
+        'packages': versions
+    }
+
+
+def run_benchmarks(cases, work_dir, repeat=1, page_counts=(1, 20), page_sizes=tuple(synthetic.PAGE_SIZES),
+                   log=print):
+    """모든 항목을 실행하고 결과 문서(dict)를 반환"""
+    corpus = synthetic.make_corpus(os.path.join(work_dir, 'corpus'), page_counts, page_sizes)
+    results = []
+    for number, case in enumerate(cases, 1):
+        result = run_case(case, corpus, work_dir, repeat)
+        results.append(result)
+        if result['error']:
+            log(f'[{number}/{len(cases)}] {case["id"]}: 실패 ({result["error"]})')
+        else:
+            log(f'[{number}/{len(cases)}] {case["id"]}: {result["wall_s"]:.3f}s, '
+                f'RSS {_format_bytes(result["peak_rss_bytes"])}, 출력 {_format_bytes(result["output_bytes"])}')
+    return {
+        'version': RESULTS_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': _environment(),
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def _format_bytes(value):
+    if value is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f'{value:.0f}{unit}' if unit == 'B' else f'{value:.1f}{unit}'
+        value /= 1024
+
+
+def compare_results(base, new, threshold=0.10):
+    """두 결과 문서를 항목 id별로 비교
+
+    Returns:
+        ([{ 'id', 'metric', 'base', 'new', 'ratio', 'regressed' }, ...], 느려지거나 커진 항목 수)
+    """
+    base_by_id = {result['id']: result for result in base['results'] if not result.get('error')}
+    rows = []
+    regressions = 0
+    for result in new['results']:
+        old = base_by_id.get(result['id'])
+        if old is None or result.get('error'):
+            continue
+        for metric in ('wall_s', 'peak_rss_bytes', 'output_bytes'):
+            before, after = old.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            ratio = after / before
+            regressed = ratio > 1 + threshold
+            regressions += regressed
+            rows.append({'id': result['id'], 'metric': metric, 'base': before, 'new': after,
+                         'ratio': ratio, 'regressed': regressed})
+    return rows, regressions
+
+
+def _print_comparison(rows, regressions, threshold):
+    for row in rows:
+        mark = '  느려짐/커짐' if row['regressed'] else ''
+        print(f'{row["id"]:<48} {row["metric"]:<15} {row["base"]:>12.4g} -> {row["new"]:<12.4g} '
+              f'x{row["ratio"]:.2f}{mark}')
+    print(f'{len(rows)}개 지표 중 {regressions}개가 {threshold:.0%} 넘게 나빠졌습니다.')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='렌더링/합성/저장 경로 벤치마크')
+    parser.add_argument('--dpi', type=int, nargs='+', default=[150, 300], help='측정할 출력 해상도')
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 20], help='합성 PDF 페이지 수')
+    parser.add_argument('--page-size', nargs='+', default=list(synthetic.PAGE_SIZES),
+                        choices=list(synthetic.PAGE_SIZES), help='합성 PDF 페이지 크기')
+    parser.add_argument('--engine', nargs='+', default=[SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR],
+                        choices=[SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR], help='측정할 저장 엔진')
+    parser.add_argument('--repeat', type=int, default=3, help='항목별 반복 횟수')
+    parser.add_argument('--batch-files', type=int, default=8, help='일괄 저장 측정에 쓸 파일 수')
+    parser.add_argument('--filter', default=None, help='id에 이 문자열이 들어간 항목만 실행')
+    parser.add_argument('--quick', action='store_true', help='일괄 저장 항목을 빼고 한 번씩만 실행')
+    parser.add_argument('--work-dir', default=None, help='입력/출력 파일 폴더 (기본: 임시 폴더)')
+    parser.add_argument('--output', default='bench_results.json', help='결과 JSON 파일')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='두 결과 파일 비교')
+    parser.add_argument('--threshold', type=float, default=0.10, help='비교 시 나빠졌다고 볼 비율')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as file:
+            base = json.load(file)
+        with open(args.compare[1], 'r', encoding='utf-8') as file:
+            new = json.load(file)
+        rows, regressions = compare_results(base, new, args.threshold)
+        _print_comparison(rows, regressions, args.threshold)
+        return 1 if regressions else 0
+
+    cases = build_cases(args.dpi, args.pages, args.engine, tuple(args.page_size), args.batch_files, args.quick)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case['id']]
+    repeat = 1 if args.quick else max(1, args.repeat)
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='pdf-image-editor-bench-')
+    try:
+        document = run_benchmarks(cases, work_dir, repeat, tuple(args.pages), tuple(args.page_size))
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(document, file, ensure_ascii=False, indent=2)
+    failed = sum(1 for result in document['results'] if result['error'])
+    print(f'{len(cases)}개 항목 측정 완료 ({failed}개 실패), 결과: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
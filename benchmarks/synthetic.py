@@ -0,0 +1,139 @@
+"""벤치마크용 합성 PDF와 스탬프 이미지 생성
+
+외부 파일 없이 같은 입력을 언제든 다시 만들 수 있도록 난수 시드를 고정합니다.
+"""
+import os
+import random
+import PyPDF2
+from PyPDF2.generic import DecodedStreamObject, DictionaryObject, NameObject
+from PIL import Image, ImageDraw
+from core.pdf_stream_writer import StreamingPDFWriter
+
+
+# 페이지 크기 (pt)
+PAGE_SIZES = {
+    'a4': (595.0, 842.0),
+    'letter': (612.0, 792.0),
+    'a3': (842.0, 1191.0),
+    'a4_landscape': (842.0, 595.0),
+}
+
+
+def _vector_content(width, height, rng):
+    """텍스트 줄과 표 선으로 이루어진 페이지 내용 스트림"""
+    ops = ['0.2 0.2 0.2 RG 0.5 w']
+    # 표 격자
+    top = height - 200
+    for row in range(12):
+        y = top - row * 18
+        ops.append(f'50 {y:.1f} m {width - 50:.1f} {y:.1f} l S')
+    for col in range(5):
+        x = 50 + col * (width - 100) / 4
+        ops.append(f'{x:.1f} {top:.1f} m {x:.1f} {top - 198:.1f} l S')
+    # 본문 텍스트
+    ops.append('BT /F1 10 Tf 12 TL')
+    ops.append(f'50 {height - 60:.1f} Td')
+    words = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit']
+    for _ in range(int((height - 500) / 12)):
+        line = ' '.join(rng.choice(words) for _ in range(12))
+        ops.append(f'({line}) Tj T*')
+    ops.append('ET')
+    return '\n'.join(ops).encode()
+
+
+def make_vector_pdf(path, pages, page_size='a4', rotation=0, seed=0):
+    """텍스트와 선으로만 이루어진 (벡터) PDF 생성"""
+    rng = random.Random(seed)
+    width, height = PAGE_SIZES[page_size]
+    writer = PyPDF2.PdfWriter()
+    font = DictionaryObject({
+        NameObject('/Type'): NameObject('/Font'),
+        NameObject('/Subtype'): NameObject('/Type1'),
+        NameObject('/BaseFont'): NameObject('/Helvetica'),
+    })
+    font_ref = writer._add_object(font)
+    for _ in range(pages):
+        writer.add_blank_page(width, height)
+        page = writer.pages[-1]
+        stream = DecodedStreamObject()
+        stream.set_data(_vector_content(width, height, rng))
+        page[NameObject('/Contents')] = writer._add_object(stream)
+        page[NameObject('/Resources')] = DictionaryObject({
+            NameObject('/Font'): DictionaryObject({NameObject('/F1'): font_ref})
+        })
+        if rotation:
+            page.rotate(rotation)
+    with open(path, 'wb') as file:
+        writer.write(file)
+    return path
+
+
+def _scan_page(width, height, rng):
+    """종이 질감과 글자 덩어리를 흉내 낸 스캔 페이지 이미지"""
+    img = Image.effect_noise((width, height), 12).point(lambda v: 215 + v // 8)
+    draw = ImageDraw.Draw(img)
+    margin = width // 12
+    line_h = max(4, height // 70)
+    y = margin
+    while y < height - margin:
+        x = margin
+        while x < width - margin:
+            word_w = rng.randint(line_h * 2, line_h * 6)
+            draw.rectangle((x, y, min(x + word_w, width - margin), y + line_h * 2 // 3), fill=rng.randint(20, 70))
+            x += word_w + line_h
+        y += line_h * 3 // 2
+    return img.convert('RGB')
+
+
+def make_scanned_pdf(path, pages, page_size='a4', dpi=150, seed=0):
+    """페이지 전체가 이미지 한 장인 (스캔본) PDF 생성"""
+    rng = random.Random(seed)
+    width, height = PAGE_SIZES[page_size]
+    pixels = (int(width * dpi / 72), int(height * dpi / 72))
+    with StreamingPDFWriter(path, dpi=dpi) as writer:
+        for _ in range(pages):
+            writer.add_page(_scan_page(*pixels, rng))
+    return path
+
+
+def make_stamp(path, size, seed=0):
+    """반투명 가장자리가 있는 RGBA 스탬프 이미지 (PNG) 생성"""
+    rng = random.Random(seed)
+    width, height = size
+    img = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    color = (rng.randint(120, 220), rng.randint(0, 60), rng.randint(0, 60))
+    border = max(2, min(size) // 12)
+    for step in range(border):
+        alpha = int(255 * (step + 1) / border)
+        draw.ellipse((step, step, width - 1 - step, height - 1 - step), outline=color + (alpha,))
+    draw.ellipse((border, border, width - 1 - border, height - 1 - border), fill=color + (160,))
+    img.save(path)
+    return path
+
+
+def make_corpus(directory, page_counts=(1, 20), page_sizes=tuple(PAGE_SIZES)):
+    """벤치마크 입력 일체를 directory에 생성 (이미 있으면 재사용)
+
+    Returns:
+        {
+            'pdfs': { 이름: 경로, ... }  예) 'vector_20p_a4', 'scanned_1p_a4_landscape'
+            'stamps': { 'small': 경로, 'large': 경로 }
+        }
+    """
+    os.makedirs(directory, exist_ok=True)
+    corpus = {'pdfs': {}, 'stamps': {}}
+    for page_size in page_sizes:
+        for pages in page_counts:
+            for kind, make in (('vector', make_vector_pdf), ('scanned', make_scanned_pdf)):
+                name = f'{kind}_{pages}p_{page_size}'
+                path = os.path.join(directory, f'{name}.pdf')
+                if not os.path.exists(path):
+                    make(path, pages, page_size)
+                corpus['pdfs'][name] = path
+    for name, size in (('small', (300, 120)), ('large', (2400, 960))):
+        path = os.path.join(directory, f'stamp_{name}.png')
+        if not os.path.exists(path):
+            make_stamp(path, size)
+        corpus['stamps'][name] = path
+    return corpus
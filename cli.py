@@ -0,0 +1,195 @@
+"""GUI 없이 작업 명세(JSON)대로 PDF에 이미지를 일괄 삽입하는 명령줄 진입점
+
+사용법: python cli.py job.json [--workers N] [--report report.json]
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+from core import batch, instrumentation, layout, manifest
+from core.config import (
+    DEFAULT_ENCODING_PROFILE, DEFAULT_SAVE_ENGINE, ENCODING_PROFILES, SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR
+)
+from core.page_selection import parse_page_rule, rule_from_options
+
+_STAMP_KEYS = ('path', 'x', 'y', 'width', 'height')
+
+
+def load_job_spec(spec_path):
+    """작업 명세 파일을 읽고 경로를 명세 파일 위치 기준으로 정리"""
+    with open(spec_path, 'r', encoding='utf-8') as file:
+        spec = json.load(file)
+
+    base_dir = os.path.dirname(os.path.abspath(spec_path))
+
+    def resolve(path):
+        return os.path.join(base_dir, os.path.expanduser(path))
+
+    pdf_paths = []
+    for pattern in spec.get('inputs', []):
+        for path in sorted(glob.glob(resolve(pattern), recursive=True)):
+            if path.lower().endswith('.pdf') and path not in pdf_paths:
+                pdf_paths.append(path)
+
+    # 레이아웃 파일(에디터에서 저장)을 지정하면 stamps 대신 사용
+    stamp_specs = spec.get('stamps', [])
+    if spec.get('layout'):
+        stamp_specs = layout.load_layout(resolve(spec['layout']))['stamps']
+
+    stamps = []
+    for i, stamp in enumerate(stamp_specs, 1):
+        if not isinstance(stamp, dict):
+            raise ValueError(f'스탬프 {i}: 항목은 객체여야 합니다')
+        missing = [key for key in _STAMP_KEYS if key not in stamp]
+        if missing:
+            raise ValueError(f'스탬프 {i}: 필수 항목이 없습니다 ({", ".join(missing)})')
+        entry = {'path': resolve(stamp['path'])}
+        for key in _STAMP_KEYS[1:]:
+            try:
+                entry[key] = float(stamp[key])
+            except (TypeError, ValueError):
+                raise ValueError(f'스탬프 {i}: {key} 값이 숫자가 아닙니다 ({stamp[key]!r})') from None
+        stamps.append(entry)
+
+    # 'pages' 규칙이 없으면 예전 'all_pages' 옵션으로 결정
+    pages = rule_from_options(spec.get('pages'), bool(spec.get('all_pages', False)))
+    parse_page_rule(pages)
+
+    encoding = spec.get('encoding', DEFAULT_ENCODING_PROFILE)
+    if encoding not in ENCODING_PROFILES:
+        raise ValueError(f'알 수 없는 인코딩 프로필: {encoding} (사용 가능: {", ".join(ENCODING_PROFILES)})')
+
+    engine = spec.get('engine', DEFAULT_SAVE_ENGINE)
+    if engine not in (SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR):
+        raise ValueError(f'알 수 없는 저장 엔진: {engine} (사용 가능: {SAVE_ENGINE_RASTER}, {SAVE_ENGINE_VECTOR})')
+
+    return {
+        'pdf_paths': pdf_paths,
+        'stamps': stamps,
+        'pages': pages,
+        'dpi': int(spec.get('dpi', 300)),
+        'engine': engine,
+        'encoding': encoding,
+        'output_dir': resolve(spec.get('output_dir', 'output')),
+        'workers': spec.get('workers')
+    }
+
+
+def build_jobs(spec):
+    """작업 명세를 PDF별 일괄 저장 작업 목록으로 변환
+
+    입력이 여러 폴더에 있으면 공통 폴더 기준의 하위 폴더 구조를 출력 폴더 아래에 만듭니다.
+
+    Raises:
+        ValueError: 두 입력 PDF의 출력 경로가 같은 경우
+    """
+    save_paths = batch.output_paths_for(spec['pdf_paths'], spec['output_dir'])
+    jobs = []
+    for pdf_path, save_path in zip(spec['pdf_paths'], save_paths):
+        jobs.append({
+            'pdf_path': pdf_path,
+            'save_path': save_path,
+            'stamps': spec['stamps'],
+            'dpi': spec['dpi'],
+            'pages': spec['pages'],
+            'engine': spec['engine'],
+            'encoding': spec['encoding']
+        })
+    return jobs
+
+
+def run(spec, workers=None, quiet=False, report_path=None, force=False):
+    """작업을 실행하고 실패한 파일 수를 반환
+
+    출력 폴더의 매니페스트와 비교해 변경 없는 PDF는 건너뛰고 (force이면 모두 다시 저장),
+    report_path가 있으면 단계별 보고서를 기록합니다.
+    """
+    jobs = build_jobs(spec)
+    if report_path:
+        # 보고서를 남길 때만 인코딩 프로필로 절약한 용량을 측정 (페이지를 한 번 더 인코딩)
+        jobs = [dict(job, measure_savings=True) for job in jobs]
+    if not jobs:
+        print('입력 PDF가 없습니다.', file=sys.stderr)
+        return 0
+    if not spec['stamps']:
+        print('삽입할 이미지가 없습니다.', file=sys.stderr)
+        return len(jobs)
+
+    os.makedirs(spec['output_dir'], exist_ok=True)
+    for job in jobs:
+        os.makedirs(os.path.dirname(job['save_path']), exist_ok=True)
+
+    job_manifest = manifest.JobManifest(spec['output_dir'])
+    if force:
+        jobs, skipped = [dict(job, hash_input=True) for job in jobs], []
+    else:
+        jobs, skipped = job_manifest.split(jobs)
+    if skipped:
+        print(f'변경 없는 PDF {len(skipped)}개 건너뜀')
+    if not jobs:
+        job_manifest.save(force=True)
+        return 0
+
+    executor = batch.BatchExecutor(jobs, max_workers=workers or spec['workers'])
+    executor.start()
+    progress = instrumentation.BatchProgress(len(jobs))
+    finished = 0
+    failed = 0
+    try:
+        while finished < len(jobs):
+            kind, index, job, result = executor.events.get()
+            finished += 1
+            progress.add(executor.reports.get(index))
+            job_manifest.record(job, kind, executor.reports.get(index), result if kind == 'error' else None)
+            if kind == 'error':
+                failed += 1
+                print(f'[{finished}/{len(jobs)}] 오류 {job["pdf_path"]}: {result}', file=sys.stderr)
+            elif not quiet:
+                eta = instrumentation.format_duration(progress.eta_seconds())
+                print(f'[{finished}/{len(jobs)}] {result} ({progress.pages_per_second():.1f} 페이지/초, 남은 시간 약 {eta})')
+    except KeyboardInterrupt:
+        executor.cancel()
+        job_manifest.save(force=True)
+        print('취소되었습니다.', file=sys.stderr)
+        return len(jobs) - (finished - failed)
+    executor.shutdown()
+    job_manifest.save(force=True)
+
+    if report_path:
+        instrumentation.write_report(report_path, progress)
+    print(f'전체 {len(jobs)}개 중 {len(jobs) - failed}개 저장 완료 '
+          f'({progress.pages}페이지, {instrumentation.format_duration(progress.elapsed)})')
+    counters = progress.summary()['counters']
+    if counters.get('render_pages'):
+        print(f'렌더링 {counters["render_pages"]}페이지, 페이지당 {counters["render_ms"] / counters["render_pages"]:.0f}ms')
+    saved_bytes = counters.get('saved_bytes', 0)
+    if saved_bytes > 0:
+        print(f'인코딩 프로필로 {saved_bytes / (1024 * 1024):.1f}MB 절약')
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PDF 이미지 일괄 삽입 (GUI 없이 실행)')
+    parser.add_argument('job', help='작업 명세 JSON 파일')
+    parser.add_argument('--workers', type=int, default=None, help='작업자 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--quiet', action='store_true', help='성공한 파일은 출력하지 않음')
+    parser.add_argument('--force', action='store_true', help='변경 없는 PDF도 모두 다시 저장')
+    parser.add_argument('--report', default=None, help='파일/단계별 처리 시간 보고서 (.json 또는 .csv)')
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_job_spec(args.job)
+        failed = run(spec, workers=args.workers, quiet=args.quiet, report_path=args.report, force=args.force)
+    except ValueError as e:
+        # 잘못된 명세는 작업자 프로세스를 띄우기 전에 알림
+        print(f'작업 명세 오류: {e}', file=sys.stderr)
+        return 2
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    # 작업자 풀을 spawn으로 띄우므로 실행 파일로 묶었을 때 자식 프로세스가 main()을 다시 실행하지 않도록
+    multiprocessing.freeze_support()
+    sys.exit(main())
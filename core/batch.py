@@ -0,0 +1,235 @@
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from . import instrumentation, layout, manifest, pdf_image_utils
+from .page_selection import rule_from_options, select_pages
+from .pdf_metadata import read_pdf_metadata
+from .placement import PlacementPlanner, relative_insert_infos
+from .config import BATCH_MAX_WORKERS, DEFAULT_ENCODING_PROFILE, DEFAULT_SAVE_ENGINE, ENCODING_MEASURE_SAVINGS
+
+
+def build_insert_infos(inserted_images, scale_x, scale_y):
+    """미리보기 좌표의 삽입 이미지 목록을 출력 해상도 기준 insert_infos로 변환"""
+    insert_infos = []
+    for img in inserted_images:
+        x = int(img['pos'][0] * scale_x)
+        y = int(img['pos'][1] * scale_y)
+        w = int(img['size'][0] * scale_x)
+        h = int(img['size'][1] * scale_y)
+        insert_infos.append({
+            'path': img['path'],
+            'pos': (x, y),
+            'size': (w, h)
+        })
+    return insert_infos
+
+
+def output_path_for(pdf_path, output_dir, input_root=None):
+    """입력 PDF에 대응하는 출력 파일 경로 (원본이름_edited.pdf)
+
+    Args:
+        pdf_path: 입력 PDF 경로
+        output_dir: 출력 폴더
+        input_root: 주어지면 이 폴더 기준의 하위 폴더 구조를 출력 폴더 아래에 그대로 만듦
+            (다른 폴더에 있는 같은 이름의 PDF가 서로 덮어쓰지 않도록)
+    """
+    base_name = os.path.basename(pdf_path)
+    root, ext = os.path.splitext(base_name)
+    # 확장자는 대소문자 구분 없이 비교 (X.PDF -> X_edited.PDF)
+    name = f'{root}_edited{ext}' if ext.lower() == '.pdf' else f'{base_name}_edited.pdf'
+    if input_root is not None:
+        sub_dir = os.path.relpath(os.path.dirname(os.path.abspath(pdf_path)), os.path.abspath(input_root))
+        if sub_dir != os.curdir:
+            output_dir = os.path.join(output_dir, sub_dir)
+    return os.path.join(output_dir, name)
+
+
+
+def input_root(pdf_paths):
+    """입력 PDF들이 들어 있는 가장 가까운 공통 폴더 (드라이브가 달라 구할 수 없으면 None)"""
+    if not pdf_paths:
+        return None
+    try:
+        return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in pdf_paths])
+    except ValueError:
+        return None
+
+
+def output_paths_for(pdf_paths, output_dir):
+    """입력 PDF 목록의 출력 파일 경로 목록
+
+    입력이 여러 폴더에 있으면 공통 폴더 기준의 하위 폴더 구조를 출력 폴더 아래에 만듭니다.
+
+    Raises:
+        ValueError: 두 입력 PDF의 출력 경로가 같은 경우
+    """
+    root = input_root(pdf_paths)
+    save_paths = []
+    outputs = {}
+    for pdf_path in pdf_paths:
+        save_path = output_path_for(pdf_path, output_dir, root)
+        key = os.path.normcase(os.path.abspath(save_path))
+        if key in outputs:
+            raise ValueError(f'출력 파일이 겹칩니다: {outputs[key]}, {pdf_path} -> {save_path}')
+        outputs[key] = pdf_path
+        save_paths.append(save_path)
+    return save_paths
+
+def process_pdf(job):
+    """PDF 한 개에 이미지를 삽입하여 저장 (작업자 프로세스에서 실행)
+
+    Args:
+        job: {
+            'pdf_path': 입력 PDF 경로,
+            'save_path': 출력 PDF 경로,
+            'images': [{ 'path', 'pos', 'size' }, ...] 미리보기 좌표,
+            'display_size': 미리보기에 표시된 PDF 이미지 크기 (없으면 None),
+            'preview_dpi': 미리보기 렌더링 해상도,
+            'stamps': 페이지 상대 단위 배치 (있으면 images 대신 사용),
+            'placement': PlacementPlanner.plan() 결과 (없으면 stamps와 PDF 메타데이터로 계산),
+            'page_size': 메타데이터 색인에서 읽은 첫 페이지 크기 (없으면 PDF에서 읽음),
+            'dpi': 출력 해상도,
+            'pages': 이미지를 삽입할 페이지 선택 규칙 (page_selection 참고, 없으면 all_pages로 결정),
+            'all_pages': 모든 페이지 삽입 여부 (예전 옵션),
+            'engine': 저장 엔진,
+            'encoding': 래스터 저장 시 페이지 이미지 인코딩 프로필,
+            'measure_savings': 인코딩 프로필로 절약한 용량 측정 여부 (보고서를 남길 때만)
+        }
+
+    Returns:
+        저장된 파일 경로
+    """
+    dpi = job.get('dpi', 300)
+    placement = job.get('placement') if job.get('stamps') is not None else None
+    if placement is not None:
+        # 일괄 저장에서 메타데이터 색인으로 페이지 선택과 형태별 변환을 미리 계산한 경우
+        pages = placement['selected']
+    else:
+        metadata = read_pdf_metadata(job['pdf_path'])
+        if not metadata['page_sizes']:
+            raise ValueError(metadata['error'] or 'PDF 페이지를 읽을 수 없습니다')
+        pages = select_pages(rule_from_options(job.get('pages'), job.get('all_pages', False)), metadata['page_sizes'])
+        if job.get('stamps') is not None:
+            placement = PlacementPlanner(job['stamps'], dpi).plan(metadata, pages)
+
+    if placement is not None:
+        # 선택한 페이지가 없으면 원본을 그대로 복사
+        insert_infos = placement['classes'][0]['insert_infos'] if placement['classes'] else []
+    else:
+        page_size = job.get('page_size') or metadata['page_sizes'][0]
+        output_w, output_h = pdf_image_utils.page_size_to_pixels(page_size, dpi)
+        if job.get('display_size'):
+            # dpi 변환 비율과 화면 맞춤 비율을 모두 고려
+            display_w, display_h = job['display_size']
+        else:
+            display_w, display_h = pdf_image_utils.page_size_to_pixels(page_size, job.get('preview_dpi', 100))
+        scale_x = output_w / display_w
+        scale_y = output_h / display_h
+        insert_infos = build_insert_infos(job['images'], scale_x, scale_y)
+
+    pdf_image_utils.insert_image_to_pdf(
+        job['pdf_path'], insert_infos, job['save_path'], dpi=dpi,
+        all_pages=job.get('all_pages', False), engine=job.get('engine', DEFAULT_SAVE_ENGINE),
+        encoding=job.get('encoding', DEFAULT_ENCODING_PROFILE), placement=placement, pages=pages,
+        measure_savings=job.get('measure_savings', ENCODING_MEASURE_SAVINGS)
+    )
+    return job['save_path']
+
+
+def run_job(job):
+    """process_pdf를 실행하면서 단계별 시간/메모리를 기록 (작업자 프로세스에서 실행)
+
+    job에 'hash_input'이 있으면 처리 전에 입력 파일 해시를 계산해 보고서의 'input'에 넣습니다
+    (매니페스트 기록용, 작업자 프로세스에서 나눠 계산).
+
+    Returns:
+        (저장된 파일 경로 또는 None, 오류 메시지 또는 None, 작업 보고서)
+    """
+    profiler = instrumentation.JobProfiler(job['pdf_path'])
+    signature = None
+    with instrumentation.activate(profiler):
+        try:
+            if job.get('hash_input'):
+                with instrumentation.stage('hash'):
+                    # 해시 계산 중에 파일이 바뀌면 다음 실행에서 다시 처리되도록 크기/시각을 먼저 읽음
+                    signature = manifest.input_signature(job['pdf_path'])
+                    signature['sha256'] = layout.file_sha256(job['pdf_path'])
+            save_path = process_pdf(job)
+        except Exception as e:
+            report = profiler.finish(error=str(e))
+            report['input'] = signature
+            return None, str(e), report
+    report = profiler.finish()
+    report['input'] = signature
+    return save_path, None, report
+
+
+class BatchExecutor:
+    """일괄 저장 작업을 프로세스 풀에 나눠 실행
+
+    각 작업이 끝나면 events 큐에 ('done', index, job, 결과) 또는
+    ('error', index, job, 오류 메시지)를 넣습니다. GUI는 메인 스레드에서
+    이 큐를 주기적으로 비워 진행 상황을 표시합니다.
+    작업별 단계 보고서는 이벤트를 넣기 전에 reports[index]에 저장됩니다.
+    """
+
+    def __init__(self, jobs, max_workers=None):
+        self.jobs = list(jobs)
+        self.max_workers = max_workers or BATCH_MAX_WORKERS or os.cpu_count() or 1
+        self.events = queue.Queue()
+        self.cancelled = False
+        self.reports = {}
+        self._executor = None
+        self._futures = []
+
+    def start(self):
+        """모든 작업을 풀에 제출"""
+        workers = max(1, min(self.max_workers, len(self.jobs)))
+        # Tk 프로세스는 여러 스레드를 쓰므로 fork 대신 spawn으로 작업자를 시작 (잠금을 물려받은 채 멈추지 않도록)
+        self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        for index, job in enumerate(self.jobs):
+            future = self._executor.submit(run_job, job)
+            future.add_done_callback(lambda f, i=index, j=job: self._on_done(f, i, j))
+            self._futures.append(future)
+
+    def _on_done(self, future, index, job):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            # 작업자 프로세스가 비정상 종료된 경우 등 보고서가 없음
+            self.events.put(('error', index, job, str(error)))
+            return
+        save_path, error, report = future.result()
+        self.reports[index] = report
+        if error is not None:
+            self.events.put(('error', index, job, error))
+        else:
+            self.events.put(('done', index, job, save_path))
+
+    def cancel(self):
+        """대기 중인 작업을 취소 (이미 실행 중인 작업은 끝까지 진행)"""
+        self.cancelled = True
+        for future in self._futures:
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def expected_events(self):
+        """events 큐에 들어올 이벤트 총수 (취소된 작업은 이벤트가 없으므로 제외)"""
+        return sum(1 for future in self._futures if not future.cancelled())
+
+    def shutdown(self):
+        """모든 작업이 끝난 뒤 풀 종료 (취소된 경우 cancel()에서 이미 종료됨)"""
+        if self._executor is not None and not self.cancelled:
+            self._executor.shutdown(wait=True)
+
+    def poll(self):
+        """지금까지 쌓인 이벤트를 모두 꺼내 반환"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
@@ -7,3 +7,103 @@ POPPLER_PATH = os.path.abspath(
 
 # Backward-compatible alias for older imports.
 POPLER_PATH = POPPLER_PATH
+
+# 저장 엔진
+# - raster: 페이지를 이미지로 렌더링한 뒤 합성 (기존 방식)
+# - vector: 원본 페이지를 그대로 두고 이미지 오버레이만 병합
+SAVE_ENGINE_RASTER = 'raster'
+SAVE_ENGINE_VECTOR = 'vector'
+DEFAULT_SAVE_ENGINE = SAVE_ENGINE_RASTER
+
+# 벡터 저장 시 메모리에 보관할 인코딩된 스탬프 스트림 개수
+STAMP_STREAM_CACHE_SIZE = 64
+
+# 일괄 저장 작업자 프로세스 수 (None이면 CPU 코어 수)
+BATCH_MAX_WORKERS = None
+
+# 일괄 저장 진행 상황을 확인하는 주기 (밀리초)
+BATCH_POLL_INTERVAL_MS = 100
+
+# 전체 페이지 저장 시 한 번에 렌더링할 페이지 수 (메모리 사용량 상한)
+RENDER_WINDOW_PAGES = 4
+
+# 디코딩/크기 조정된 스탬프 이미지 캐시의 최대 메모리 (바이트)
+STAMP_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 미리보기 디스크 캐시 위치와 최대 크기 (바이트)
+PREVIEW_CACHE_DIR = os.path.join(
+    os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    or os.path.join(os.path.expanduser('~'), '.cache'),
+    'pdf-image-editor', 'previews'
+)
+PREVIEW_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# 미리보기 백그라운드 렌더링: 앞뒤로 미리 렌더링할 PDF 수, 메모리에 보관할 미리보기 수,
+# 렌더링 결과 확인 주기 (밀리초)
+PREVIEW_PREFETCH_NEIGHBORS = 2
+PREVIEW_MEMORY_CACHE_SIZE = 16
+PREVIEW_POLL_INTERVAL_MS = 30
+
+# PDF 메타데이터 색인: 작업자 프로세스 수 (None이면 CPU 코어 수)와 작업당 파일 수
+METADATA_MAX_WORKERS = None
+METADATA_CHUNK_SIZE = 32
+
+# 이미지 크기 조절 중 미리보기를 다시 만드는 최소 간격 (밀리초)
+RESIZE_PREVIEW_INTERVAL_MS = 33
+
+# 캔버스 클릭 판정용 공간 색인의 격자 칸 크기 (픽셀)
+SPATIAL_INDEX_CELL_SIZE = 64
+
+# 일괄 저장 보고서(파일/단계별 시간, 메모리) 파일 이름 (저장 폴더에 기록)
+BATCH_REPORT_NAME = 'batch_report.json'
+
+# 래스터 저장 시 페이지 이미지 인코딩 프로필
+# - jpeg_quality: 컬러/흑백 페이지의 JPEG 품질
+# - auto_color: 페이지마다 컬러/흑백(8비트)/1비트(흑백 문서)를 자동 판별
+# - target_dpi: 컬러/흑백 페이지를 이 해상도로 줄여서 저장 (None이면 저장 해상도 그대로)
+ENCODING_STANDARD = 'standard'
+ENCODING_PROFILES = {
+    ENCODING_STANDARD: {'label': '기본 (모든 페이지 컬러 JPEG)', 'jpeg_quality': 75, 'auto_color': False, 'target_dpi': None},
+    'auto': {'label': '자동 (페이지별 컬러/흑백/1비트 선택)', 'jpeg_quality': 75, 'auto_color': True, 'target_dpi': None},
+    'compact': {'label': '용량 우선 (자동, 150dpi, 품질 60)', 'jpeg_quality': 60, 'auto_color': True, 'target_dpi': 150},
+    'archive': {'label': '보관용 고품질 (자동, 품질 90)', 'jpeg_quality': 90, 'auto_color': True, 'target_dpi': None},
+}
+DEFAULT_ENCODING_PROFILE = ENCODING_STANDARD
+
+# 페이지 판별 기준
+# - 채널 간 차이가 GRAYSCALE_TOLERANCE를 넘는 픽셀이 GRAYSCALE_COLOR_RATIO 이하면 흑백
+# - 중간 밝기(BILEVEL_MIDTONE_RANGE) 픽셀이 BILEVEL_MIDTONE_RATIO 이하면 1비트, BILEVEL_THRESHOLD 기준으로 이진화
+GRAYSCALE_TOLERANCE = 16
+GRAYSCALE_COLOR_RATIO = 0.001
+BILEVEL_MIDTONE_RANGE = (48, 208)
+BILEVEL_MIDTONE_RATIO = 0.03
+BILEVEL_THRESHOLD = 128
+
+# 인코딩 프로필로 줄인 용량을 보고하기 위해 기본 프로필로도 한 번 더 인코딩해 비교
+# (저장 시간이 늘어나므로 기본은 끄고, 보고서를 남길 때(--report, 보고서 체크박스)만 켬)
+ENCODING_MEASURE_SAVINGS = False
+
+# 일괄 저장 매니페스트 (출력 폴더에 기록, 다시 실행할 때 최신 출력은 건너뜀)와 저장 간격 (초)
+MANIFEST_NAME = '.pdf-image-editor-manifest.json'
+MANIFEST_SAVE_INTERVAL = 2.0
+
+# 페이지 선택 규칙의 'size:' 조건에서 같은 크기로 보는 오차 (pt)
+PAGE_SIZE_TOLERANCE = 3.0
+
+# 기본 페이지 선택 규칙 (first, last, all, odd, even, 1-3, size:A4 등)
+DEFAULT_PAGE_RULE = 'first'
+
+# PDF 렌더링 방식
+# - auto: pdfium (pypdfium2는 requirements.txt에 포함), 설치되어 있지 않으면 pdftoppm (둘 다 없으면 pdf2image)
+# - pdfium: pypdfium2로 프로세스 안에서 렌더링 (열어 둔 문서를 재사용)
+# - pdftoppm: Poppler pdftoppm을 직접 실행해 임시 PPM 파일로 렌더링
+# - pdf2image: pdf2image.convert_from_path (예전 방식)
+RENDER_BACKEND = 'auto'
+
+# pdfium 렌더러가 프로세스마다 열어 둘 PDF 문서 수
+RENDER_OPEN_DOCUMENTS = 4
+
+# 래스터 저장 시 RGB 비트맵이 이 크기(바이트)를 넘는 페이지(고해상도 A3, 포스터 등)는
+# 임시 PPM 파일로 렌더링해 메모리 매핑으로 열고, 이 크기의 1/4 이하인 가로 띠 단위로 합성/인코딩
+# (None이면 모든 페이지를 메모리에서 처리)
+PAGE_MEMORY_BUDGET = 64 * 1024 * 1024
@@ -0,0 +1,238 @@
+import csv
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+def reset_peak_rss():
+    """최대 RSS(VmHWM)를 현재 RSS로 되돌림 (리눅스 전용, 되돌릴 수 없으면 False)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """마지막 reset_peak_rss() 이후 현재 프로세스의 최대 RSS (바이트), 읽을 수 없으면 None"""
+    try:
+        with open('/proc/self/status', 'r') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class JobProfiler:
+    """파일 한 개를 처리하는 동안 단계별 시간과 메모리를 기록
+
+    메모리는 단계(또는 파일)를 처리하는 동안의 최대 RSS입니다. 단계 경계마다 최대 RSS를 읽고
+    다시 초기화하므로 작업자 프로세스에서 앞선 파일이나 단계의 최고치가 남지 않습니다.
+    최대 RSS를 초기화할 수 없는 환경(리눅스 외)에서는 None으로 남깁니다.
+
+    사용 예:
+        profiler = JobProfiler(pdf_path)
+        with activate(profiler):
+            with stage('render'):
+                ...
+        report = profiler.finish()
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.pages = 0
+        self.counters = {}          # 이름 -> 합계 (예: 인코딩으로 줄인 바이트 수)
+        self.stages = {}            # 단계 이름 -> { 'calls', 'wall_s', 'cpu_s', 'window_peak_rss_bytes' }
+        self._open = []             # 진행 중인 단계 기록 (중첩된 단계는 바깥 단계에도 반영)
+        self._peak = None           # 파일 전체의 최대 RSS
+        self._measure_memory = reset_peak_rss()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def _sample_memory(self):
+        """마지막 초기화 이후 최대 RSS를 진행 중인 단계와 파일 전체에 반영하고 다시 초기화"""
+        if not self._measure_memory:
+            return
+        rss = peak_rss()
+        if rss is not None:
+            self._peak = max(rss, self._peak or 0)
+            for record in self._open:
+                record['window_peak_rss_bytes'] = max(rss, record['window_peak_rss_bytes'] or 0)
+        reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name):
+        record = self.stages.get(name)
+        if record is None:
+            record = self.stages[name] = {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'window_peak_rss_bytes': None}
+        self._sample_memory()
+        self._open.append(record)
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        try:
+            yield
+        finally:
+            record['calls'] += 1
+            record['wall_s'] += time.perf_counter() - started_wall
+            record['cpu_s'] += time.process_time() - started_cpu
+            self._sample_memory()
+            self._open.remove(record)
+
+    def finish(self, error=None):
+        """기록을 보고서(dict)로 정리
+
+        Returns:
+            {
+                'file': 입력 파일, 'pages': 처리한 페이지 수,
+                'wall_s', 'cpu_s': 전체 시간, 'window_peak_rss_bytes': 파일을 처리하는 동안의 최대 RSS,
+                'stages': { 단계 이름: { 'calls', 'wall_s', 'cpu_s', 'window_peak_rss_bytes' }, ... },
+                'counters': { 이름: 합계, ... },
+                'error': 오류 메시지 또는 None
+            }
+        """
+        self._sample_memory()
+        return {
+            'file': self.label,
+            'pages': self.pages,
+            'wall_s': time.perf_counter() - self._started_wall,
+            'cpu_s': time.process_time() - self._started_cpu,
+            'window_peak_rss_bytes': self._peak,
+            'stages': {name: dict(record) for name, record in self.stages.items()},
+            'counters': dict(self.counters),
+            'error': error
+        }
+
+
+# 현재 스레드에서 기록 중인 JobProfiler (없으면 stage()는 아무것도 하지 않음)
+_local = threading.local()
+
+
+@contextmanager
+def activate(profiler):
+    """with 블록 안에서 stage()/add_pages() 기록을 profiler에 모음"""
+    previous = getattr(_local, 'profiler', None)
+    _local.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _local.profiler = previous
+
+
+@contextmanager
+def stage(name):
+    """처리 단계 하나의 시간을 기록 (기록 중인 작업이 없으면 아무것도 하지 않음)"""
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def add_pages(count=1):
+    """처리한 페이지 수를 더함"""
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is not None:
+        profiler.pages += count
+
+
+def count(name, value=1):
+    """이름 붙은 합계에 값을 더함 (예: 페이지 종류별 수, 절약한 바이트 수)"""
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is not None:
+        profiler.counters[name] = profiler.counters.get(name, 0) + value
+
+
+class BatchProgress:
+    """일괄 저장 전체의 진행 속도와 남은 시간 추정"""
+
+    def __init__(self, total_files):
+        self.total_files = total_files
+        self.finished_files = 0
+        self.pages = 0
+        self.reports = []
+        self._started = time.perf_counter()
+
+    def add(self, report):
+        """작업 하나가 끝났을 때 보고서를 반영"""
+        self.finished_files += 1
+        if report is not None:
+            self.reports.append(report)
+            self.pages += report.get('pages') or 0
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def pages_per_second(self):
+        elapsed = self.elapsed
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+    def eta_seconds(self):
+        """남은 파일을 지금까지의 평균 속도로 처리할 때 걸릴 시간 (추정할 수 없으면 None)"""
+        if not self.finished_files:
+            return None
+        remaining = self.total_files - self.finished_files
+        return self.elapsed / self.finished_files * remaining
+
+    def summary(self):
+        """단계별 합계와 전체 처리량"""
+        stages = {}
+        for report in self.reports:
+            for name, record in report['stages'].items():
+                total = stages.setdefault(name, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+                total['calls'] += record['calls']
+                total['wall_s'] += record['wall_s']
+                total['cpu_s'] += record['cpu_s']
+        counters = {}
+        for report in self.reports:
+            for name, value in report.get('counters', {}).items():
+                counters[name] = counters.get(name, 0) + value
+        peaks = [report['window_peak_rss_bytes'] for report in self.reports if report.get('window_peak_rss_bytes')]
+        return {
+            'files': self.finished_files,
+            'failed': sum(1 for report in self.reports if report.get('error')),
+            'pages': self.pages,
+            'elapsed_s': self.elapsed,
+            'pages_per_s': self.pages_per_second(),
+            'window_peak_rss_bytes': max(peaks) if peaks else None,
+            'stages': stages,
+            'counters': counters
+        }
+
+
+def format_duration(seconds):
+    """초를 '1시간 2분', '3분 4초', '5초' 형식으로 표시"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f'{hours}시간 {minutes}분'
+    if minutes:
+        return f'{minutes}분 {seconds}초'
+    return f'{seconds}초'
+
+
+def write_report(path, progress):
+    """일괄 저장 보고서를 파일로 기록 (.csv이면 파일x단계/합계별 행, 그 외에는 JSON)"""
+    if os.path.splitext(path)[1].lower() == '.csv':
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file)
+            # 모든 행은 머리말과 같은 열 수 (값이 없는 칸은 빈 문자열)
+            writer.writerow(['file', 'stage', 'calls', 'wall_s', 'cpu_s', 'window_peak_rss_bytes', 'pages', 'error', 'value'])
+            for report in progress.reports:
+                writer.writerow([report['file'], '(total)', '', f'{report["wall_s"]:.6f}', f'{report["cpu_s"]:.6f}',
+                                 report['window_peak_rss_bytes'] or '', report['pages'], report['error'] or '', ''])
+                for name, record in report['stages'].items():
+                    writer.writerow([report['file'], name, record['calls'], f'{record["wall_s"]:.6f}',
+                                     f'{record["cpu_s"]:.6f}', record['window_peak_rss_bytes'] or '', '', '', ''])
+                # 합계 값은 stage 열에 이름, value 열에 값
+                for name, value in report.get('counters', {}).items():
+                    writer.writerow([report['file'], name, '', '', '', '', '', '', value])
+        return
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'summary': progress.summary(), 'jobs': progress.reports}, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+
+# 레이아웃 파일 형식 버전
+LAYOUT_VERSION = 1
+
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def layout_from_preview(inserted_images, display_size):
+    """미리보기 좌표의 삽입 이미지 목록을 페이지 상대 단위(0~1) 레이아웃으로 변환
+
+    Args:
+        inserted_images: [{ 'path', 'pos', 'size', ... }, ...] 미리보기 캔버스 좌표
+        display_size: 미리보기에 표시된 PDF 이미지 크기 (width, height)
+
+    Returns:
+        { 'version', 'stamps': [{ 'path', 'sha256', 'x', 'y', 'width', 'height' }, ...] }
+    """
+    display_w, display_h = display_size
+    stamps = []
+    for img in inserted_images:
+        stamps.append({
+            'path': os.path.abspath(img['path']),
+            'sha256': file_sha256(img['path']),
+            'x': img['pos'][0] / display_w,
+            'y': img['pos'][1] / display_h,
+            'width': img['size'][0] / display_w,
+            'height': img['size'][1] / display_h
+        })
+    return {'version': LAYOUT_VERSION, 'stamps': stamps}
+
+
+def stamp_to_preview(stamp, display_size):
+    """페이지 상대 단위 스탬프를 미리보기 캔버스 좌표 (pos, size)로 변환"""
+    display_w, display_h = display_size
+    pos = [int(round(stamp['x'] * display_w)), int(round(stamp['y'] * display_h))]
+    size = [max(1, int(round(stamp['width'] * display_w))), max(1, int(round(stamp['height'] * display_h)))]
+    return pos, size
+
+
+def layout_hash(layout):
+    """레이아웃 내용(이미지 해시와 배치)의 해시 - 같은 배치인지 비교할 때 사용"""
+    stamps = [
+        [stamp.get('sha256'), stamp['x'], stamp['y'], stamp['width'], stamp['height']]
+        for stamp in layout['stamps']
+    ]
+    return hashlib.sha256(json.dumps(stamps).encode()).hexdigest()
+
+
+def save_layout(path, layout):
+    """레이아웃을 JSON 파일로 저장
+
+    이미지 경로는 레이아웃 파일 기준 상대 경로로 함께 기록해 폴더째 옮겨도 찾을 수 있게 합니다.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    stamps = []
+    for stamp in layout['stamps']:
+        stamp = dict(stamp)
+        try:
+            stamp['relative_path'] = os.path.relpath(stamp['path'], base_dir)
+        except ValueError:
+            # Windows에서 드라이브가 다르면 상대 경로를 만들 수 없음
+            pass
+        stamps.append(stamp)
+
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'version': LAYOUT_VERSION, 'stamps': stamps}, file, ensure_ascii=False, indent=2)
+
+
+def load_layout(path):
+    """레이아웃 JSON 파일을 읽어 이미지 경로를 확인하고 반환
+
+    각 스탬프의 'path'는 실제로 존재하는 경로로 정리되며, 저장 당시와 이미지 내용이
+    다르면 'changed'가 True로 표시됩니다.
+
+    Raises:
+        ValueError: 지원하지 않는 형식이거나 이미지 파일을 찾을 수 없는 경우
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+
+    if data.get('version') != LAYOUT_VERSION:
+        raise ValueError(f'지원하지 않는 레이아웃 버전입니다: {data.get("version")}')
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    stamps = []
+    for stamp in data.get('stamps', []):
+        candidates = [stamp.get('path')]
+        if stamp.get('relative_path'):
+            candidates.append(os.path.join(base_dir, stamp['relative_path']))
+        if stamp.get('path'):
+            candidates.append(os.path.join(base_dir, os.path.basename(stamp['path'])))
+
+        image_path = next((p for p in candidates if p and os.path.isfile(p)), None)
+        if image_path is None:
+            raise ValueError(f'이미지 파일을 찾을 수 없습니다: {stamp.get("path")}')
+
+        sha256 = file_sha256(image_path)
+        stamps.append({
+            'path': os.path.abspath(image_path),
+            'sha256': sha256,
+            'x': float(stamp['x']),
+            'y': float(stamp['y']),
+            'width': float(stamp['width']),
+            'height': float(stamp['height']),
+            'changed': bool(stamp.get('sha256')) and stamp['sha256'] != sha256
+        })
+    return {'version': LAYOUT_VERSION, 'stamps': stamps}
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from . import layout
+from .config import MANIFEST_NAME, MANIFEST_SAVE_INTERVAL
+
+# 매니페스트 파일 형식 버전
+MANIFEST_VERSION = 1
+
+# 출력 결과에 영향을 주지 않아 작업 비교에서 제외하는 키
+_IGNORED_JOB_KEYS = {
+    'pdf_path', 'save_path', 'page_size', 'placement', 'stamps', 'images', 'hash_input', 'measure_savings'
+}
+
+
+def input_signature(pdf_path, sha256=None):
+    """입력 파일의 크기, 수정 시각, (주어지면) 내용 해시"""
+    stat = os.stat(pdf_path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'sha256': sha256}
+
+
+class JobManifest:
+    """출력 폴더에 일괄 저장 작업 기록(입력 해시, 레이아웃 해시, 옵션, 출력 상태)을 남기는 매니페스트
+
+    같은 작업을 다시 실행하면 입력, 배치, 옵션, 출력 파일이 모두 그대로인 PDF는 건너뛰고
+    실패했거나 바뀐 PDF만 다시 처리합니다. 입력 해시는 크기/수정 시각이 같으면 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}           # 입력 PDF 절대 경로 -> 기록
+        self._stamp_hashes = {}     # 스탬프 경로 -> 내용 해시 (한 번 실행하는 동안만 보관)
+        self._dirty = 0
+        self._saved_at = time.monotonic()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == MANIFEST_VERSION:
+            self.entries = data.get('entries', {})
+
+    def _stamp_sha256(self, path):
+        sha256 = self._stamp_hashes.get(path)
+        if sha256 is None:
+            sha256 = self._stamp_hashes[path] = layout.file_sha256(path)
+        return sha256
+
+    def fingerprint(self, job):
+        """출력 결과를 결정하는 작업 내용(레이아웃 해시 + 옵션)의 해시"""
+        if job.get('stamps') is not None:
+            stamps = [
+                dict(stamp, sha256=stamp.get('sha256') or self._stamp_sha256(stamp['path']))
+                for stamp in job['stamps']
+            ]
+            placement = {'layout_hash': layout.layout_hash({'stamps': stamps})}
+        else:
+            placement = {'images': [
+                [self._stamp_sha256(img['path']), list(img['pos']), list(img['size'])]
+                for img in job.get('images', [])
+            ], 'display_size': job.get('display_size')}
+        options = {key: value for key, value in job.items() if key not in _IGNORED_JOB_KEYS}
+        data = json.dumps({'placement': placement, 'options': options}, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _input_unchanged(self, pdf_path, recorded):
+        """기록된 입력과 같은 파일인지 확인 (크기/수정 시각이 다를 때만 해시 비교)"""
+        try:
+            current = input_signature(pdf_path)
+        except OSError:
+            return False
+        if current['size'] == recorded.get('size') and current['mtime'] == recorded.get('mtime'):
+            return True
+        if current['size'] != recorded.get('size') or not recorded.get('sha256'):
+            return False
+        # 복사 등으로 수정 시각만 바뀐 경우: 내용이 같으면 새 수정 시각을 기록해 다음부터 빠르게 비교
+        if layout.file_sha256(pdf_path) != recorded['sha256']:
+            return False
+        recorded['mtime'] = current['mtime']
+        self._dirty += 1
+        return True
+
+    def is_up_to_date(self, job):
+        """이전 실행에서 같은 내용으로 저장한 출력이 그대로 남아 있는지 확인"""
+        entry = self.entries.get(os.path.abspath(job['pdf_path']))
+        if not entry or entry.get('status') != 'done':
+            return False
+        if entry.get('fingerprint') != self.fingerprint(job):
+            return False
+        output = entry.get('output') or {}
+        if output.get('path') != os.path.abspath(job['save_path']):
+            return False
+        try:
+            stat = os.stat(job['save_path'])
+        except OSError:
+            return False
+        if stat.st_size != output.get('size') or stat.st_mtime_ns != output.get('mtime'):
+            return False
+        return self._input_unchanged(job['pdf_path'], entry.get('input') or {})
+
+    def split(self, jobs):
+        """작업 목록을 (실행할 작업, 최신이라 건너뛸 작업)으로 나눔
+
+        실행할 작업에는 작업자 프로세스에서 입력 해시를 계산하도록 'hash_input'을 표시합니다.
+        """
+        pending, skipped = [], []
+        for job in jobs:
+            if self.is_up_to_date(job):
+                skipped.append(job)
+            else:
+                pending.append(dict(job, hash_input=True))
+        return pending, skipped
+
+    def record(self, job, status, report=None, error=None):
+        """작업 결과를 기록하고 일정 간격마다 파일에 저장
+
+        Args:
+            job: 일괄 저장 작업
+            status: 'done' 또는 'error'
+            report: 작업 보고서 (작업자에서 계산한 입력 해시 'input' 포함)
+            error: 오류 메시지
+        """
+        pdf_path = os.path.abspath(job['pdf_path'])
+        entry = {
+            'input': (report or {}).get('input') or self.entries.get(pdf_path, {}).get('input'),
+            'fingerprint': self.fingerprint(job),
+            'options': {key: value for key, value in job.items() if key not in _IGNORED_JOB_KEYS},
+            'status': status,
+            'error': error,
+            'output': None,
+            'updated': datetime.now().isoformat(timespec='seconds')
+        }
+        if status == 'done':
+            stat = os.stat(job['save_path'])
+            entry['output'] = {
+                'path': os.path.abspath(job['save_path']),
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns
+            }
+        self.entries[pdf_path] = entry
+        self._dirty += 1
+        self.save()
+
+    def save(self, force=False):
+        """바뀐 내용을 파일에 기록 (MANIFEST_SAVE_INTERVAL초에 한 번, force이면 바로)
+
+        중간에 프로그램이 멈춰도 매니페스트가 깨지지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        """
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._saved_at < MANIFEST_SAVE_INTERVAL:
+            return
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'version': MANIFEST_VERSION, 'entries': self.entries}, file, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+        self._dirty = 0
+        self._saved_at = time.monotonic()
+
+    def summary(self):
+        """상태별 기록 수"""
+        counts = {}
+        for entry in self.entries.values():
+            counts[entry.get('status')] = counts.get(entry.get('status'), 0) + 1
+        return counts
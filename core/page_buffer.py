@@ -0,0 +1,91 @@
+import mmap
+from PIL import Image
+
+
+def ppm_header(width, height):
+    """8비트 RGB PPM(P6) 파일 머리말"""
+    return f'P6\n{width} {height}\n255\n'.encode()
+
+
+def band_rows(width, band_bytes, align=16):
+    """한 띠(band)에 담을 행 수 (RGB 기준 band_bytes 이하, JPEG 블록에 맞춰 align의 배수)"""
+    rows = band_bytes // max(1, width * 3)
+    return max(align, rows // align * align)
+
+
+class MappedPage:
+    """임시 PPM(P6) 파일을 메모리 매핑으로 열고 띠(band) 단위로 꺼내는 페이지 버퍼
+
+    페이지 전체 비트맵은 파일(운영체제 페이지 캐시)에만 있고 꺼낸 띠만 파이썬 힙에 올라오므로
+    포스터 크기 페이지도 띠 크기만큼의 메모리로 합성하고 인코딩할 수 있습니다.
+
+    사용 예:
+        with MappedPage(path) as page:
+            band = page.band(0, 256)
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.width, self.height, self._offset = self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def _read_header(self):
+        """머리말(P6, 너비, 높이, 최댓값)을 읽고 픽셀 데이터 시작 위치를 반환"""
+        tokens = []
+        pos = 0
+        while len(tokens) < 4:
+            char = self._map[pos:pos + 1]
+            if not char:
+                raise ValueError('PPM 머리말이 잘렸습니다')
+            if char == b'#':
+                # 주석은 줄 끝까지 무시
+                pos = self._map.find(b'\n', pos) + 1 or len(self._map)
+            elif char.isspace():
+                pos += 1
+            else:
+                start = pos
+                while pos < len(self._map) and not self._map[pos:pos + 1].isspace():
+                    pos += 1
+                tokens.append(self._map[start:pos])
+        if tokens[0] != b'P6' or tokens[3] != b'255':
+            raise ValueError('8비트 RGB PPM(P6) 파일만 지원합니다')
+        # 최댓값 다음의 공백 한 글자 뒤부터 픽셀 데이터
+        return int(tokens[1]), int(tokens[2]), pos + 1
+
+    def band(self, top, height):
+        """top 행부터 height 행까지의 RGB 이미지 (수정 가능한 복사본)"""
+        height = min(height, self.height - top)
+        row_bytes = self.width * 3
+        start = self._offset + top * row_bytes
+        with memoryview(self._map) as view, view[start:start + height * row_bytes] as data:
+            band = Image.frombytes('RGB', (self.width, height), data)
+        self._release(start, height * row_bytes)
+        return band
+
+    def _release(self, start, length):
+        """읽은 영역을 프로세스 메모리(RSS)에서 내려놓음 (파일 내용은 운영체제 캐시에 남음)"""
+        if not hasattr(self._map, 'madvise') or not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        aligned = start - start % mmap.PAGESIZE
+        self._map.madvise(mmap.MADV_DONTNEED, aligned, start + length - aligned)
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
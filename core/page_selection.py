@@ -0,0 +1,112 @@
+import re
+from .config import DEFAULT_PAGE_RULE, PAGE_SIZE_TOLERANCE
+
+# 이름으로 지정할 수 있는 페이지 크기 (세로 방향, pt)
+NAMED_PAGE_SIZES = {
+    'a3': (842.0, 1191.0),
+    'a4': (595.0, 842.0),
+    'a5': (420.0, 595.0),
+    'b5': (499.0, 709.0),
+    'letter': (612.0, 792.0),
+    'legal': (612.0, 1008.0),
+}
+
+_RANGE = re.compile(r'^(\d*)\s*-\s*(\d*)$')
+_SIZE = re.compile(r'^(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?)$')
+
+
+def _size_matcher(value):
+    """'size:A4' 또는 'size:595x842' 조건 (가로/세로 방향은 구분하지 않음)"""
+    value = value.strip().lower()
+    if value in NAMED_PAGE_SIZES:
+        target = NAMED_PAGE_SIZES[value]
+    else:
+        match = _SIZE.match(value)
+        if not match:
+            raise ValueError(f'페이지 크기를 알 수 없습니다: {value}')
+        target = (float(match.group(1)), float(match.group(2)))
+    short_side, long_side = sorted(target)
+
+    def matches(index, page_count, size):
+        width, height = sorted(size)
+        return abs(width - short_side) <= PAGE_SIZE_TOLERANCE and abs(height - long_side) <= PAGE_SIZE_TOLERANCE
+    return matches
+
+
+def _term_matcher(term):
+    """규칙의 한 항목을 (페이지 번호, 전체 페이지 수, 크기) -> bool 함수로 변환"""
+    term = term.strip().lower()
+    if term == 'all':
+        return lambda index, page_count, size: True
+    if term == 'first':
+        return lambda index, page_count, size: index == 0
+    if term == 'last':
+        return lambda index, page_count, size: index == page_count - 1
+    if term == 'odd':
+        return lambda index, page_count, size: index % 2 == 0
+    if term == 'even':
+        return lambda index, page_count, size: index % 2 == 1
+    if term == 'landscape':
+        return lambda index, page_count, size: size[0] > size[1]
+    if term == 'portrait':
+        return lambda index, page_count, size: size[0] <= size[1]
+    if term.startswith('size:'):
+        return _size_matcher(term[len('size:'):])
+    if term.isdigit():
+        number = int(term)
+        if number < 1:
+            raise ValueError(f'페이지 번호는 1부터 시작합니다: {term}')
+        return lambda index, page_count, size: index + 1 == number
+    match = _RANGE.match(term)
+    if match and (match.group(1) or match.group(2)):
+        start = int(match.group(1)) if match.group(1) else 1
+        end = int(match.group(2)) if match.group(2) else None
+        if start < 1 or (end is not None and end < 1):
+            raise ValueError(f'페이지 번호는 1부터 시작합니다: {term}')
+        if end is not None and end < start:
+            raise ValueError(f'페이지 범위의 시작이 끝보다 큽니다: {term}')
+        return lambda index, page_count, size: start <= index + 1 and (end is None or index + 1 <= end)
+    raise ValueError(f'알 수 없는 페이지 규칙입니다: {term}')
+
+
+def parse_page_rule(rule):
+    """페이지 선택 규칙 문자열을 해석
+
+    규칙은 쉼표로 나눈 항목들의 합집합이고, 항목 안에서 '&'로 이은 조건은 모두 만족해야 합니다.
+    페이지 번호는 1부터 시작합니다.
+
+        first, last, all, odd, even, landscape, portrait
+        3, 2-5, 7- (7쪽부터 끝까지), -3 (1~3쪽)
+        size:A4, size:letter, size:595x842 (pt, 방향 무관)
+        예) 'first,last', '1-3,odd&size:A4'
+
+    Returns:
+        (페이지 번호, 전체 페이지 수, 크기) -> 선택 여부 함수들의 목록 (항목별 조건 목록)
+
+    Raises:
+        ValueError: 해석할 수 없는 규칙, 1보다 작은 페이지 번호, 시작이 끝보다 큰 범위인 경우
+    """
+    parts = [part for part in (rule or '').split(',') if part.strip()]
+    if not parts:
+        raise ValueError('페이지 규칙이 비어 있습니다')
+    return [[_term_matcher(term) for term in part.split('&')] for part in parts]
+
+
+def select_pages(rule, page_sizes):
+    """규칙에 맞는 페이지 번호(0부터 시작) 목록
+
+    Args:
+        rule: 페이지 선택 규칙 문자열 (parse_page_rule 참고)
+        page_sizes: [(width, height), ...] 화면 방향 기준 페이지 크기 (pt)
+    """
+    parsed = parse_page_rule(rule)
+    page_count = len(page_sizes)
+    return [
+        index for index, size in enumerate(page_sizes)
+        if any(all(term(index, page_count, size) for term in part) for part in parsed)
+    ]
+
+
+def rule_from_options(pages=None, all_pages=False):
+    """작업 옵션의 페이지 규칙 (규칙이 없으면 예전 all_pages 옵션으로 결정)"""
+    return pages or ('all' if all_pages else DEFAULT_PAGE_RULE)
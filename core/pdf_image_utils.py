@@ -1,8 +1,69 @@
-from PIL import Image
-from pdf2image import convert_from_path
-from .config import POPLER_PATH
+from .config import (
+    DEFAULT_ENCODING_PROFILE, ENCODING_MEASURE_SAVINGS, PAGE_MEMORY_BUDGET, RENDER_WINDOW_PAGES,
+    SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR
+)
+from . import instrumentation, pdf_overlay, renderers
+from .page_buffer import MappedPage, band_rows
+from .pdf_metadata import read_pdf_metadata, visible_box
+from .pdf_stream_writer import StreamingPDFWriter
+from .stamp_cache import get_stamp
 import PyPDF2
-import io
+import math
+import os
+import tempfile
+
+
+def render_pdf_pages(pdf_path, dpi=300, first_page=0, last_page=None):
+    """지정한 페이지 범위만 렌더링
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        dpi: 해상도
+        first_page: 시작 페이지 번호 (0부터 시작)
+        last_page: 마지막 페이지 번호 (포함), None이면 first_page 한 장만 렌더링
+    
+    Returns:
+        렌더링된 페이지 이미지 리스트 (범위를 벗어나면 빈 리스트)
+    """
+    if last_page is None:
+        last_page = first_page
+    # 렌더러는 프로세스마다 하나를 계속 재사용 (방식은 config.RENDER_BACKEND)
+    return renderers.get_renderer().render(pdf_path, dpi, first_page, last_page)
+
+
+class PDFPageImages:
+    """PDF의 모든 페이지를 필요할 때 한 장씩 렌더링하는 지연 시퀀스
+    
+    인덱싱하거나 순회할 때마다 해당 페이지만 렌더러로 렌더링하므로
+    전체 페이지를 한 번에 메모리에 올리지 않습니다.
+    """
+    
+    def __init__(self, pdf_path, dpi=300, page_count=None, window=RENDER_WINDOW_PAGES):
+        self.pdf_path = pdf_path
+        self.dpi = dpi
+        self.window = max(1, window)
+        self._page_count = page_count
+    
+    def __len__(self):
+        if self._page_count is None:
+            self._page_count = get_pdf_page_count(self.pdf_path)
+        return self._page_count
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('페이지 번호가 범위를 벗어났습니다')
+        return render_pdf_pages(self.pdf_path, self.dpi, index)[0]
+    
+    def __iter__(self):
+        # 렌더러 호출 횟수를 줄이기 위해 window 장씩 묶어서 렌더링
+        page_count = len(self)
+        for start in range(0, page_count, self.window):
+            last = min(start + self.window, page_count) - 1
+            yield from render_pdf_pages(self.pdf_path, self.dpi, start, last)
 
 
 def pdf_to_image(pdf_path, dpi=300, page=0):
@@ -14,12 +75,14 @@ def pdf_to_image(pdf_path, dpi=300, page=0):
         page: 특정 페이지만 반환할 경우 페이지 번호 (0부터 시작), -1이면 모든 페이지 반환
     
     Returns:
-        page >= 0 이면 해당 페이지의 이미지, page < 0 이면 모든 페이지의 이미지 리스트
+        page >= 0 이면 해당 페이지의 이미지, page < 0 이면 모든 페이지를 한 장씩
+        렌더링하는 지연 시퀀스(PDFPageImages)
     """
-    images = convert_from_path(pdf_path, poppler_path=POPLER_PATH, dpi=dpi)
-    if page >= 0 and page < len(images):
-        return images[page]
-    return images
+    if page >= 0:
+        images = render_pdf_pages(pdf_path, dpi, page)
+        if images:
+            return images[0]
+    return PDFPageImages(pdf_path, dpi)
 
 
 def get_pdf_page_count(pdf_path):
@@ -29,37 +92,214 @@ def get_pdf_page_count(pdf_path):
         return len(pdf.pages)
 
 
-def insert_image_to_pdf(pdf_path, insert_infos, output_path, dpi=300, all_pages=False):
+def get_pdf_page_size(pdf_path, page=0):
+    """렌더링 없이 PDF 구조에서 페이지 크기(포인트 단위)를 읽어 반환
+    
+    렌더러와 같이 크롭박스(보이는 영역) 기준이며, /Rotate가 90 또는 270이면
+    화면에 보이는 방향에 맞춰 가로/세로를 바꿉니다.
+    
+    Returns:
+        (width, height) 포인트 단위 (1pt = 1/72 inch)
+    """
+    with open(pdf_path, 'rb') as file:
+        pdf = PyPDF2.PdfReader(file)
+        pdf_page = pdf.pages[page]
+        left, bottom, right, top = visible_box(pdf_page)
+        width = right - left
+        height = top - bottom
+        if (pdf_page.rotation or 0) % 180 == 90:
+            width, height = height, width
+        return width, height
+
+
+def page_size_to_pixels(page_size, dpi):
+    """포인트 단위 페이지 크기를 해당 dpi로 렌더링했을 때의 픽셀 크기로 변환"""
+    width, height = page_size
+    return math.ceil(width * dpi / 72), math.ceil(height * dpi / 72)
+
+
+def composite_stamp(base_img, stamp, pos):
+    """RGB 페이지 이미지의 스탬프 영역에만 알파 블렌딩 (페이지 전체 복사 없음)
+    
+    Args:
+        base_img: RGB 페이지 이미지 (제자리에서 수정됨)
+        stamp: RGBA 스탬프 이미지
+        pos: 스탬프 왼쪽 위 좌표 (x, y)
+    """
+    x, y = pos
+    if x >= base_img.width or y >= base_img.height or x + stamp.width <= 0 or y + stamp.height <= 0:
+        return
+    # RGB 대상에 RGBA 원본을 알파 마스크와 함께 붙이면 Pillow가 해당 영역만 블렌딩
+    base_img.paste(stamp, (x, y), stamp)
+
+
+def iter_selected_pages(pdf_path, dpi, pages, window=RENDER_WINDOW_PAGES):
+    """선택한 페이지만 렌더링하며 (페이지 번호, 이미지)를 차례로 반환
+    
+    연속된 페이지는 window 장씩 묶어 렌더러 호출 횟수를 줄입니다.
+    
+    Args:
+        pages: 오름차순 페이지 번호(0부터 시작) 목록
+    """
+    index = 0
+    while index < len(pages):
+        start = pages[index]
+        end = index
+        while end + 1 < len(pages) and pages[end + 1] == pages[end] + 1 and end + 1 - index < window:
+            end += 1
+        for offset, image in enumerate(render_pdf_pages(pdf_path, dpi, start, pages[end])):
+            yield start + offset, image
+        index = end + 1
+
+
+def _large_pages(pdf_path, dpi, pages, placement, budget=PAGE_MEMORY_BUDGET):
+    """RGB 비트맵이 budget을 넘어 띠 단위로 처리할 페이지 번호 집합"""
+    if not budget:
+        return set()
+    if placement is not None:
+        sizes = {page: placement['classes'][placement['pages'][page]]['page_size']
+                 for page in pages if page in placement['pages']}
+    else:
+        page_sizes = read_pdf_metadata(pdf_path)['page_sizes']
+        sizes = {page: page_sizes[page] for page in pages if page < len(page_sizes)}
+    large = set()
+    for page, size in sizes.items():
+        width, height = page_size_to_pixels(size, dpi)
+        if width * height * 3 > budget:
+            large.add(page)
+    return large
+
+
+def _write_banded_page(writer, pdf_path, dpi, page_number, page_infos, budget=PAGE_MEMORY_BUDGET):
+    """큰 페이지 한 장을 임시 파일로 렌더링하고 메모리 매핑으로 열어 띠 단위로 합성/인코딩"""
+    band_bytes = budget // 4
+    with tempfile.TemporaryDirectory(prefix='pdf-page-') as temp_dir:
+        path = os.path.join(temp_dir, 'page.ppm')
+        with instrumentation.stage('render'):
+            renderers.get_renderer().render_to_file(pdf_path, dpi, page_number, path, band_bytes)
+        with instrumentation.stage('stamp'):
+            stamps = [(get_stamp(info['path'], info['size']), info['pos']) for info in page_infos]
+        with MappedPage(path) as page:
+            rows = band_rows(page.width, band_bytes)
+            writer.begin_page(page.size)
+            for top in range(0, page.height, rows):
+                with instrumentation.stage('convert'):
+                    band = page.band(top, rows)
+                with instrumentation.stage('composite'):
+                    for stamp, (x, y) in stamps:
+                        composite_stamp(band, stamp, (x, y - top))
+                with instrumentation.stage('encode'):
+                    writer.add_band(top, band)
+                instrumentation.count('bands')
+            with instrumentation.stage('encode'):
+                writer.end_page()
+    instrumentation.count('banded_pages')
+    instrumentation.add_pages()
+
+
+def _write_stamped_pages(pdf_path, insert_infos, output_path, dpi, pages, encoding, placement, measure_savings):
+    """선택한 페이지를 렌더링해 합성하고 페이지 이미지 PDF로 기록"""
+    # 일괄 저장 보고서용으로 렌더링/변환/스탬프 준비/합성/인코딩 단계를 나눠 기록
+    large = _large_pages(pdf_path, dpi, pages, placement)
+    page_iter = iter_selected_pages(pdf_path, dpi, [page for page in pages if page not in large])
+    with StreamingPDFWriter(output_path, dpi=dpi, profile=encoding, measure_savings=measure_savings) as writer:
+        for page_number in pages:
+            page_infos = insert_infos
+            if placement is not None and page_number in placement['pages']:
+                page_infos = placement['classes'][placement['pages'][page_number]]['insert_infos']
+            if page_number in large:
+                _write_banded_page(writer, pdf_path, dpi, page_number, page_infos)
+                continue
+            with instrumentation.stage('render'):
+                item = next(page_iter, None)
+            # 렌더링 결과가 모자라거나 어긋나면 중단 (병합할 때 다른 페이지와 짝지어지지 않도록)
+            if item is None or item[0] != page_number:
+                raise RuntimeError(f'{page_number + 1}쪽(페이지 번호 {page_number})을 렌더링하지 못했습니다')
+            _, base_img = item
+            if base_img.mode != 'RGB':
+                with instrumentation.stage('convert'):
+                    base_img = base_img.convert('RGB')
+            for info in page_infos:
+                with instrumentation.stage('stamp'):
+                    stamp = get_stamp(info['path'], info['size'])
+                with instrumentation.stage('composite'):
+                    composite_stamp(base_img, stamp, info['pos'])
+            with instrumentation.stage('encode'):
+                writer.add_page(base_img)
+            instrumentation.add_pages()
+    
+    # 보고서용: 페이지 종류별 수(color_pages 등)와 기본 프로필 대비 절약한 용량
+    for name, value in writer.stats.items():
+        if name != 'pages':
+            instrumentation.count(name if name.endswith('_bytes') else f'{name}_pages', value)
+    instrumentation.count('saved_bytes', writer.saved_bytes)
+
+
+def _merge_pages(pdf_path, stamped_path, pages, output_path):
+    """원본 PDF에서 선택한 페이지만 합성된 페이지로 바꿔 저장 (나머지는 객체 그대로 복사)"""
+    reader = PyPDF2.PdfReader(pdf_path)
+    stamped_pages = {}
+    if pages:
+        stamped_pages = dict(zip(pages, PyPDF2.PdfReader(stamped_path).pages))
+    writer = PyPDF2.PdfWriter()
+    for page_number, page in enumerate(reader.pages):
+        writer.add_page(stamped_pages.get(page_number, page))
+    try:
+        with open(output_path, 'wb') as file:
+            writer.write(file)
+    except Exception:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+
+
+def insert_image_to_pdf(pdf_path, insert_infos, output_path, dpi=300, all_pages=False, engine=SAVE_ENGINE_RASTER,
+                        encoding=DEFAULT_ENCODING_PROFILE, placement=None, pages=None,
+                        measure_savings=ENCODING_MEASURE_SAVINGS):
     """PDF에 여러 이미지를 삽입하여 새 PDF로 저장
     
+    이미지를 넣지 않는 페이지는 렌더링하지 않고 원본 페이지 객체를 그대로 복사합니다.
+    
     Args:
         pdf_path: PDF 파일 경로
         insert_infos: [{ 'path': 이미지경로, 'pos': (x, y), 'size': (w, h) }, ...]
         output_path: 출력 PDF 파일 경로
         dpi: 해상도
-        all_pages: True이면 모든 페이지에 이미지 삽입, False이면 첫 페이지에만 삽입
+        all_pages: pages가 없을 때 True이면 모든 페이지, False이면 첫 페이지에만 이미지 삽입
+        engine: 'raster'이면 페이지를 렌더링해 합성, 'vector'이면 원본 페이지 위에 오버레이
+        encoding: 래스터 저장 시 페이지 이미지 인코딩 프로필 (config.ENCODING_PROFILES의 키)
+        measure_savings: 기본 프로필 대비 절약한 용량을 보고서용으로 측정 (페이지를 한 번 더 인코딩)
+        placement: PlacementPlanner.plan() 결과 (있으면 페이지 형태별로 미리 계산한 배치를 사용)
+        pages: 이미지를 삽입할 페이지 번호(0부터 시작) 목록 (없으면 placement의 선택 또는 all_pages)
     """
-    if not all_pages:
-        # 기존 방식: 첫 페이지에만 이미지 삽입
-        base_img = pdf_to_image(pdf_path, dpi, 0).convert('RGBA')
-        for info in insert_infos:
-            img = Image.open(info['path']).convert('RGBA').resize(info['size'], Image.LANCZOS)
-            base_img.paste(img, info['pos'], img)
-        base_img = base_img.convert('RGB')
-        base_img.save(output_path, 'PDF', resolution=dpi)
-    else:
-        # 모든 페이지에 이미지 삽입
-        images = pdf_to_image(pdf_path, dpi, -1)
-        output_images = []
-        
-        for base_img in images:
-            base_img = base_img.convert('RGBA')
-            for info in insert_infos:
-                img = Image.open(info['path']).convert('RGBA').resize(info['size'], Image.LANCZOS)
-                base_img.paste(img, info['pos'], img)
-            output_images.append(base_img.convert('RGB'))
-        
-        # 첫 번째 이미지를 저장하고 나머지 이미지를 append
-        if output_images:
-            output_images[0].save(output_path, 'PDF', resolution=dpi, 
-                                save_all=True, append_images=output_images[1:]) 
\ No newline at end of file
+    if pages is None and placement is not None:
+        pages = placement['selected']
+    
+    if engine == SAVE_ENGINE_VECTOR:
+        pdf_overlay.overlay_images_on_pdf(pdf_path, insert_infos, output_path, dpi=dpi, all_pages=all_pages,
+                                          placement=placement, pages=pages)
+        return
+    
+    # 계획에 페이지 수가 있으면 PDF를 다시 읽지 않음
+    page_count = placement['page_count'] if placement is not None else get_pdf_page_count(pdf_path)
+    if pages is None:
+        pages = range(page_count) if all_pages else [0]
+    pages = sorted({page for page in pages if 0 <= page < page_count})
+    
+    if len(pages) == page_count:
+        # 모든 페이지에 삽입: 몇 장씩 렌더링하면서 바로 출력 파일에 기록
+        _write_stamped_pages(pdf_path, insert_infos, output_path, dpi, pages, encoding, placement,
+                             measure_savings)
+        return
+    
+    # 선택한 페이지만 렌더링해 임시 파일에 기록한 뒤 원본 페이지들과 합침
+    stamped_path = output_path + '.stamped.tmp'
+    try:
+        if pages:
+            _write_stamped_pages(pdf_path, insert_infos, stamped_path, dpi, pages, encoding, placement,
+                             measure_savings)
+        with instrumentation.stage('passthrough'):
+            _merge_pages(pdf_path, stamped_path, pages, output_path)
+    finally:
+        if os.path.exists(stamped_path):
+            os.remove(stamped_path)
@@ -0,0 +1,153 @@
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import PyPDF2
+from .config import METADATA_CHUNK_SIZE, METADATA_MAX_WORKERS
+
+
+def visible_box(page):
+    """렌더러가 그리는 페이지 영역 (크롭박스와 미디어박스의 교집합, pt)
+
+    크롭박스가 없으면 PyPDF2가 미디어박스를 돌려주므로 미디어박스 전체가 됩니다.
+
+    Returns:
+        (left, bottom, right, top)
+    """
+    media = page.mediabox
+    crop = page.cropbox
+    left = max(float(crop.left), float(media.left))
+    bottom = max(float(crop.bottom), float(media.bottom))
+    right = min(float(crop.right), float(media.right))
+    top = min(float(crop.top), float(media.top))
+    if right <= left or top <= bottom:
+        # 잘못된 크롭박스는 렌더러처럼 미디어박스로 대체
+        return float(media.left), float(media.bottom), float(media.right), float(media.top)
+    return left, bottom, right, top
+
+
+def read_pdf_metadata(pdf_path):
+    """렌더링 없이 PDF 구조에서 메타데이터를 읽음
+
+    Returns:
+        {
+            'path': PDF 경로,
+            'file_size': 파일 크기 (바이트),
+            'mtime': 수정 시각 (ns),
+            'page_count': 페이지 수 (읽을 수 없으면 None),
+            'page_sizes': [(width, height), ...] 화면 방향 기준 페이지 크기 (pt),
+            'rotations': [0, 90, ...] 페이지별 /Rotate 값,
+            'boxes': [(left, bottom, right, top), ...] 페이지별 보이는 영역 (크롭박스, pt),
+            'encrypted': 암호화 여부,
+            'damaged': 손상되어 읽을 수 없는지 여부,
+            'error': 오류 메시지 또는 None
+        }
+    """
+    stat = os.stat(pdf_path)
+    metadata = {
+        'path': pdf_path,
+        'file_size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'page_count': None,
+        'page_sizes': [],
+        'rotations': [],
+        'boxes': [],
+        'encrypted': False,
+        'damaged': False,
+        'error': None
+    }
+    try:
+        with open(pdf_path, 'rb') as file:
+            pdf = PyPDF2.PdfReader(file)
+            if pdf.is_encrypted:
+                metadata['encrypted'] = True
+                # 열람 암호가 없는 (권한만 제한된) PDF는 빈 암호로 열 수 있음
+                if not pdf.decrypt(''):
+                    metadata['error'] = '암호가 필요합니다'
+                    return metadata
+            for page in pdf.pages:
+                box = visible_box(page)
+                width = box[2] - box[0]
+                height = box[3] - box[1]
+                rotation = (page.rotation or 0) % 360
+                if rotation % 180 == 90:
+                    width, height = height, width
+                metadata['page_sizes'].append((width, height))
+                metadata['rotations'].append(rotation)
+                metadata['boxes'].append(box)
+            metadata['page_count'] = len(metadata['page_sizes'])
+    except Exception as e:
+        metadata['damaged'] = True
+        metadata['error'] = str(e)
+    return metadata
+
+
+def _read_chunk(pdf_paths):
+    """작업자 프로세스에서 여러 PDF의 메타데이터를 한 번에 읽음"""
+    results = []
+    for pdf_path in pdf_paths:
+        try:
+            results.append(read_pdf_metadata(pdf_path))
+        except OSError as e:
+            results.append({'path': pdf_path, 'damaged': True, 'error': str(e),
+                            'page_count': None, 'page_sizes': [], 'rotations': [], 'boxes': []})
+    return results
+
+
+class PDFMetadataIndex:
+    """PDF 메타데이터를 백그라운드에서 채워 두는 색인
+
+    load()는 바로 반환하고, 메타데이터는 작업자 프로세스에서 묶음 단위로 읽습니다.
+    읽은 결과는 updates 큐에 들어가므로 GUI는 after()로 확인해 목록을 갱신합니다.
+    """
+
+    def __init__(self, max_workers=METADATA_MAX_WORKERS, chunk_size=METADATA_CHUNK_SIZE):
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.updates = queue.Queue()
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def load(self, pdf_paths):
+        """아직 색인에 없는 PDF의 메타데이터를 백그라운드에서 읽기 시작"""
+        with self._lock:
+            missing = [path for path in pdf_paths if path not in self._entries]
+        if not missing:
+            return
+        if self._executor is None:
+            # GUI 스레드와 렌더링 스레드가 있는 프로세스이므로 fork 대신 spawn 사용
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        for start in range(0, len(missing), self.chunk_size):
+            future = self._executor.submit(_read_chunk, missing[start:start + self.chunk_size])
+            future.add_done_callback(self._on_chunk_done)
+
+    def _on_chunk_done(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        for metadata in future.result():
+            with self._lock:
+                self._entries[metadata['path']] = metadata
+            self.updates.put(metadata)
+
+    def get(self, pdf_path):
+        """색인된 메타데이터를 반환 (아직 없거나 파일이 바뀌었으면 None)"""
+        with self._lock:
+            metadata = self._entries.get(pdf_path)
+        if metadata is None:
+            return None
+        try:
+            stat = os.stat(pdf_path)
+        except OSError:
+            return None
+        if stat.st_size != metadata.get('file_size') or stat.st_mtime_ns != metadata.get('mtime'):
+            return None
+        return metadata
+
+    def shutdown(self):
+        """아직 시작하지 않은 묶음은 버리고 작업자 풀 종료 (끝날 때까지 기다리지 않음)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
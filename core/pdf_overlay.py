@@ -0,0 +1,228 @@
+import os
+import threading
+import zlib
+from collections import OrderedDict
+import PyPDF2
+from PyPDF2.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, EncodedStreamObject,
+    NameObject, NumberObject
+)
+from . import instrumentation
+from .config import STAMP_STREAM_CACHE_SIZE
+from .pdf_metadata import visible_box
+from .stamp_cache import get_stamp
+
+
+# 인코딩된 스탬프 스트림 캐시: (경로, 수정시각, 크기) -> 압축된 픽셀 데이터
+# 같은 배치의 여러 PDF가 같은 스탬프를 쓰면 한 번만 인코딩합니다.
+_stamp_stream_cache = OrderedDict()
+_stamp_stream_lock = threading.Lock()
+
+
+def _display_to_user(page_box, rotation, dx, dy):
+    """화면(렌더링 결과) 기준 좌표를 PDF 사용자 공간 좌표로 변환
+
+    Args:
+        page_box: 페이지 박스 (left, bottom, right, top), 포인트 단위
+        rotation: 페이지 /Rotate 값 (0, 90, 180, 270)
+        dx, dy: 렌더링된 페이지의 왼쪽 위를 원점으로 하는 좌표 (포인트, y는 아래 방향)
+    """
+    left, bottom, right, top = page_box
+    if rotation == 90:
+        return left + dy, bottom + dx
+    if rotation == 180:
+        return right - dx, bottom + dy
+    if rotation == 270:
+        return right - dy, top - dx
+    return left + dx, top - dy
+
+
+def stamp_matrix(page_box, rotation, pos, size, dpi):
+    """스탬프 이미지를 그릴 변환 행렬(cm 연산자 인자)을 계산
+
+    pos, size는 래스터 저장 경로와 같은 dpi 기준 픽셀 단위입니다.
+    """
+    scale = 72.0 / dpi
+    x, y = pos[0] * scale, pos[1] * scale
+    w, h = size[0] * scale, size[1] * scale
+    # 이미지 단위 정사각형의 (0,0)은 왼쪽 아래, (0,1)은 왼쪽 위 모서리
+    e, f = _display_to_user(page_box, rotation, x, y + h)
+    ax, ay = _display_to_user(page_box, rotation, x + w, y + h)
+    cx, cy = _display_to_user(page_box, rotation, x, y)
+    return (ax - e, ay - f, cx - e, cy - f, e, f)
+
+
+def _encode_stamp(path, size):
+    """스탬프 이미지를 목표 크기로 변환하고 Flate 압축한 데이터를 반환 (캐시 사용)
+
+    Returns:
+        { 'width', 'height', 'rgb': 압축된 RGB 데이터, 'alpha': 압축된 알파 데이터 또는 None }
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns, tuple(size))
+    with _stamp_stream_lock:
+        encoded = _stamp_stream_cache.get(key)
+        if encoded is not None:
+            _stamp_stream_cache.move_to_end(key)
+            return encoded
+
+    img = get_stamp(path, size)
+    alpha = img.getchannel('A')
+    encoded = {
+        'width': img.width,
+        'height': img.height,
+        'rgb': zlib.compress(img.convert('RGB').tobytes()),
+        # 완전히 불투명한 이미지는 SMask를 생략
+        'alpha': zlib.compress(alpha.tobytes()) if alpha.getextrema()[0] < 255 else None,
+    }
+
+    with _stamp_stream_lock:
+        _stamp_stream_cache[key] = encoded
+        while len(_stamp_stream_cache) > STAMP_STREAM_CACHE_SIZE:
+            _stamp_stream_cache.popitem(last=False)
+    return encoded
+
+
+def _image_stream(writer, encoded):
+    """인코딩된 스탬프를 PDF 이미지 XObject로 writer에 추가 (알파는 SMask로 분리)"""
+    stream = EncodedStreamObject()
+    stream[NameObject('/Type')] = NameObject('/XObject')
+    stream[NameObject('/Subtype')] = NameObject('/Image')
+    stream[NameObject('/Width')] = NumberObject(encoded['width'])
+    stream[NameObject('/Height')] = NumberObject(encoded['height'])
+    stream[NameObject('/ColorSpace')] = NameObject('/DeviceRGB')
+    stream[NameObject('/BitsPerComponent')] = NumberObject(8)
+    stream[NameObject('/Filter')] = NameObject('/FlateDecode')
+    stream._data = encoded['rgb']
+
+    if encoded['alpha'] is not None:
+        smask = EncodedStreamObject()
+        smask[NameObject('/Type')] = NameObject('/XObject')
+        smask[NameObject('/Subtype')] = NameObject('/Image')
+        smask[NameObject('/Width')] = NumberObject(encoded['width'])
+        smask[NameObject('/Height')] = NumberObject(encoded['height'])
+        smask[NameObject('/ColorSpace')] = NameObject('/DeviceGray')
+        smask[NameObject('/BitsPerComponent')] = NumberObject(8)
+        smask[NameObject('/Filter')] = NameObject('/FlateDecode')
+        smask._data = encoded['alpha']
+        stream[NameObject('/SMask')] = writer._add_object(smask)
+    return writer._add_object(stream)
+
+
+def _add_stream(writer, data):
+    """내용 스트림을 writer의 간접 객체로 추가"""
+    stream = DecodedStreamObject()
+    stream.set_data(data)
+    return writer._add_object(stream)
+
+
+def _merge_overlay(writer, page, xobjects, overlay_content):
+    """오버레이(이미지 XObject + 내용 스트림)를 기존 페이지 위에 병합
+
+    원본 내용 스트림은 다시 파싱하거나 인코딩하지 않고 q/Q로 감싸기만 하므로
+    텍스트와 벡터 내용이 그대로 유지됩니다.
+    """
+    resources = page.get('/Resources')
+    resources = DictionaryObject(resources.get_object()) if resources is not None else DictionaryObject()
+    page_xobjects = resources.get('/XObject')
+    page_xobjects = DictionaryObject(page_xobjects.get_object()) if page_xobjects is not None else DictionaryObject()
+
+    # 기존 리소스 이름과 겹치지 않도록 이름 지정
+    rename = {}
+    for name, ref in xobjects.items():
+        new_name = name
+        suffix = 1
+        while new_name in page_xobjects and page_xobjects.raw_get(new_name) != ref:
+            new_name = f'{name}_{suffix}'
+            suffix += 1
+        page_xobjects[NameObject(new_name)] = ref
+        rename[name] = new_name
+    resources[NameObject('/XObject')] = page_xobjects
+    page[NameObject('/Resources')] = resources
+
+    for name, new_name in rename.items():
+        overlay_content = overlay_content.replace(f'{name} Do'.encode(), f'{new_name} Do'.encode())
+
+    contents = ArrayObject([_add_stream(writer, b'q\n')])
+    original = page.get('/Contents')
+    if original is not None:
+        original_obj = original.get_object()
+        if isinstance(original_obj, ArrayObject):
+            contents.extend(original_obj)
+        else:
+            contents.append(original)
+    contents.append(_add_stream(writer, b'\nQ\n' + overlay_content))
+    page[NameObject('/Contents')] = contents
+
+
+def overlay_images_on_pdf(pdf_path, insert_infos, output_path, dpi=300, all_pages=False, placement=None, pages=None):
+    """원본 PDF를 래스터화하지 않고 이미지를 오버레이로 합성하여 저장
+
+    Args:
+        pdf_path: PDF 파일 경로
+        insert_infos: [{ 'path': 이미지경로, 'pos': (x, y), 'size': (w, h) }, ...]
+            (래스터 저장과 동일하게 dpi 기준 픽셀 단위)
+        output_path: 출력 PDF 파일 경로
+        dpi: insert_infos 좌표의 기준 해상도
+        all_pages: pages가 없을 때 True이면 모든 페이지, False이면 첫 페이지에만 이미지 삽입
+        placement: PlacementPlanner.plan() 결과 (있으면 페이지마다 미리 계산한 변환 사용,
+            페이지 수가 맞지 않으면 무시하고 insert_infos로 계산)
+        pages: 이미지를 삽입할 페이지 번호(0부터 시작) 목록
+
+    이미지를 넣지 않는 페이지도 출력에 포함되며, 내용은 건드리지 않고 페이지 객체만 복사합니다.
+    """
+    with instrumentation.stage('read'):
+        reader = PyPDF2.PdfReader(pdf_path)
+        writer = PyPDF2.PdfWriter()
+    if placement is not None and placement['page_count'] != len(reader.pages):
+        placement = None
+    if pages is None:
+        pages = range(len(reader.pages)) if all_pages else [0]
+    pages = set(pages)
+
+    # 같은 스탬프(경로 + 크기)는 문서당 하나의 XObject로 넣고 그 크기를 쓰는 페이지가 모두 참조
+    stamp_refs = {}
+
+    def stamp_ref(info):
+        key = (info['path'], tuple(info['size']))
+        if key not in stamp_refs:
+            with instrumentation.stage('stamp'):
+                stamp_refs[key] = (f'/PIEStamp{len(stamp_refs)}', _image_stream(writer, _encode_stamp(*key)))
+        return stamp_refs[key]
+
+    for page_number, source_page in enumerate(reader.pages):
+        if page_number not in pages:
+            with instrumentation.stage('passthrough'):
+                writer.add_page(source_page)
+            continue
+
+        if placement is not None and page_number in placement['pages']:
+            transform = placement['classes'][placement['pages'][page_number]]
+            page_infos, matrices = transform['insert_infos'], transform['matrices']
+        else:
+            page_infos, matrices = insert_infos, None
+        refs = [stamp_ref(info) for info in page_infos]
+
+        with instrumentation.stage('overlay'):
+            page = writer.add_page(source_page)
+            if matrices is None:
+                # 렌더링 결과(미리보기, 래스터 저장)와 같은 크롭박스 기준 좌표
+                page_box = visible_box(page)
+                rotation = (page.rotation or 0) % 360
+                matrices = [stamp_matrix(page_box, rotation, info['pos'], info['size'], dpi) for info in page_infos]
+
+            operations = []
+            for (name, _), matrix in zip(refs, matrices):
+                operations.append(f'q {" ".join(f"{value:.4f}" for value in matrix)} cm {name} Do Q')
+
+            _merge_overlay(writer, page, dict(refs), '\n'.join(operations).encode())
+        instrumentation.add_pages()
+
+    with instrumentation.stage('write'):
+        with open(output_path, 'wb') as file:
+            try:
+                writer.write(file)
+            except BaseException:
+                # 실패한 경우 불완전한 출력 파일을 남기지 않음 (래스터 저장과 동일)
+                file.close()
+                os.remove(output_path)
+                raise
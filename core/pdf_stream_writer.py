@@ -0,0 +1,262 @@
+import io
+import os
+import zlib
+from PIL import Image, ImageChops
+from .config import (
+    BILEVEL_MIDTONE_RANGE, BILEVEL_MIDTONE_RATIO, BILEVEL_THRESHOLD, DEFAULT_ENCODING_PROFILE,
+    ENCODING_MEASURE_SAVINGS, ENCODING_PROFILES, ENCODING_STANDARD, GRAYSCALE_COLOR_RATIO,
+    GRAYSCALE_TOLERANCE
+)
+
+
+PAGE_COLOR = 'color'
+PAGE_GRAY = 'gray'
+PAGE_BILEVEL = 'bilevel'
+
+# 띠 단위로 기록한 페이지의 종류를 정할 때의 우선순위 (뒤쪽일수록 우선)
+_KIND_ORDER = (PAGE_BILEVEL, PAGE_GRAY, PAGE_COLOR)
+
+
+def classify_page(image):
+    """페이지 이미지가 컬러, 흑백(8비트), 1비트 중 어느 것으로 저장해도 되는지 판별
+
+    Args:
+        image: RGB 또는 L 모드 PIL 이미지
+
+    Returns:
+        (PAGE_COLOR | PAGE_GRAY | PAGE_BILEVEL, 흑백으로 변환한 이미지 또는 None)
+    """
+    if image.mode == 'RGB':
+        # 색 판별은 1/4로 줄인 이미지로 충분 (작은 컬러 스탬프도 평균 색은 남음)
+        small = image.reduce(4) if min(image.size) >= 256 else image
+        r, g, b = small.split()
+        chroma = ImageChops.lighter(ImageChops.difference(r, g), ImageChops.difference(g, b))
+        colored = sum(chroma.histogram()[GRAYSCALE_TOLERANCE + 1:])
+        if colored > small.width * small.height * GRAYSCALE_COLOR_RATIO:
+            return PAGE_COLOR, None
+        gray = image.convert('L')
+    else:
+        gray = image
+
+    low, high = BILEVEL_MIDTONE_RANGE
+    midtones = sum(gray.histogram()[low:high])
+    if midtones <= gray.width * gray.height * BILEVEL_MIDTONE_RATIO:
+        return PAGE_BILEVEL, gray
+    return PAGE_GRAY, gray
+
+
+class StreamingPDFWriter:
+    """페이지 이미지를 한 장씩 받아 즉시 파일에 기록하는 PDF 작성기
+
+    Image.save('PDF', save_all=True)는 모든 페이지 이미지를 리스트로 받아야 하지만,
+    이 작성기는 페이지마다 이미지를 인코딩해 바로 기록하고 버리므로
+    페이지 수와 관계없이 메모리 사용량이 일정합니다.
+
+    이미지 인코딩 방식(JPEG 품질, 흑백/1비트 자동 판별, 축소 해상도)은
+    config.ENCODING_PROFILES의 프로필로 정합니다.
+
+    사용 예:
+        with StreamingPDFWriter(output_path, dpi=300, profile='auto') as writer:
+            for page_img in pages:
+                writer.add_page(page_img)
+    """
+
+    # 객체 번호 1, 2는 카탈로그와 페이지 트리로 예약
+    _CATALOG_ID = 1
+    _PAGES_ID = 2
+
+    def __init__(self, output_path, dpi=300, profile=DEFAULT_ENCODING_PROFILE, measure_savings=ENCODING_MEASURE_SAVINGS):
+        self.output_path = output_path
+        self.dpi = dpi
+        self.profile_name = profile
+        self.profile = ENCODING_PROFILES[profile]
+        # 기본 프로필이면 결과가 기준과 같으므로 비교 인코딩을 하지 않음
+        self.measure_savings = measure_savings and profile != ENCODING_STANDARD
+        self.stats = {
+            'pages': 0,
+            PAGE_COLOR: 0,
+            PAGE_GRAY: 0,
+            PAGE_BILEVEL: 0,
+            'image_bytes': 0,       # 기록한 페이지 이미지 크기 합계
+            'baseline_bytes': 0,    # 기본 프로필(컬러 JPEG)로 저장했을 때의 크기 합계
+        }
+        self._file = open(output_path, 'wb')
+        self._offsets = {}
+        self._page_ids = []
+        self._next_id = 3
+        self._file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 실패한 경우 불완전한 출력 파일을 남기지 않음
+            self._file.close()
+            os.remove(self.output_path)
+        return False
+
+    def _begin_object(self, obj_id=None):
+        if obj_id is None:
+            obj_id = self._next_id
+            self._next_id += 1
+        self._offsets[obj_id] = self._file.tell()
+        self._file.write(f'{obj_id} 0 obj\n'.encode())
+        return obj_id
+
+    def _write_stream_object(self, dictionary, data):
+        obj_id = self._begin_object()
+        self._file.write(f'<<{dictionary} /Length {len(data)}>>\nstream\n'.encode())
+        self._file.write(data)
+        self._file.write(b'\nendstream\nendobj\n')
+        return obj_id
+
+    def _write_object(self, body):
+        obj_id = self._begin_object()
+        self._file.write(body.encode() + b'\nendobj\n')
+        return obj_id
+
+    def _downsample(self, image):
+        """프로필의 target_dpi가 저장 해상도보다 낮으면 이미지를 줄임"""
+        target_dpi = self.profile['target_dpi']
+        if not target_dpi or target_dpi >= self.dpi:
+            return image
+        scale = target_dpi / self.dpi
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        return image.resize(size, Image.LANCZOS, reducing_gap=2.0)
+
+    def _encode_image(self, image):
+        """페이지 이미지를 프로필에 맞게 인코딩
+
+        Returns:
+            (페이지 종류, 이미지 XObject 사전 문자열, 인코딩된 데이터)
+        """
+        kind, gray = PAGE_COLOR, None
+        if self.profile['auto_color']:
+            kind, gray = classify_page(image)
+        elif image.mode == 'L':
+            kind, gray = PAGE_GRAY, image
+
+        if kind == PAGE_BILEVEL:
+            # 흑백 문서는 해상도를 유지한 채 1비트 Flate로 저장 (글자 가장자리 보존)
+            table = [0 if value < BILEVEL_THRESHOLD else 255 for value in range(256)]
+            bilevel = gray.point(table, '1')
+            width, height = bilevel.size
+            return kind, (
+                f'/Type /XObject /Subtype /Image /Width {width} /Height {height} '
+                f'/ColorSpace /DeviceGray /BitsPerComponent 1 /Filter /FlateDecode'
+            ), zlib.compress(bilevel.tobytes())
+
+        image = self._downsample(gray if kind == PAGE_GRAY else image)
+        color_space = '/DeviceRGB' if image.mode == 'RGB' else '/DeviceGray'
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=self.profile['jpeg_quality'])
+        width, height = image.size
+        return kind, (
+            f'/Type /XObject /Subtype /Image /Width {width} /Height {height} '
+            f'/ColorSpace {color_space} /BitsPerComponent 8 /Filter /DCTDecode'
+        ), buffer.getvalue()
+
+    def add_page(self, image):
+        """페이지 이미지 한 장을 프로필에 맞게 인코딩해 새 페이지로 기록
+
+        Args:
+            image: RGB 또는 L 모드 PIL 이미지 (저장 해상도 기준)
+        """
+        self.begin_page(image.size)
+        self.add_band(0, image)
+        self.end_page()
+
+    def begin_page(self, size):
+        """띠(band) 단위로 기록할 새 페이지를 시작
+
+        아주 큰 페이지는 add_band()로 가로 띠를 위에서부터 한 장씩 넘기면 띠마다 별도의
+        이미지로 인코딩해 기록하므로 페이지 전체 비트맵이 메모리에 있을 필요가 없습니다.
+
+        Args:
+            size: 페이지 전체의 픽셀 크기 (width, height) (저장 해상도 기준)
+        """
+        self._page_size = size
+        self._page_kind = None
+        self._bands = []            # (이미지 객체 번호, 위쪽 행, 행 수)
+
+    def add_band(self, top, image):
+        """현재 페이지의 top 행부터 시작하는 띠 이미지를 인코딩해 기록
+
+        Args:
+            top: 띠의 위쪽 행 (페이지 위 기준 픽셀)
+            image: RGB 또는 L 모드 PIL 이미지 (너비는 페이지와 같음)
+        """
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+
+        kind, dictionary, data = self._encode_image(image)
+        image_id = self._write_stream_object(dictionary, data)
+        self._bands.append((image_id, top, image.height))
+        # 페이지 종류는 띠 중 가장 많은 색 정보가 필요한 종류로 셈
+        if self._page_kind is None or _KIND_ORDER.index(kind) > _KIND_ORDER.index(self._page_kind):
+            self._page_kind = kind
+
+        self.stats['image_bytes'] += len(data)
+        if self.measure_savings:
+            baseline = io.BytesIO()
+            image.save(baseline, 'JPEG', quality=ENCODING_PROFILES[ENCODING_STANDARD]['jpeg_quality'])
+            self.stats['baseline_bytes'] += baseline.tell()
+        else:
+            self.stats['baseline_bytes'] += len(data)
+
+    def end_page(self):
+        """begin_page() 이후 기록한 띠들을 배치한 페이지를 기록"""
+        # 페이지 크기(pt) = 픽셀 / dpi * 72 (축소해서 저장해도 페이지 크기는 그대로)
+        width, height = self._page_size
+        scale = 72.0 / self.dpi
+        page_w = width * scale
+        page_h = height * scale
+
+        commands = []
+        xobjects = []
+        for index, (image_id, top, rows) in enumerate(self._bands):
+            # PDF 좌표는 아래쪽 기준이므로 띠의 아래쪽 행으로 위치를 계산
+            band_y = (height - top - rows) * scale
+            commands.append(f'q {page_w:.4f} 0 0 {rows * scale:.4f} 0 {band_y:.4f} cm /Im{index} Do Q')
+            xobjects.append(f'/Im{index} {image_id} 0 R')
+        content_id = self._write_stream_object('', '\n'.join(commands).encode())
+        page_id = self._write_object(
+            f'<</Type /Page /Parent {self._PAGES_ID} 0 R '
+            f'/MediaBox [0 0 {page_w:.4f} {page_h:.4f}] '
+            f'/Resources <</XObject <<{" ".join(xobjects)}>>>> '
+            f'/Contents {content_id} 0 R>>'
+        )
+        self._page_ids.append(page_id)
+        self.stats['pages'] += 1
+        if self._page_kind is not None:
+            self.stats[self._page_kind] += 1
+        self._bands = []
+
+    @property
+    def saved_bytes(self):
+        """기본 프로필 대비 줄어든 페이지 이미지 용량 (바이트)"""
+        return self.stats['baseline_bytes'] - self.stats['image_bytes']
+
+    def close(self):
+        """페이지 트리, 카탈로그, 상호 참조 테이블을 기록하고 파일을 닫음"""
+        if self._file.closed:
+            return
+        kids = ' '.join(f'{page_id} 0 R' for page_id in self._page_ids)
+        self._begin_object(self._PAGES_ID)
+        self._file.write(f'<</Type /Pages /Kids [{kids}] /Count {len(self._page_ids)}>>\nendobj\n'.encode())
+        self._begin_object(self._CATALOG_ID)
+        self._file.write(f'<</Type /Catalog /Pages {self._PAGES_ID} 0 R>>\nendobj\n'.encode())
+
+        xref_offset = self._file.tell()
+        size = self._next_id
+        self._file.write(f'xref\n0 {size}\n0000000000 65535 f \n'.encode())
+        for obj_id in range(1, size):
+            self._file.write(f'{self._offsets[obj_id]:010d} 00000 n \n'.encode())
+        self._file.write(
+            f'trailer\n<</Size {size} /Root {self._CATALOG_ID} 0 R>>\n'
+            f'startxref\n{xref_offset}\n%%EOF\n'.encode()
+        )
+        self._file.close()
@@ -0,0 +1,118 @@
+from . import pdf_image_utils
+from .pdf_overlay import stamp_matrix
+
+
+def relative_insert_infos(stamps, page_size, dpi):
+    """페이지 상대 단위(0~1) 스탬프 배치를 해당 페이지의 출력 해상도 기준 insert_infos로 변환
+
+    Args:
+        stamps: [{ 'path', 'x', 'y', 'width', 'height' }, ...] 페이지 너비/높이에 대한 비율
+            (x, y는 화면에 보이는 페이지의 왼쪽 위 기준)
+        page_size: 페이지 크기 (width, height) 포인트 단위
+        dpi: 출력 해상도
+    """
+    output_w, output_h = pdf_image_utils.page_size_to_pixels(page_size, dpi)
+    insert_infos = []
+    for stamp in stamps:
+        insert_infos.append({
+            'path': stamp['path'],
+            'pos': (int(stamp['x'] * output_w), int(stamp['y'] * output_h)),
+            'size': (max(1, int(stamp['width'] * output_w)), max(1, int(stamp['height'] * output_h)))
+        })
+    return insert_infos
+
+
+def geometry_key(box, rotation):
+    """페이지 형태(보이는 영역 + 회전)를 비교하기 위한 키 (0.01pt 단위로 반올림)"""
+    return tuple(round(float(value), 2) for value in box) + (int(rotation) % 360,)
+
+
+def displayed_size(box, rotation):
+    """보이는 영역(크롭박스)과 회전으로 화면에 보이는 페이지 크기 (pt)"""
+    left, bottom, right, top = box
+    width, height = right - left, top - bottom
+    if rotation % 180 == 90:
+        width, height = height, width
+    return width, height
+
+
+class PlacementPlanner:
+    """스탬프 배치를 페이지 형태(보이는 영역 + 회전)별 변환으로 한 번씩만 계산하는 계획기
+
+    한 일괄 저장에서 A4, Letter, 가로 페이지가 섞여 있어도 형태마다 변환을 한 번 계산하고,
+    각 파일의 선택된 페이지는 자기 형태의 변환을 찾아 쓰기만 합니다.
+    """
+
+    def __init__(self, stamps, dpi):
+        self.stamps = stamps
+        self.dpi = dpi
+        self._transforms = {}       # geometry_key -> 변환
+
+    def transform(self, box, rotation):
+        """페이지 형태 하나의 스탬프 변환
+
+        Returns:
+            {
+                'box': 보이는 영역(크롭박스) (left, bottom, right, top),
+                'rotation': 회전,
+                'page_size': 화면 기준 페이지 크기 (pt),
+                'insert_infos': 래스터 저장용 픽셀 좌표 (dpi 기준),
+                'matrices': 벡터 저장용 스탬프별 변환 행렬
+            }
+        """
+        rotation = int(rotation) % 360
+        key = geometry_key(box, rotation)
+        transform = self._transforms.get(key)
+        if transform is None:
+            box = tuple(float(value) for value in box)
+            page_size = displayed_size(box, rotation)
+            insert_infos = relative_insert_infos(self.stamps, page_size, self.dpi)
+            transform = {
+                'box': box,
+                'rotation': rotation,
+                'page_size': page_size,
+                'insert_infos': insert_infos,
+                'matrices': [
+                    stamp_matrix(box, rotation, info['pos'], info['size'], self.dpi)
+                    for info in insert_infos
+                ]
+            }
+            self._transforms[key] = transform
+        return transform
+
+    def plan(self, metadata, pages):
+        """PDF 메타데이터(read_pdf_metadata 결과)로 파일 하나의 페이지별 변환 계획을 만듦
+
+        Args:
+            metadata: read_pdf_metadata 결과
+            pages: 스탬프를 넣을 페이지 번호(0부터 시작) 목록
+
+        Returns:
+            {
+                'page_count': 전체 페이지 수,
+                'selected': 스탬프를 넣을 페이지 번호 목록,
+                'classes': [변환, ...] 선택한 페이지에 나오는 페이지 형태,
+                'pages': { 페이지 번호: classes의 인덱스, ... }
+            }
+            메타데이터에 페이지 정보가 없으면 None
+        """
+        boxes = metadata.get('boxes') if metadata else None
+        if not boxes:
+            return None
+        classes = []
+        class_index = {}
+        page_classes = {}
+        selected = [index for index in pages if 0 <= index < len(boxes)]
+        for index in selected:
+            box, rotation = boxes[index], metadata['rotations'][index]
+            key = geometry_key(box, rotation)
+            if key not in class_index:
+                class_index[key] = len(classes)
+                classes.append(self.transform(box, rotation))
+            page_classes[index] = class_index[key]
+        return {'page_count': metadata['page_count'], 'selected': selected, 'classes': classes, 'pages': page_classes}
+
+    @property
+    def geometry_count(self):
+        """지금까지 계산한 페이지 형태 수"""
+        return len(self._transforms)
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import threading
+from PIL import Image
+from . import pdf_image_utils
+from .config import PREVIEW_CACHE_DIR, PREVIEW_CACHE_MAX_BYTES
+
+
+class PreviewCache:
+    """렌더링한 미리보기 이미지를 디스크에 보관하는 캐시
+
+    키는 (PDF 절대 경로, 파일 크기, 수정 시각, dpi, 페이지)의 해시이므로 PDF가
+    바뀌면 자동으로 새로 렌더링합니다. 빠르게 디코딩되도록 낮은 압축 수준의 PNG로
+    저장하며, 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+    프로그램을 다시 시작해도 캐시가 유지됩니다.
+    """
+
+    def __init__(self, cache_dir=PREVIEW_CACHE_DIR, max_bytes=PREVIEW_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes = None
+        self._lock = threading.Lock()
+
+    def _entry_path(self, pdf_path, dpi, page):
+        stat = os.stat(pdf_path)
+        key = f'{os.path.abspath(pdf_path)}|{stat.st_size}|{stat.st_mtime_ns}|{dpi}|{page}'
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + '.png')
+
+    def get(self, pdf_path, dpi=100, page=0):
+        """캐시된 미리보기 이미지를 반환 (없으면 None)"""
+        entry = self._entry_path(pdf_path, dpi, page)
+        try:
+            with Image.open(entry) as img:
+                img.load()
+                image = img.convert('RGB') if img.mode != 'RGB' else img.copy()
+            # 최근 사용 시각 갱신 (정리 순서에 사용)
+            os.utime(entry)
+            return image
+        except (OSError, SyntaxError):
+            return None
+
+    def put(self, pdf_path, image, dpi=100, page=0):
+        """미리보기 이미지를 캐시에 저장 (디스크 오류는 무시)"""
+        entry = self._entry_path(pdf_path, dpi, page)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f'{entry}.{os.getpid()}.{threading.get_ident()}.tmp'
+            image.save(temp_path, 'PNG', compress_level=1)
+            os.replace(temp_path, entry)
+            size = os.path.getsize(entry)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            else:
+                self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def get_or_render(self, pdf_path, dpi=100, page=0):
+        """캐시에 있으면 바로 반환하고, 없으면 렌더링한 뒤 저장"""
+        image = self.get(pdf_path, dpi, page)
+        if image is None:
+            image = pdf_image_utils.pdf_to_image(pdf_path, dpi=dpi, page=page)
+            self.put(pdf_path, image, dpi, page)
+        return image
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.png'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _scan_total(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """오래 사용하지 않은 항목부터 지워 전체 크기를 max_bytes의 90% 이하로 줄임"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def clear(self):
+        """캐시 파일 모두 삭제"""
+        with self._lock:
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total_bytes = 0
@@ -0,0 +1,105 @@
+import queue
+import threading
+from collections import OrderedDict
+from .config import PREVIEW_MEMORY_CACHE_SIZE, PREVIEW_PREFETCH_NEIGHBORS
+
+
+class PreviewPrefetcher:
+    """선택된 PDF를 먼저, 이어서 앞뒤 PDF를 백그라운드 스레드에서 미리 렌더링
+
+    render(pdf_path)의 결과를 메모리 LRU 캐시에 보관합니다. 현재 선택된 PDF의 결과는
+    results 큐에 (pdf_path, 결과, 오류)로 넣으며, GUI는 메인 스레드에서 after()로
+    이 큐를 확인해 캔버스에 표시합니다. 새 요청이 들어오면 아직 시작하지 않은
+    이전 요청은 버려집니다.
+    """
+
+    def __init__(self, render, neighbors=PREVIEW_PREFETCH_NEIGHBORS, max_items=PREVIEW_MEMORY_CACHE_SIZE):
+        self.render = render
+        self.neighbors = neighbors
+        self.max_items = max_items
+        self.results = queue.Queue()
+        self._cache = OrderedDict()
+        self._pending = []
+        self._wanted = None
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def get_cached(self, pdf_path):
+        """메모리 캐시에 있는 결과를 반환 (없으면 None)"""
+        with self._condition:
+            result = self._cache.get(pdf_path)
+            if result is not None:
+                self._cache.move_to_end(pdf_path)
+            return result
+
+    def request(self, pdf_list, index):
+        """index의 PDF를 표시하려 한다고 알리고, 이미 준비된 결과가 있으면 바로 반환
+
+        준비되지 않았으면 None을 반환하며 렌더링이 끝나면 results 큐로 전달됩니다.
+        어느 경우든 앞뒤 neighbors개 PDF를 이어서 미리 렌더링합니다.
+        """
+        pdf_path = pdf_list[index]
+        cached = self.get_cached(pdf_path)
+
+        # 가까운 순서로 다음/이전 PDF 예약
+        order = [] if cached is not None else [pdf_path]
+        for distance in range(1, self.neighbors + 1):
+            for neighbor in (index + distance, index - distance):
+                if 0 <= neighbor < len(pdf_list):
+                    order.append(pdf_list[neighbor])
+
+        with self._condition:
+            self._wanted = None if cached is not None else pdf_path
+            # 이전 요청 중 시작하지 않은 것은 취소
+            self._pending = [path for path in order if path not in self._cache]
+            self._condition.notify()
+        return cached
+
+    def cancel(self):
+        """대기 중인 모든 요청 취소"""
+        with self._condition:
+            self._wanted = None
+            self._pending = []
+
+    def stop(self):
+        """대기 중인 요청을 버리고 백그라운드 스레드 종료 (렌더링 중인 PDF는 끝난 뒤 종료)"""
+        with self._condition:
+            self._stopped = True
+            self._wanted = None
+            self._pending = []
+            self._condition.notify()
+
+    def discard(self, pdf_path):
+        """목록에서 삭제된 PDF를 캐시에서 제거"""
+        with self._condition:
+            self._cache.pop(pdf_path, None)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                pdf_path = self._pending.pop(0)
+                if pdf_path in self._cache:
+                    continue
+
+            result, error = None, None
+            try:
+                result = self.render(pdf_path)
+            except Exception as e:
+                error = e
+
+            with self._condition:
+                if result is not None:
+                    self._cache[pdf_path] = result
+                    while len(self._cache) > self.max_items:
+                        self._cache.popitem(last=False)
+                deliver = pdf_path == self._wanted
+                if deliver:
+                    self._wanted = None
+            if deliver:
+                self.results.put((pdf_path, result, error))
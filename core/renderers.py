@@ -0,0 +1,310 @@
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from PIL import Image
+from . import instrumentation
+from .page_buffer import band_rows, ppm_header
+from .config import POPPLER_PATH, RENDER_BACKEND, RENDER_OPEN_DOCUMENTS
+
+try:
+    import pypdfium2
+    import pypdfium2.raw as pdfium_c
+except ImportError:
+    pypdfium2 = None
+
+RENDERER_PDF2IMAGE = 'pdf2image'
+RENDERER_PDFTOPPM = 'pdftoppm'
+RENDERER_PDFIUM = 'pdfium'
+
+# pdftoppm 출력 파일 이름의 페이지 번호 (prefix-07.ppm)
+_PAGE_FILE = re.compile(r'-(\d+)\.ppm$')
+
+
+class Renderer(ABC):
+    """PDF 페이지 렌더러의 공통 부분: 호출 수, 페이지 수, 렌더링 시간 통계
+
+    하위 클래스는 _render(pdf_path, dpi, first_page, last_page)만 구현합니다.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.calls = 0
+        self.pages = 0
+        self.seconds = 0.0
+        self.max_page_seconds = 0.0
+        self._stats_lock = threading.Lock()
+
+    def render(self, pdf_path, dpi, first_page, last_page):
+        """페이지 범위를 렌더링 (페이지 번호는 0부터, last_page 포함)
+
+        Returns:
+            렌더링된 페이지 이미지 리스트 (범위를 벗어나면 빈 리스트)
+        """
+        started = time.perf_counter()
+        images = self._render(pdf_path, dpi, first_page, last_page)
+        self._record(len(images), time.perf_counter() - started)
+        return images
+
+    def render_to_file(self, pdf_path, dpi, page, path, band_bytes):
+        """페이지 한 장을 8비트 RGB PPM 파일로 렌더링 (큰 페이지를 메모리 매핑으로 열기 위함)
+
+        Args:
+            page: 페이지 번호 (0부터 시작)
+            path: 출력 .ppm 파일 경로
+            band_bytes: 렌더러가 띠 단위로 렌더링할 수 있으면 띠 하나의 최대 크기 (바이트)
+
+        Returns:
+            (width, height) 렌더링한 페이지의 픽셀 크기
+        """
+        started = time.perf_counter()
+        size = self._render_to_file(pdf_path, dpi, page, path, band_bytes)
+        self._record(1, time.perf_counter() - started)
+        return size
+
+    def _record(self, pages, elapsed):
+        with self._stats_lock:
+            self.calls += 1
+            self.pages += pages
+            self.seconds += elapsed
+            if pages:
+                self.max_page_seconds = max(self.max_page_seconds, elapsed / pages)
+        # 일괄 저장 보고서용: 렌더링한 페이지 수와 걸린 시간 (페이지당 지연 = render_ms / render_pages)
+        instrumentation.count('render_pages', pages)
+        instrumentation.count('render_ms', elapsed * 1000)
+
+    @abstractmethod
+    def _render(self, pdf_path, dpi, first_page, last_page):
+        """페이지 범위(0부터, last_page 포함)를 렌더링해 이미지 리스트를 반환"""
+
+    def _render_to_file(self, pdf_path, dpi, page, path, band_bytes):
+        # 기본 구현: 페이지 전체를 메모리에 렌더링한 뒤 파일로 기록
+        images = self._render(pdf_path, dpi, page, page)
+        if not images:
+            raise IndexError('페이지 번호가 범위를 벗어났습니다')
+        image = images[0] if images[0].mode == 'RGB' else images[0].convert('RGB')
+        image.save(path, 'PPM')
+        return image.size
+
+    def close(self):
+        """열어 둔 자원 정리"""
+
+    def stats(self):
+        """렌더링 통계 (페이지당 평균/최대 지연은 밀리초)"""
+        with self._stats_lock:
+            return {
+                'backend': self.name,
+                'calls': self.calls,
+                'pages': self.pages,
+                'seconds': self.seconds,
+                'ms_per_page': self.seconds / self.pages * 1000 if self.pages else None,
+                'max_ms_per_page': self.max_page_seconds * 1000 if self.pages else None,
+            }
+
+
+class Pdf2ImageRenderer(Renderer):
+    """pdf2image.convert_from_path로 렌더링 (호출마다 pdfinfo, pdftoppm 실행, 표준 출력으로 이미지 전달)"""
+
+    name = RENDERER_PDF2IMAGE
+
+    def _render(self, pdf_path, dpi, first_page, last_page):
+        from pdf2image import convert_from_path
+        # pdf2image는 1부터 시작하는 페이지 번호를 사용
+        return convert_from_path(pdf_path, poppler_path=POPPLER_PATH, dpi=dpi,
+                                 first_page=first_page + 1, last_page=last_page + 1)
+
+
+def find_pdftoppm():
+    """POPPLER_PATH 또는 PATH에서 pdftoppm 실행 파일 경로를 찾음 (없으면 None)"""
+    name = 'pdftoppm.exe' if os.name == 'nt' else 'pdftoppm'
+    path = os.path.join(POPPLER_PATH, name)
+    if os.path.isfile(path):
+        return path
+    return shutil.which('pdftoppm')
+
+
+class PdftoppmRenderer(Renderer):
+    """pdftoppm을 직접 실행해 임시 폴더에 PPM 파일로 렌더링한 뒤 읽음
+
+    pypdfium2가 없을 때 쓰는 대체 렌더러로, 호출마다 pdftoppm 프로세스를 실행합니다.
+    pdf2image와 달리 페이지 수 확인용 pdfinfo를 따로 실행하지 않고, 이미지를 파이프로
+    받아 나누지 않고 파일에서 바로 디코딩합니다.
+    """
+
+    name = RENDERER_PDFTOPPM
+
+    def __init__(self, executable=None):
+        super().__init__()
+        self.executable = executable or find_pdftoppm()
+        if self.executable is None:
+            raise RuntimeError('pdftoppm을 찾을 수 없습니다. core/config.py의 POPPLER_PATH를 확인하세요')
+
+    def _run(self, pdf_path, dpi, first_page, last_page, prefix, single_file=False):
+        """pdftoppm 실행 (페이지 번호는 0부터, 실패하면 오류 메시지, 성공하면 None을 반환)"""
+        command = [self.executable, '-r', str(dpi), '-f', str(first_page + 1), '-l', str(last_page + 1)]
+        if single_file:
+            command.append('-singlefile')
+        command += [pdf_path, prefix]
+        # 에디터에서 실행할 때 Windows 콘솔 창이 뜨지 않도록 함
+        result = subprocess.run(command, capture_output=True,
+                                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0))
+        if result.returncode != 0:
+            return result.stderr.decode(errors='replace').strip()
+        return None
+
+    def _render(self, pdf_path, dpi, first_page, last_page):
+        with tempfile.TemporaryDirectory(prefix='pdf-render-') as temp_dir:
+            error = self._run(pdf_path, dpi, first_page, last_page, os.path.join(temp_dir, 'page'))
+            files = []
+            for name in os.listdir(temp_dir):
+                match = _PAGE_FILE.search(name)
+                if match:
+                    files.append((int(match.group(1)), os.path.join(temp_dir, name)))
+            if error is not None and not files:
+                if 'Wrong page range' in error:
+                    return []
+                raise RuntimeError(f'PDF 렌더링 실패: {error}')
+
+            images = []
+            for _, path in sorted(files):
+                # 파일 객체로 열어 읽은 뒤 바로 닫음 (임시 폴더를 지울 수 있도록 mmap을 쓰지 않음)
+                with open(path, 'rb') as file:
+                    image = Image.open(file)
+                    image.load()
+                images.append(image)
+            return images
+
+    def _render_to_file(self, pdf_path, dpi, page, path, band_bytes):
+        # -singlefile이면 '<prefix>.ppm' 하나만 기록하므로 출력 파일에 바로 렌더링
+        prefix = os.path.splitext(path)[0]
+        error = self._run(pdf_path, dpi, page, page, prefix, single_file=True)
+        if prefix + '.ppm' != path and os.path.exists(prefix + '.ppm'):
+            os.replace(prefix + '.ppm', path)
+        if not os.path.exists(path):
+            raise RuntimeError(f'PDF 렌더링 실패: {error}')
+        with Image.open(path) as image:
+            return image.size
+
+
+class PdfiumRenderer(Renderer):
+    """pypdfium2로 프로세스 안에서 렌더링
+
+    열어 둔 문서를 RENDER_OPEN_DOCUMENTS개까지 재사용하므로 같은 PDF를 여러 번 렌더링해도
+    파일을 다시 해석하지 않습니다. pdfium은 스레드 안전하지 않아 한 번에 한 스레드만 렌더링합니다.
+    """
+
+    name = RENDERER_PDFIUM
+
+    def __init__(self, max_documents=RENDER_OPEN_DOCUMENTS):
+        super().__init__()
+        if pypdfium2 is None:
+            raise RuntimeError('pypdfium2가 설치되어 있지 않습니다')
+        self.max_documents = max(1, max_documents)
+        self._documents = OrderedDict()     # (경로, 수정 시각, 크기) -> PdfDocument
+        self._lock = threading.Lock()
+
+    def _document(self, pdf_path):
+        stat = os.stat(pdf_path)
+        key = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+            return document
+        document = self._documents[key] = pypdfium2.PdfDocument(pdf_path)
+        while len(self._documents) > self.max_documents:
+            _, old = self._documents.popitem(last=False)
+            old.close()
+        return document
+
+    def _render(self, pdf_path, dpi, first_page, last_page):
+        with self._lock:
+            document = self._document(pdf_path)
+            last_page = min(last_page, len(document) - 1)
+            images = []
+            for index in range(first_page, last_page + 1):
+                page = document[index]
+                try:
+                    images.append(page.render(scale=dpi / 72).to_pil())
+                finally:
+                    page.close()
+            return images
+
+    def _render_to_file(self, pdf_path, dpi, page, path, band_bytes):
+        # 페이지 전체 비트맵을 만들지 않고 band_bytes 크기의 띠로 나눠 렌더링하며 파일에 이어 씀
+        scale = dpi / 72
+        with self._lock:
+            document = self._document(pdf_path)
+            pdf_page = document[page]
+            try:
+                width = math.ceil(pdf_page.get_width() * scale)
+                height = math.ceil(pdf_page.get_height() * scale)
+                rows = band_rows(width, band_bytes)
+                flags = pdfium_c.FPDF_ANNOT | pdfium_c.FPDF_REVERSE_BYTE_ORDER
+                with open(path, 'wb') as file:
+                    file.write(ppm_header(width, height))
+                    for top in range(0, height, rows):
+                        band_height = min(rows, height - top)
+                        bitmap = pypdfium2.PdfBitmap.new_native(width, band_height, pdfium_c.FPDFBitmap_BGR,
+                                                                rev_byteorder=True)
+                        bitmap.fill_rect((255, 255, 255, 255), 0, 0, width, band_height)
+                        # 페이지 전체 크기로 배치하고 위로 top만큼 옮겨 이 띠에 해당하는 부분만 그림
+                        pdfium_c.FPDF_RenderPageBitmap(bitmap, pdf_page, 0, -top, width, height, 0, flags)
+                        file.write(bitmap.to_pil().tobytes())
+                        bitmap.close()
+            finally:
+                pdf_page.close()
+        return width, height
+
+    def close(self):
+        with self._lock:
+            for document in self._documents.values():
+                document.close()
+            self._documents.clear()
+
+
+def create_renderer(backend=RENDER_BACKEND):
+    """설정 이름으로 렌더러를 만듦
+
+    'auto'는 pypdfium2가 있으면 pdfium, pdftoppm을 찾으면 pdftoppm, 둘 다 없으면 pdf2image를 사용합니다.
+
+    Raises:
+        ValueError: 알 수 없는 이름인 경우
+        RuntimeError: 지정한 렌더러를 사용할 수 없는 경우
+    """
+    if backend == 'auto':
+        if pypdfium2 is not None:
+            return PdfiumRenderer()
+        if find_pdftoppm() is not None:
+            return PdftoppmRenderer()
+        return Pdf2ImageRenderer()
+    if backend == RENDERER_PDFIUM:
+        return PdfiumRenderer()
+    if backend == RENDERER_PDFTOPPM:
+        return PdftoppmRenderer()
+    if backend == RENDERER_PDF2IMAGE:
+        return Pdf2ImageRenderer()
+    raise ValueError(f'알 수 없는 렌더러입니다: {backend}')
+
+
+# 프로세스마다 하나씩 두고 계속 재사용하는 렌더러 (일괄 저장 작업자 프로세스는 각자 만듦)
+_renderer = None
+_renderer_pid = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer():
+    """현재 프로세스의 렌더러 (처음 호출할 때 RENDER_BACKEND 설정으로 만듦)"""
+    global _renderer, _renderer_pid
+    with _renderer_lock:
+        # fork로 만든 작업자 프로세스는 부모의 열린 문서와 잠금을 물려받지 않도록 새로 만듦
+        if _renderer is None or _renderer_pid != os.getpid():
+            _renderer = create_renderer()
+            _renderer_pid = os.getpid()
+        return _renderer
@@ -0,0 +1,64 @@
+from collections import defaultdict
+from .config import SPATIAL_INDEX_CELL_SIZE
+
+
+class GridIndex:
+    """사각형 영역을 균일한 격자 칸에 등록해 점 조회를 빠르게 하는 공간 색인
+
+    점 조회는 그 점이 속한 칸에 등록된 항목만 검사하므로, 항목 수가 늘어나도
+    항목이 고르게 퍼져 있다면 거의 일정한 시간이 걸립니다.
+    """
+
+    def __init__(self, cell_size=SPATIAL_INDEX_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)
+        self._bounds = {}
+
+    def _cell_range(self, bounds):
+        x0, y0, x1, y1 = bounds
+        size = self.cell_size
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                yield cx, cy
+
+    def insert(self, key, bounds):
+        """항목 등록 (이미 있으면 영역 갱신)
+
+        Args:
+            key: 항목 식별자
+            bounds: (x0, y0, x1, y1) 영역 (양 끝 포함)
+        """
+        if key in self._bounds:
+            self.remove(key)
+        self._bounds[key] = bounds
+        for cell in self._cell_range(bounds):
+            self._cells[cell].add(key)
+
+    update = insert
+
+    def remove(self, key):
+        """항목 제거"""
+        bounds = self._bounds.pop(key, None)
+        if bounds is None:
+            return
+        for cell in self._cell_range(bounds):
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._cells[cell]
+
+    def clear(self):
+        self._cells.clear()
+        self._bounds.clear()
+
+    def query_point(self, x, y):
+        """점 (x, y)를 포함하는 항목들의 식별자 목록"""
+        size = self.cell_size
+        keys = self._cells.get((int(x // size), int(y // size)), ())
+        result = []
+        for key in keys:
+            x0, y0, x1, y1 = self._bounds[key]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                result.append(key)
+        return result
@@ -0,0 +1,130 @@
+import hashlib
+import io
+import os
+import threading
+from PIL import Image
+
+
+class StampAsset:
+    """한 번 디코딩한 스탬프 이미지와 그로부터 만든 축소 단계(밉맵)
+
+    축소 단계는 알파를 곱한(premultiplied, 'RGBa') 버퍼로 보관하므로 크기를 바꿀 때
+    매번 RGBA -> RGBa 변환을 하지 않고, 투명한 가장자리에 어두운 테두리가 생기지 않습니다.
+    원본 크기 단계는 원본 RGBA 이미지를 그대로 쓰므로 따로 보관하지 않습니다.
+    """
+
+    def __init__(self, sha256, image):
+        self.sha256 = sha256
+        self.image = image          # 원본 RGBA 이미지
+        self.paths = set()          # 같은 내용을 가진 파일 경로들
+        self._levels = None         # 알파를 곱한 밉맵 단계 [1/2, 1/4, ...]
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def mip_levels(self):
+        """알파를 곱한 축소 단계 목록 (처음 필요할 때 한 번만 생성, 원본 크기 단계 제외)"""
+        with self._lock:
+            if self._levels is None:
+                levels = []
+                if min(self.image.size) > 64:
+                    levels.append(self.image.convert('RGBa').reduce(2))
+                    while min(levels[-1].size) > 64:
+                        levels.append(levels[-1].reduce(2))
+                self._levels = levels
+            return self._levels
+
+    def render(self, size, resample=Image.LANCZOS, fast=False):
+        """목표 크기의 RGBA 이미지를 생성
+
+        Args:
+            size: 목표 크기 (width, height)
+            resample: 리샘플 필터
+            fast: True이면 목표 크기 이상인 가장 작은 축소 단계에서 축소 (미리보기용),
+                False이면 원본에서 바로 축소 (출력용, 원본 픽셀 그대로의 품질)
+        """
+        width, height = size
+        source = None
+        if fast:
+            for level in self.mip_levels():
+                if level.width >= width and level.height >= height:
+                    source = level
+                else:
+                    break
+        if source is None:
+            return self.image.resize((width, height), resample)
+        return source.resize((width, height), resample).convert('RGBA')
+
+    def memory_bytes(self):
+        """원본과 축소 단계가 차지하는 메모리 (바이트)"""
+        total = self.image.width * self.image.height * 4
+        if self._levels is not None:
+            total += sum(level.width * level.height * 4 for level in self._levels)
+        return total
+
+
+class StampAssetRegistry:
+    """스탬프 이미지 파일을 내용 해시로 중복 제거해 한 번만 디코딩하는 저장소
+
+    미리보기 캔버스(화면 크기)와 저장(출력 크기)이 같은 StampAsset을 공유합니다.
+    """
+
+    def __init__(self):
+        self._by_hash = {}
+        self._by_file = {}          # (절대 경로, 크기, 수정 시각) -> 해시
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """경로의 스탬프 이미지를 반환 (같은 내용이면 이미 디코딩한 것을 재사용)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        file_key = (path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            sha256 = self._by_file.get(file_key)
+            if sha256 is not None:
+                return self._by_hash[sha256]
+
+        with open(path, 'rb') as file:
+            data = file.read()
+        sha256 = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            asset = self._by_hash.get(sha256)
+            if asset is None:
+                asset = StampAsset(sha256, Image.open(io.BytesIO(data)).convert('RGBA'))
+                self._by_hash[sha256] = asset
+            asset.paths.add(path)
+            self._by_file[file_key] = sha256
+        return asset
+
+    def discard_unused(self, used_hashes):
+        """사용하지 않는 스탬프를 메모리에서 제거"""
+        with self._lock:
+            for sha256 in list(self._by_hash):
+                if sha256 not in used_hashes:
+                    del self._by_hash[sha256]
+            self._by_file = {key: sha for key, sha in self._by_file.items() if sha in self._by_hash}
+
+    def memory_report(self):
+        """스탬프별 메모리 사용량
+
+        Returns:
+            [{ 'sha256', 'paths', 'size', 'bytes' }, ...]
+        """
+        with self._lock:
+            assets = list(self._by_hash.values())
+        return [
+            {
+                'sha256': asset.sha256,
+                'paths': sorted(asset.paths),
+                'size': asset.size,
+                'bytes': asset.memory_bytes()
+            }
+            for asset in assets
+        ]
+
+
+# 프로세스 전체에서 공유하는 기본 저장소
+stamp_registry = StampAssetRegistry()
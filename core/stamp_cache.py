@@ -0,0 +1,73 @@
+import os
+import threading
+from collections import OrderedDict
+from PIL import Image
+from .config import STAMP_CACHE_MAX_BYTES
+from .stamp_assets import stamp_registry
+
+
+class StampCache:
+    """디코딩하고 크기를 맞춘 스탬프 이미지를 보관하는 LRU 캐시
+
+    키는 (경로, 수정 시각, 목표 크기, 리샘플 필터)이므로 파일이 바뀌면 자동으로
+    새로 디코딩합니다. 반환된 이미지는 여러 호출에서 공유되므로 수정하면 안 됩니다.
+    """
+
+    def __init__(self, max_bytes=STAMP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path, size, resample=Image.LANCZOS):
+        """목표 크기의 RGBA 스탬프 이미지를 반환 (없으면 디코딩 후 저장)"""
+        key = (os.path.abspath(path), os.stat(path).st_mtime_ns, tuple(size), resample)
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        # 원본 디코딩은 저장소에서 한 번만 하고 여기서는 크기 조정 결과만 보관
+        img = stamp_registry.get(path).render(tuple(size), resample)
+        img_bytes = img.width * img.height * 4
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = img
+                self._bytes += img_bytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= old.width * old.height * 4
+        return img
+
+    def clear(self):
+        """캐시와 통계 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """캐시 적중/실패 횟수와 사용량을 반환"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+# 프로세스 전체(일괄 저장 작업자 포함)에서 공유하는 기본 캐시
+stamp_cache = StampCache()
+
+
+def get_stamp(path, size, resample=Image.LANCZOS):
+    """기본 캐시에서 목표 크기의 RGBA 스탬프 이미지를 가져옴"""
+    return stamp_cache.get(path, size, resample)
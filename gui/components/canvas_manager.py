@@ -5,49 +5,111 @@ class CanvasManager:
     def __init__(self, canvas):
         self.canvas = canvas
         self.resize_handle_size = 10
-    
+
+        # 캔버스에 그려진 항목 (전체 다시 그리기 없이 갱신하기 위해 보관)
+        self._bg_image = None       # 배경으로 표시 중인 PDF 이미지
+        self._items = []            # 삽입 이미지별 {'image', 'border', 'handle', 'tk'} 캔버스 항목 id
+        self._selected_idx = None
+
     def _redraw_canvas(self, pdf_image_tk, inserted_images, selected_image_idx):
-        """캔버스에 모든 요소 다시 그리기"""
+        """캔버스에 모든 요소 다시 그리기 (PDF나 이미지 목록이 바뀐 경우)"""
         self.canvas.delete('all')
-        
+        self._items = []
+
         # PDF 배경 이미지
+        self._bg_image = pdf_image_tk
         if pdf_image_tk:
             self.canvas.create_image(0, 0, anchor='nw', image=pdf_image_tk, tags='pdf_bg')
-        
+
         # 삽입된 이미지들
+        self._selected_idx = selected_image_idx
         for idx, img in enumerate(inserted_images):
             x, y = img['pos']
             w, h = img['size']
-            
-            self.canvas.create_image(x, y, anchor='nw', image=img['tk'], tags='inserted')
-            
+            selected = idx == selected_image_idx
+
+            image_item = self.canvas.create_image(x, y, anchor='nw', image=img['tk'], tags='inserted')
+
             # 선택된 이미지는 파란색, 아닌 것은 회색 테두리
-            border_color = '#4a86e8' if idx == selected_image_idx else '#aaaaaa'
-            border_width = 2 if idx == selected_image_idx else 1
-            
-            self.canvas.create_rectangle(
-                x, y, x+w, y+h, 
-                outline=border_color, 
+            border_color, border_width = self._border_style(selected)
+            border_item = self.canvas.create_rectangle(
+                x, y, x+w, y+h,
+                outline=border_color,
                 width=border_width
             )
-            
-            # 리사이즈 핸들 (선택된 이미지만)
-            if idx == selected_image_idx:
-                self.canvas.create_rectangle(
-                    x+w-self.resize_handle_size, y+h-self.resize_handle_size, 
-                    x+w, y+h, 
-                    fill=border_color
-                )
-    
+
+            # 리사이즈 핸들 (선택된 이미지만 표시)
+            handle_item = self.canvas.create_rectangle(
+                *self._handle_coords(x, y, w, h),
+                fill=border_color,
+                state='normal' if selected else 'hidden'
+            )
+
+            self._items.append({
+                'image': image_item,
+                'border': border_item,
+                'handle': handle_item,
+                'tk': img['tk']
+            })
+
+    def _border_style(self, selected):
+        return ('#4a86e8', 2) if selected else ('#aaaaaa', 1)
+
+    def _handle_coords(self, x, y, w, h):
+        return (
+            x+w-self.resize_handle_size, y+h-self.resize_handle_size,
+            x+w, y+h
+        )
+
+    def refresh(self, pdf_image_tk, inserted_images, selected_image_idx):
+        """바뀐 부분만 갱신하고, PDF나 이미지 목록이 바뀌었으면 전체 다시 그리기"""
+        if pdf_image_tk is not self._bg_image or len(inserted_images) != len(self._items):
+            self._redraw_canvas(pdf_image_tk, inserted_images, selected_image_idx)
+            return
+
+        for idx, img in enumerate(inserted_images):
+            if img['tk'] is not self._items[idx]['tk']:
+                self.update_image(idx, img)
+        self.update_selection(selected_image_idx)
+
+    def update_image(self, idx, img):
+        """이미지 하나의 위치/크기만 갱신 (드래그 중 호출)"""
+        if idx is None or idx >= len(self._items):
+            return
+        items = self._items[idx]
+        x, y = img['pos']
+        w, h = img['size']
+
+        self.canvas.coords(items['image'], x, y)
+        if img['tk'] is not items['tk']:
+            self.canvas.itemconfigure(items['image'], image=img['tk'])
+            items['tk'] = img['tk']
+        self.canvas.coords(items['border'], x, y, x+w, y+h)
+        self.canvas.coords(items['handle'], *self._handle_coords(x, y, w, h))
+
+    def update_selection(self, selected_image_idx):
+        """선택 표시(테두리 색/핸들)만 갱신"""
+        if selected_image_idx == self._selected_idx:
+            return
+        for idx in (self._selected_idx, selected_image_idx):
+            if idx is None or idx >= len(self._items):
+                continue
+            selected = idx == selected_image_idx
+            border_color, border_width = self._border_style(selected)
+            items = self._items[idx]
+            self.canvas.itemconfigure(items['border'], outline=border_color, width=border_width)
+            self.canvas.itemconfigure(items['handle'], fill=border_color, state='normal' if selected else 'hidden')
+        self._selected_idx = selected_image_idx
+
     def on_canvas_press(self, event, image_manager, pdf_image):
         """캔버스 클릭 이벤트 처리"""
         return image_manager.on_canvas_press(event, pdf_image)
-    
+
     def on_canvas_drag(self, event, image_manager):
         """캔버스 드래그 이벤트 처리"""
         inserted_images = image_manager.on_canvas_drag(event)
         return inserted_images
-    
+
     def on_canvas_release(self, event, image_manager):
         """캔버스 마우스 버튼 해제 이벤트 처리"""
-        return image_manager.on_canvas_release(event) 
\ No newline at end of file
+        return image_manager.on_canvas_release(event)
@@ -1,7 +1,13 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
+import itertools
 import os
+import time
 from PIL import Image, ImageTk
+from core import layout
+from core.config import RESIZE_PREVIEW_INTERVAL_MS
+from core.spatial_index import GridIndex
+from core.stamp_assets import stamp_registry
 
 class ImageManager:
     def __init__(self, parent, img_listbox, canvas):
@@ -10,14 +16,24 @@ class ImageManager:
         self.canvas = canvas
         
         # 삽입된 이미지 정보
-        self.inserted_images = []   # [{'path', 'pos', 'size', 'img', 'tk'}]
+        self.inserted_images = []   # [{'uid', 'path', 'pos', 'size', 'asset', 'tk'}]
         self.selected_image_idx = None
         
+        # 클릭 판정용 공간 색인 (uid -> 캔버스 영역)과 uid별 목록 순서
+        self.spatial_index = GridIndex()
+        self._uid_order = {}
+        self._next_uid = itertools.count()
+        
         # 드래그 & 리사이징 상태 변수
         self.resizing = False
         self.moving = False
         self.resize_handle_size = 10
         self.moving_offset = (0, 0)
+        
+        # 리사이즈 미리보기 갱신 빈도 제한 상태
+        self._last_resize_preview = 0.0
+        self._resize_flush_id = None
+        self.on_image_updated = None    # 드래그 밖에서 이미지가 갱신되면 호출할 콜백 (인덱스 전달)
 
     def insert_image(self, pdf_list):
         """이미지 파일을 불러와 삽입"""
@@ -31,24 +47,101 @@ class ImageManager:
         if not path:
             return
             
-        img = Image.open(path).convert('RGBA')
-        size = [min(100, img.width), min(100, img.height)]
-        tk_img = ImageTk.PhotoImage(img.resize(size, Image.LANCZOS))
-        pos = [50, 50]
+        asset = stamp_registry.get(path)
+        size = [min(100, asset.size[0]), min(100, asset.size[1])]
+        self._add_image(path, [50, 50], size)
+        
+        return self.inserted_images, self.selected_image_idx
+    
+    def _add_image(self, path, pos, size):
+        """삽입 이미지 목록에 항목 추가 (같은 내용의 이미지는 한 번만 디코딩)"""
+        asset = stamp_registry.get(path)
+        tk_img = ImageTk.PhotoImage(asset.render(size))
         
-        self.inserted_images.append({
+        img = {
+            'uid': next(self._next_uid),
             'path': path, 
             'pos': pos, 
             'size': size, 
-            'img': img, 
+            'asset': asset, 
             'tk': tk_img
-        })
+        }
+        self.inserted_images.append(img)
+        self._uid_order[img['uid']] = len(self.inserted_images) - 1
+        self._index_image(img)
         
         self.img_listbox.insert(tk.END, os.path.basename(path))
         self.selected_image_idx = len(self.inserted_images) - 1
+    
+    def _index_image(self, img):
+        """이미지의 현재 영역을 공간 색인에 반영"""
+        x, y = img['pos']
+        w, h = img['size']
+        self.spatial_index.update(img['uid'], (x, y, x + w, y + h))
+    
+    def _rebuild_order(self):
+        """목록이 바뀐 뒤 uid -> 목록 인덱스 대응 다시 계산"""
+        self._uid_order = {img['uid']: idx for idx, img in enumerate(self.inserted_images)}
+    
+    def save_layout(self, display_size):
+        """현재 이미지 배치를 페이지 기준 상대 좌표로 레이아웃 파일에 저장"""
+        if not self.inserted_images or display_size is None:
+            messagebox.showerror('오류', '저장할 이미지 배치가 없습니다.')
+            return
+            
+        path = filedialog.asksaveasfilename(
+            defaultextension='.json',
+            filetypes=[('Layout Files', '*.json')]
+        )
+        if not path:
+            return
+            
+        layout.save_layout(path, layout.layout_from_preview(self.inserted_images, display_size))
+        return path
+    
+    def load_layout(self, pdf_list, display_size):
+        """레이아웃 파일을 불러와 현재 미리보기 크기에 맞게 이미지 배치"""
+        if not pdf_list or display_size is None:
+            messagebox.showerror('오류', 'PDF를 먼저 불러오세요.')
+            return
+            
+        path = filedialog.askopenfilename(filetypes=[('Layout Files', '*.json')])
+        if not path:
+            return
+            
+        try:
+            loaded = layout.load_layout(path)
+        except (ValueError, KeyError, OSError) as e:
+            messagebox.showerror('오류', f'레이아웃을 불러올 수 없습니다: {str(e)}')
+            return
+        
+        # 기존 배치를 레이아웃으로 교체
+        self.inserted_images = []
+        self.spatial_index.clear()
+        self._uid_order = {}
+        self.img_listbox.delete(0, tk.END)
+        self.selected_image_idx = None
+        
+        changed = []
+        for stamp in loaded['stamps']:
+            pos, size = layout.stamp_to_preview(stamp, display_size)
+            self._add_image(stamp['path'], pos, size)
+            if stamp['changed']:
+                changed.append(os.path.basename(stamp['path']))
+        
+        if changed:
+            messagebox.showwarning('확인', '레이아웃 저장 이후 내용이 바뀐 이미지가 있습니다:\n' + '\n'.join(changed))
         
         return self.inserted_images, self.selected_image_idx
     
+    def describe_image(self, idx):
+        """이미지 정보와 메모리 사용량 설명 문자열"""
+        img = self.inserted_images[idx]
+        asset = img['asset']
+        width, height = asset.size
+        memory_mb = asset.memory_bytes() / (1024 * 1024)
+        return f'{os.path.basename(img["path"])} ({width}x{height}, 메모리 {memory_mb:.1f}MB)'
+    
     def on_image_select(self, event):
         """이미지 목록에서 항목 선택 시 호출됨"""
         idxs = self.img_listbox.curselection()
@@ -79,8 +172,11 @@ class ImageManager:
         idx = self.selected_image_idx
         
         # 목록에서 삭제
-        self.inserted_images.pop(idx)
+        removed = self.inserted_images.pop(idx)
         self.img_listbox.delete(idx)
+        self.spatial_index.remove(removed['uid'])
+        self._rebuild_order()
+        stamp_registry.discard_unused({img['asset'].sha256 for img in self.inserted_images})
         
         # 현재 선택된 이미지 재조정
         if self.inserted_images:
@@ -92,36 +188,60 @@ class ImageManager:
         
         return self.inserted_images, self.selected_image_idx
     
+    def hit_test(self, x, y):
+        """좌표에 있는 이미지와 판정 종류를 반환
+        
+        Returns:
+            (인덱스, 'resize' | 'move'), 해당 이미지가 없으면 (None, None)
+        """
+        # 공간 색인으로 후보만 찾고, 위에 그려진(목록 뒤쪽) 것을 우선
+        candidates = [self._uid_order[uid] for uid in self.spatial_index.query_point(x, y)]
+        if not candidates:
+            return None, None
+        idx = max(candidates)
+        img = self.inserted_images[idx]
+        img_x, img_y = img['pos']
+        w, h = img['size']
+        
+        # 리사이즈 핸들
+        if (img_x + w - self.resize_handle_size <= x <= img_x + w and
+            img_y + h - self.resize_handle_size <= y <= img_y + h):
+            return idx, 'resize'
+        return idx, 'move'
+    
     def on_canvas_press(self, event, pdf_image):
         """캔버스 클릭 이벤트 처리"""
         if pdf_image is None:
             return
             
-        # 삽입 이미지 역순(위에 그려진 것 우선)으로 클릭 판정
-        for idx in reversed(range(len(self.inserted_images))):
-            img = self.inserted_images[idx]
-            x, y = img['pos']
-            w, h = img['size']
+        idx, action = self.hit_test(event.x, event.y)
+        
+        # 리사이즈 핸들 클릭
+        if action == 'resize':
+            self.selected_image_idx = idx
+            self.resizing = True
+            return self.selected_image_idx, self.resizing, self.moving
             
-            # 리사이즈 핸들 클릭
-            if (x + w - self.resize_handle_size <= event.x <= x + w and
-                y + h - self.resize_handle_size <= event.y <= y + h):
-                self.selected_image_idx = idx
-                self.resizing = True
-                return self.selected_image_idx, self.resizing, self.moving
-                
-            # 이미지 내부 클릭(이동)
-            elif x <= event.x <= x + w and y <= event.y <= y + h:
-                self.selected_image_idx = idx
-                self.moving = True
-                self.moving_offset = (event.x - x, event.y - y)
-                return self.selected_image_idx, self.resizing, self.moving, self.moving_offset
+        # 이미지 내부 클릭(이동)
+        elif action == 'move':
+            img = self.inserted_images[idx]
+            self.selected_image_idx = idx
+            self.moving = True
+            self.moving_offset = (event.x - img['pos'][0], event.y - img['pos'][1])
+            return self.selected_image_idx, self.resizing, self.moving, self.moving_offset
                 
         self.selected_image_idx = None
         self.resizing = False
         self.moving = False
         return self.selected_image_idx, self.resizing, self.moving
     
+    def on_canvas_motion(self, event):
+        """마우스 위치에 따라 커서 모양 변경 (드래그 중이 아닐 때)"""
+        _, action = self.hit_test(event.x, event.y)
+        cursor = {'resize': 'bottom_right_corner', 'move': 'fleur'}.get(action, '')
+        if self.canvas.cget('cursor') != cursor:
+            self.canvas.config(cursor=cursor)
+    
     def on_canvas_drag(self, event):
         """캔버스 드래그 이벤트 처리"""
         if self.selected_image_idx is None:
@@ -133,7 +253,13 @@ class ImageManager:
             new_w = max(20, event.x - img['pos'][0])
             new_h = max(20, event.y - img['pos'][1])
             img['size'] = [new_w, new_h]
-            img['tk'] = ImageTk.PhotoImage(img['img'].resize(img['size'], Image.LANCZOS))
+            
+            # 빠른 미리보기는 일정 간격으로만 만들고, 나머지는 마지막 크기로 한 번에 반영
+            now = time.monotonic()
+            if now - self._last_resize_preview >= RESIZE_PREVIEW_INTERVAL_MS / 1000:
+                self._update_resize_preview(img)
+            elif self._resize_flush_id is None:
+                self._resize_flush_id = self.parent.after(RESIZE_PREVIEW_INTERVAL_MS, self._flush_resize_preview)
             
         elif self.moving:
             offset_x, offset_y = getattr(self, 'moving_offset', (0, 0))
@@ -141,11 +267,38 @@ class ImageManager:
             new_y = event.y - offset_y
             img['pos'][0] = new_x
             img['pos'][1] = new_y
-            
+        
+        self._index_image(img)
         return self.inserted_images
     
     def on_canvas_release(self, event):
         """캔버스 마우스 버튼 해제 이벤트 처리"""
+        if self._resize_flush_id is not None:
+            self.parent.after_cancel(self._resize_flush_id)
+            self._resize_flush_id = None
+        
+        # 크기 조절이 끝나면 원본에서 고품질(LANCZOS)로 한 번만 다시 만듦
+        if self.resizing and self.selected_image_idx is not None:
+            img = self.inserted_images[self.selected_image_idx]
+            img['tk'] = ImageTk.PhotoImage(img['asset'].render(img['size']))
+            if self.on_image_updated:
+                self.on_image_updated(self.selected_image_idx)
+        
         self.resizing = False
         self.moving = False
-        return self.resizing, self.moving 
\ No newline at end of file
+        return self.resizing, self.moving
+    
+    def _update_resize_preview(self, img):
+        """리사이즈 중 빠른 미리보기: 목표 크기 이상인 가장 작은 밉맵 단계에서 BILINEAR로 축소"""
+        img['tk'] = ImageTk.PhotoImage(img['asset'].render(img['size'], Image.BILINEAR, fast=True))
+        self._last_resize_preview = time.monotonic()
+    
+    def _flush_resize_preview(self):
+        """마지막 드래그 위치의 크기로 미리보기 반영"""
+        self._resize_flush_id = None
+        if not self.resizing or self.selected_image_idx is None:
+            return
+        img = self.inserted_images[self.selected_image_idx]
+        self._update_resize_preview(img)
+        if self.on_image_updated:
+            self.on_image_updated(self.selected_image_idx)
@@ -2,12 +2,16 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 from PIL import Image, ImageTk
-from core import pdf_image_utils
+import queue
+from core.config import PREVIEW_POLL_INTERVAL_MS
+from core.pdf_metadata import PDFMetadataIndex
+from core.preview_cache import PreviewCache
+from core.preview_prefetch import PreviewPrefetcher
 
 class PDFManager:
-    def __init__(self, parent, pdf_listbox, canvas, status_label):
+    def __init__(self, parent, pdf_tree, canvas, status_label):
         self.parent = parent
-        self.pdf_listbox = pdf_listbox
+        self.pdf_tree = pdf_tree
         self.canvas = canvas
         self.status_label = status_label
         
@@ -17,77 +21,149 @@ class PDFManager:
         self.pdf_image = None       # 현재 PDF 이미지
         self.pdf_image_tk = None    # 현재 PDF 이미지의 Tkinter 버전
         self.pdf_original = None    # 원본 크기의 PDF 이미지
+        self.preview_cache = PreviewCache()  # 렌더링한 미리보기의 디스크 캐시
+        self.metadata_index = PDFMetadataIndex()  # 페이지 수/크기 등 메타데이터 색인
+        self.on_pdf_loaded = None   # 미리보기가 준비되면 호출할 콜백
+        
+        # 디스플레이 해상도의 85%로 제한
+        self.max_preview_size = (
+            int(self.parent.winfo_screenwidth() * 0.85),
+            int(self.parent.winfo_screenheight() * 0.85)
+        )
+        
+        # 백그라운드 미리보기 렌더링 (선택된 PDF와 앞뒤 PDF)
+        self.prefetcher = PreviewPrefetcher(self._render_preview)
+        self._waiting_path = None
+        self._polling_metadata = False
 
     def load_pdfs(self):
-        """PDF 파일들을 불러옵니다 (복수 선택 가능)"""
+        """PDF 파일들을 불러옵니다 (복수 선택 가능)
+        
+        목록은 바로 채우고 페이지 수/크기는 백그라운드에서 읽어 채워 넣습니다.
+        """
         files = filedialog.askopenfilenames(filetypes=[('PDF Files', '*.pdf')])
         if not files:
             return
             
         # 목록 초기화 및 추가
-        self.pdf_list = list(files)
-        self.pdf_listbox.delete(0, tk.END)
+        self.pdf_list = list(dict.fromkeys(files))
+        self.pdf_tree.delete(*self.pdf_tree.get_children())
         
         for pdf in self.pdf_list:
-            self.pdf_listbox.insert(tk.END, os.path.basename(pdf))
+            metadata = self.metadata_index.get(pdf)
+            values = self._format_row(metadata) if metadata else ('…', '', '')
+            self.pdf_tree.insert('', tk.END, iid=pdf, text=os.path.basename(pdf), values=values)
             
         self.status_label.config(text=f'PDF {len(self.pdf_list)}개 불러옴')
         
+        # 메타데이터 색인을 백그라운드에서 채움
+        self.metadata_index.load(self.pdf_list)
+        if not self._polling_metadata:
+            self._polling_metadata = True
+            self.parent.after(PREVIEW_POLL_INTERVAL_MS, self._poll_metadata)
+        
         # 첫 번째 PDF 자동 선택
         if self.pdf_list:
             self.current_pdf_idx = 0
+            self.pdf_tree.selection_set(self.pdf_list[0])
             self._load_current_pdf()
             
         return self.pdf_list, self.pdf_image, self.pdf_image_tk
     
+    def _format_row(self, metadata):
+        """메타데이터를 목록의 (페이지, 크기, 파일 크기) 열 값으로 변환"""
+        if metadata.get('damaged'):
+            pages = '손상'
+        elif metadata.get('page_count') is None:
+            pages = '암호'
+        else:
+            pages = str(metadata['page_count'])
+            if metadata.get('encrypted'):
+                pages += ' (암호)'
+        
+        page_size = ''
+        if metadata.get('page_sizes'):
+            width, height = metadata['page_sizes'][0]
+            page_size = f'{width * 25.4 / 72:.0f}×{height * 25.4 / 72:.0f}mm'
+            if len(set(metadata['page_sizes'])) > 1:
+                page_size += '+'  # 페이지마다 크기가 다름
+        
+        file_size = metadata.get('file_size')
+        if file_size is None:
+            file_size = ''
+        elif file_size >= 1024 * 1024:
+            file_size = f'{file_size / (1024 * 1024):.1f}MB'
+        else:
+            file_size = f'{file_size / 1024:.0f}KB'
+        
+        return pages, page_size, file_size
+    
+    def _poll_metadata(self):
+        """백그라운드에서 읽은 메타데이터로 목록 행을 갱신"""
+        while True:
+            try:
+                metadata = self.metadata_index.updates.get_nowait()
+            except queue.Empty:
+                break
+            if self.pdf_tree.exists(metadata['path']):
+                self.pdf_tree.item(metadata['path'], values=self._format_row(metadata))
+        self.parent.after(PREVIEW_POLL_INTERVAL_MS * 10, self._poll_metadata)
+    
     def on_pdf_select(self, event):
         """PDF 목록에서 항목 선택 시 호출됨"""
-        idxs = self.pdf_listbox.curselection()
-        if not idxs:
+        selected = self.pdf_tree.selection()
+        if not selected:
             return
             
-        self.current_pdf_idx = idxs[0]
+        idx = self.pdf_tree.index(selected[0])
+        if idx == self.current_pdf_idx and (self.pdf_image is not None or self._waiting_path is not None):
+            # 코드에서 선택을 바꿔 발생한 이벤트 등 이미 표시 중인 PDF
+            return self.pdf_image, self.pdf_image_tk
+            
+        self.current_pdf_idx = idx
         self._load_current_pdf()
         
         return self.pdf_image, self.pdf_image_tk
     
     def show_pdf_context_menu(self, event, pdf_context_menu):
-        """PDF 리스트박스에서 우클릭 시 컨텍스트 메뉴 표시"""
+        """PDF 목록에서 우클릭 시 컨텍스트 메뉴 표시"""
         try:
             # 클릭된 위치의 항목 선택
-            clicked_index = self.pdf_listbox.nearest(event.y)
-            if clicked_index >= 0:  # 유효한 인덱스인 경우
-                self.pdf_listbox.selection_clear(0, tk.END)
-                self.pdf_listbox.selection_set(clicked_index)
-                self.pdf_listbox.activate(clicked_index)
+            clicked_item = self.pdf_tree.identify_row(event.y)
+            if clicked_item:  # 유효한 항목인 경우
+                self.pdf_tree.selection_set(clicked_item)
+                self.pdf_tree.focus(clicked_item)
                 pdf_context_menu.tk_popup(event.x_root, event.y_root)
         finally:
             pdf_context_menu.grab_release()
     
     def delete_pdf(self):
         """선택된 PDF 항목 삭제"""
-        selected = self.pdf_listbox.curselection()
+        selected = self.pdf_tree.selection()
         if not selected:
             return
             
-        idx = selected[0]
+        idx = self.pdf_tree.index(selected[0])
         
         # 목록에서 삭제
+        self.prefetcher.discard(self.pdf_list[idx])
         self.pdf_list.pop(idx)
-        self.pdf_listbox.delete(idx)
+        self.pdf_tree.delete(selected[0])
         
         # 현재 선택된 PDF 재조정
         if self.pdf_list:
             if idx == self.current_pdf_idx:  # 삭제된 항목이 현재 선택된 항목이었다면
                 # 가능하면 같은 인덱스, 아니면 마지막 항목 선택
                 self.current_pdf_idx = min(idx, len(self.pdf_list) - 1)
-                self.pdf_listbox.selection_set(self.current_pdf_idx)
+                self.pdf_tree.selection_set(self.pdf_list[self.current_pdf_idx])
                 self._load_current_pdf()
             elif idx < self.current_pdf_idx:  # 삭제된 항목이 현재 선택된 항목보다 앞에 있었다면
                 self.current_pdf_idx -= 1  # 인덱스 조정
         else:
             # PDF가 더 이상 없으면 캔버스 초기화
             self.current_pdf_idx = None
+            self._waiting_path = None
+            self.prefetcher.cancel()
             self.pdf_image = None
             self.pdf_image_tk = None
             self.canvas.delete('all')
@@ -95,35 +171,80 @@ class PDFManager:
             
         return self.pdf_image, self.pdf_image_tk, self.current_pdf_idx
     
-    def _load_current_pdf(self):
-        """현재 선택된 PDF를 로드하고 미리보기 표시"""
-        if self.current_pdf_idx is None or self.current_pdf_idx >= len(self.pdf_list):
-            return
-            
-        pdf_path = self.pdf_list[self.current_pdf_idx]
-        self.pdf_original = pdf_image_utils.pdf_to_image(pdf_path, dpi=100)
-        
-        # 디스플레이 해상도의 85%로 제한
-        screen_width = self.parent.winfo_screenwidth()
-        screen_height = self.parent.winfo_screenheight()
-        max_width = int(screen_width * 0.85)
-        max_height = int(screen_height * 0.85)
+    def close(self):
+        """앱 종료 시 백그라운드 미리보기 렌더링과 메타데이터 색인 중지"""
+        self._waiting_path = None
+        self.prefetcher.stop()
+        self.metadata_index.shutdown()
+    
+    def _render_preview(self, pdf_path):
+        """미리보기 렌더링 및 화면 크기 맞춤 (백그라운드 스레드에서 실행)"""
+        original = self.preview_cache.get_or_render(pdf_path, dpi=100)
         
         # 원본 이미지 크기
-        img_width, img_height = self.pdf_original.size
+        img_width, img_height = original.size
+        max_width, max_height = self.max_preview_size
         
         # 비율 유지하면서 크기 조정
         scale_ratio = min(max_width / img_width, max_height / img_height)
         if scale_ratio < 1:  # 이미지가 최대 크기보다 크면 축소
             new_width = int(img_width * scale_ratio)
             new_height = int(img_height * scale_ratio)
-            self.pdf_image = self.pdf_original.resize((new_width, new_height), Image.LANCZOS)
+            display = original.resize((new_width, new_height), Image.LANCZOS)
         else:
-            self.pdf_image = self.pdf_original.copy()
+            display = original.copy()
+        return original, display
+    
+    def _load_current_pdf(self):
+        """현재 선택된 PDF를 로드하고 미리보기 표시
         
+        미리 렌더링된 결과가 있으면 바로 표시하고, 없으면 백그라운드 렌더링이
+        끝난 뒤 _poll_preview에서 표시합니다.
+        """
+        if self.current_pdf_idx is None or self.current_pdf_idx >= len(self.pdf_list):
+            return
+            
+        pdf_path = self.pdf_list[self.current_pdf_idx]
+        cached = self.prefetcher.request(self.pdf_list, self.current_pdf_idx)
+        if cached is not None:
+            self._waiting_path = None
+            self._show_preview(pdf_path, *cached)
+        else:
+            self.status_label.config(text=f'PDF 불러오는 중: {os.path.basename(pdf_path)}')
+            if self._waiting_path is None:
+                self.parent.after(PREVIEW_POLL_INTERVAL_MS, self._poll_preview)
+            self._waiting_path = pdf_path
+        
+        return self.pdf_image, self.pdf_image_tk
+    
+    def _poll_preview(self):
+        """백그라운드 렌더링 결과를 확인해 현재 선택된 PDF면 표시"""
+        if self._waiting_path is None:
+            return
+            
+        while True:
+            try:
+                pdf_path, result, error = self.prefetcher.results.get_nowait()
+            except queue.Empty:
+                break
+            if pdf_path != self._waiting_path:
+                continue  # 이미 다른 PDF로 이동한 경우 무시
+            self._waiting_path = None
+            if error is not None:
+                self.status_label.config(text=f'PDF 불러오기 실패: {os.path.basename(pdf_path)} ({error})')
+            else:
+                self._show_preview(pdf_path, *result)
+                if self.on_pdf_loaded:
+                    self.on_pdf_loaded()
+            return
+        
+        self.parent.after(PREVIEW_POLL_INTERVAL_MS, self._poll_preview)
+    
+    def _show_preview(self, pdf_path, original, display):
+        """렌더링된 미리보기를 캔버스 크기에 반영"""
+        self.pdf_original = original
+        self.pdf_image = display
         self.pdf_image_tk = ImageTk.PhotoImage(self.pdf_image)
         
         self.canvas.config(width=self.pdf_image.width, height=self.pdf_image.height)
         self.status_label.config(text=f'PDF 로드됨: {os.path.basename(pdf_path)}')
-        
-        return self.pdf_image, self.pdf_image_tk 
\ No newline at end of file
@@ -2,7 +2,13 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import subprocess
-from core import pdf_image_utils
+from core import batch, instrumentation, layout, manifest
+from core.page_selection import parse_page_rule, select_pages
+from core.placement import PlacementPlanner
+from core.config import (
+    BATCH_POLL_INTERVAL_MS, BATCH_REPORT_NAME, DEFAULT_ENCODING_PROFILE, DEFAULT_PAGE_RULE, DEFAULT_SAVE_ENGINE,
+    ENCODING_PROFILES, SAVE_ENGINE_RASTER, SAVE_ENGINE_VECTOR
+)
 
 class SaveManager:
     def __init__(self, parent, status_label):
@@ -24,13 +30,26 @@ class SaveManager:
         if not save_options:
             return
             
-        all_pages = save_options.get('all_pages', False)
+        page_rule = save_options.get('pages', DEFAULT_PAGE_RULE)
+        engine = save_options.get('engine', DEFAULT_SAVE_ENGINE)
+        encoding = save_options.get('encoding', DEFAULT_ENCODING_PROFILE)
+        write_report = save_options.get('report', False)
+        skip_unchanged = save_options.get('skip_unchanged', True)
         
         # 저장 폴더 선택
         save_dir = filedialog.askdirectory(title='저장할 폴더 선택')
         if not save_dir:
             return
         
+        # 여러 폴더에서 불러온 같은 이름의 PDF는 하위 폴더 구조를 살려 따로 저장 (겹치면 저장하지 않음)
+        try:
+            save_paths = batch.output_paths_for(pdf_list, save_dir)
+            for save_path in save_paths:
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+        except (ValueError, OSError) as e:
+            messagebox.showerror('오류', f'출력 경로를 준비할 수 없습니다.\n{e}')
+            return
+        
         # root 객체 가져오기 (PDFEditorApp에서는 root 속성 사용)
         root = self.parent.root if hasattr(self.parent, 'root') else self.parent
         
@@ -40,7 +59,7 @@ class SaveManager:
         progress_dialog.transient(root)
         progress_dialog.grab_set()
         progress_dialog.resizable(False, False)
-        progress_dialog.geometry("400x150")
+        progress_dialog.geometry("400x175")
         
         # 대화상자 중앙 위치 설정
         progress_dialog.geometry("+%d+%d" % (
@@ -68,6 +87,14 @@ class SaveManager:
         )
         current_file_label.pack(pady=(0, 10))
         
+        # 처리 속도 / 남은 시간 레이블
+        rate_label = ttk.Label(
+            progress_frame, 
+            text='',
+            justify='center'
+        )
+        rate_label.pack(pady=(0, 10))
+        
         # 진행 바
         progress_bar = ttk.Progressbar(
             progress_frame, 
@@ -77,88 +104,146 @@ class SaveManager:
         )
         progress_bar.pack(fill='x', pady=(0, 10))
         
-        # 취소 버튼
+        # 현재 캔버스에 표시된 이미지 크기 얻기 (작업자 프로세스는 GUI에 접근할 수 없음)
+        app = self.parent if hasattr(self.parent, 'pdf_manager') else None
+        pdf_mgr = app.pdf_manager if app else None
+        display_size = pdf_mgr.pdf_image.size if pdf_mgr and pdf_mgr.pdf_image else None
+        
+        # 작업 목록 생성: 미리보기 좌표를 페이지 상대 단위로 바꿔 파일마다 페이지 크기에 맞춤
+        stamps = None
+        images = [
+            {'path': img['path'], 'pos': tuple(img['pos']), 'size': tuple(img['size'])}
+            for img in inserted_images
+        ]
+        if display_size:
+            stamps = layout.layout_from_preview(inserted_images, display_size)['stamps']
+        
+        # 페이지 형태(보이는 영역 + 회전)별 스탬프 변환은 한 번만 계산하고 파일마다 찾아 씀
+        planner = PlacementPlanner(stamps, 300) if stamps is not None else None
+        
+        jobs = []
+        for pdf_path, save_path in zip(pdf_list, save_paths):
+            # 페이지 크기/형태는 메타데이터 색인에서 가져와 PDF를 다시 읽지 않음
+            # (아직 색인되지 않은 파일은 작업자 프로세스에서 직접 읽음)
+            metadata = pdf_mgr.metadata_index.get(pdf_path) if pdf_mgr else None
+            page_size = metadata['page_sizes'][0] if metadata and metadata.get('page_sizes') else None
+            plan = None
+            if planner and metadata and metadata.get('page_sizes'):
+                plan = planner.plan(metadata, select_pages(page_rule, metadata['page_sizes']))
+            jobs.append({
+                'pdf_path': pdf_path,
+                'page_size': page_size,
+                'placement': plan,
+                'save_path': save_path,
+                'stamps': stamps,
+                'images': images,
+                'preview_dpi': 100,
+                'dpi': 300,
+                'pages': page_rule,
+                'engine': engine,
+                'encoding': encoding,
+                # 절약한 용량 측정(페이지를 한 번 더 인코딩)은 보고서를 남길 때만
+                'measure_savings': write_report
+            })
+        
+        # 이전 실행 기록(매니페스트)과 비교해 입력/배치/옵션/출력이 그대로인 PDF는 건너뜀
+        job_manifest = manifest.JobManifest(save_dir)
+        if skip_unchanged:
+            jobs, skipped = job_manifest.split(jobs)
+        else:
+            jobs, skipped = [dict(job, hash_input=True) for job in jobs], []
+        
+        if not jobs:
+            job_manifest.save(force=True)
+            progress_dialog.destroy()
+            self.status_label.config(text=f'PDF {len(skipped)}개 모두 변경 없음')
+            self._show_completion_dialog(save_dir, 0, len(pdf_list), len(skipped))
+            return
+        
+        executor = batch.BatchExecutor(jobs)
+        
+        # 취소 버튼: 대기 중인 작업을 실제로 취소 (실행 중인 작업의 결과는 poll()에서 계속 기록)
+        def on_cancel():
+            executor.cancel()
+            progress_dialog.destroy()
+        
         cancel_button = ttk.Button(
             progress_frame, 
             text='취소', 
-            command=progress_dialog.destroy
+            command=on_cancel
         )
         cancel_button.pack()
+        progress_dialog.protocol('WM_DELETE_WINDOW', on_cancel)
         
-        # 대화상자 업데이트 및 초기화
-        progress_dialog.update()
-        total_pdfs = len(pdf_list)
+        total_pdfs = len(jobs)
         progress_bar['maximum'] = total_pdfs
-        
-        # 각 PDF에 이미지 삽입 후 저장
-        success_count = 0
-        for index, pdf_path in enumerate(pdf_list):
-            base_name = os.path.basename(pdf_path)
-            save_path = os.path.join(save_dir, base_name.replace('.pdf', '_edited.pdf'))
-            
-            # 진행 상태 업데이트
-            progress_label.config(text=f'PDF 저장 중... ({index+1}/{total_pdfs})')
-            current_file_label.config(text=f'현재 파일: {base_name}')
-            progress_bar['value'] = index
-            progress_dialog.update()
-            
-            try:
-                # 300 dpi 이미지 로드 (출력용)
-                base_img = pdf_image_utils.pdf_to_image(pdf_path, dpi=300, page=0)
-                output_w, output_h = base_img.size
-                
-                # 100 dpi 원본 이미지 로드 (미리보기 전 크기)
-                orig_preview_img = pdf_image_utils.pdf_to_image(pdf_path, dpi=100, page=0)
-                orig_preview_w, orig_preview_h = orig_preview_img.size
-                
-                # 현재 캔버스에 표시된 이미지 크기 얻기
-                app = self.parent if hasattr(self.parent, 'pdf_manager') else None
-                pdf_mgr = app.pdf_manager if app else None
-                
-                if pdf_mgr and pdf_mgr.pdf_image:
-                    # 화면에 표시된 이미지 크기
-                    display_w, display_h = pdf_mgr.pdf_image.size
-                    
-                    # dpi 변환 비율과 화면 맞춤 비율을 모두 고려
-                    scale_x = output_w / display_w
-                    scale_y = output_h / display_h
+        progress_label.config(text=f'PDF 저장 중... (0/{total_pdfs})')
+        
+        executor.start()
+        progress = instrumentation.BatchProgress(total_pdfs)
+        state = {'finished': 0, 'success': 0, 'errors': []}
+        
+        def poll():
+            for kind, index, job, result in executor.poll():
+                state['finished'] += 1
+                progress.add(executor.reports.get(index))
+                base_name = os.path.basename(job['pdf_path'])
+                if kind == 'done':
+                    state['success'] += 1
+                    job_manifest.record(job, 'done', executor.reports.get(index))
                 else:
-                    # pdf_manager를 얻을 수 없는 경우 기존 방식으로 계산
-                    scale_x = output_w / orig_preview_w
-                    scale_y = output_h / orig_preview_h
-                
-                # 삽입 정보 생성
-                insert_infos = []
-                for img in inserted_images:
-                    x = int(img['pos'][0] * scale_x)
-                    y = int(img['pos'][1] * scale_y)
-                    w = int(img['size'][0] * scale_x)
-                    h = int(img['size'][1] * scale_y)
-                    insert_infos.append({
-                        'path': img['path'], 
-                        'pos': (x, y), 
-                        'size': (w, h)
-                    })
+                    state['errors'].append(f'{base_name}: {result}')
+                    job_manifest.record(job, 'error', executor.reports.get(index), result)
                 
-                pdf_image_utils.insert_image_to_pdf(pdf_path, insert_infos, save_path, dpi=300, all_pages=all_pages)
-                success_count += 1
-            except Exception as e:
-                messagebox.showerror('오류', f'{base_name} 저장 중 오류 발생: {str(e)}')
+                if progress_dialog.winfo_exists():
+                    progress_label.config(text=f'PDF 저장 중... ({state["finished"]}/{total_pdfs})')
+                    current_file_label.config(text=f'완료된 파일: {base_name}')
+                    progress_bar['value'] = state['finished']
             
-            # 사용자가 대화상자를 닫았는지 확인
-            if not progress_dialog.winfo_exists():
-                break
-        
-        # 진행 대화상자 닫기
-        if progress_dialog.winfo_exists():
-            progress_dialog.destroy()
-        
-        self.status_label.config(text=f'PDF {success_count}개 저장 완료')
-        
-        # 커스텀 메시지 박스 생성
-        self._show_completion_dialog(save_dir, success_count, total_pdfs)
+            # 남은 시간은 이벤트가 없어도 경과 시간에 맞춰 갱신
+            eta = progress.eta_seconds()
+            if progress_dialog.winfo_exists() and eta is not None:
+                rate_label.config(
+                    text=f'{progress.pages_per_second():.1f} 페이지/초, 남은 시간 약 {instrumentation.format_duration(eta)}'
+                )
+            
+            if executor.cancelled:
+                # 취소해도 이미 실행 중이던 작업은 끝까지 진행되므로 그 결과까지 매니페스트에 기록한 뒤 마침
+                waiting = state['finished'] < executor.expected_events()
+            else:
+                waiting = state['finished'] < total_pdfs
+            if waiting:
+                root.after(BATCH_POLL_INTERVAL_MS, poll)
+                return
+            
+            # 모든 작업 완료 또는 취소
+            executor.shutdown()
+            job_manifest.save(force=True)
+            if progress_dialog.winfo_exists():
+                progress_dialog.destroy()
+            
+            status = f'PDF {state["success"]}개 저장 완료'
+            if skipped:
+                status += f', {len(skipped)}개 변경 없음'
+            saved_bytes = progress.summary()['counters'].get('saved_bytes', 0)
+            if saved_bytes > 0:
+                status += f' (인코딩 프로필로 {saved_bytes / (1024 * 1024):.1f}MB 절약)'
+            self.status_label.config(text=status)
+            
+            if write_report:
+                try:
+                    instrumentation.write_report(os.path.join(save_dir, BATCH_REPORT_NAME), progress)
+                except OSError as e:
+                    state['errors'].append(f'{BATCH_REPORT_NAME}: {e}')
+            
+            if state['errors']:
+                messagebox.showerror('오류', '저장 중 오류 발생:\n' + '\n'.join(state['errors'][:20]))
+            
+            # 커스텀 메시지 박스 생성
+            self._show_completion_dialog(save_dir, state['success'], len(pdf_list), len(skipped))
         
-        return success_count
+        root.after(BATCH_POLL_INTERVAL_MS, poll)
+        return executor
 
     def _show_save_options_dialog(self):
         """저장 옵션을 선택하는 대화상자를 표시합니다."""
@@ -182,15 +267,72 @@ class SaveManager:
         main_frame = ttk.Frame(dialog, padding=15)
         main_frame.pack(fill='both', expand=True)
         
-        # 체크박스 변수
-        all_pages_var = tk.BooleanVar(value=False)
+        # 이미지를 삽입할 페이지 (나머지 페이지는 변환 없이 그대로 저장)
+        pages_frame = ttk.LabelFrame(main_frame, text='이미지를 삽입할 페이지')
+        pages_frame.pack(fill='x', padx=10, pady=10)
+        
+        pages_var = tk.StringVar(value=DEFAULT_PAGE_RULE)
+        ttk.Combobox(
+            pages_frame,
+            textvariable=pages_var,
+            values=['first', 'last', 'all', 'odd', 'even', 'first,last', 'size:A4'],
+            width=40
+        ).pack(anchor='w', padx=10, pady=(5, 0))
+        
+        ttk.Label(
+            pages_frame,
+            text='예: first, last, all, odd, even, 1-3,5, 7-, size:A4, odd&landscape',
+            foreground='#666666'
+        ).pack(anchor='w', padx=10, pady=(2, 5))
+        
+        # 저장 방식 선택
+        engine_var = tk.StringVar(value=DEFAULT_SAVE_ENGINE)
+        engine_frame = ttk.LabelFrame(main_frame, text='저장 방식')
+        engine_frame.pack(fill='x', padx=10, pady=(0, 10))
+        
+        ttk.Radiobutton(
+            engine_frame,
+            text='이미지로 변환 (페이지를 렌더링하여 합성)',
+            variable=engine_var,
+            value=SAVE_ENGINE_RASTER
+        ).pack(anchor='w', padx=10, pady=(5, 0))
+        
+        ttk.Radiobutton(
+            engine_frame,
+            text='원본 유지 (텍스트/벡터 보존, 이미지만 덧씌움)',
+            variable=engine_var,
+            value=SAVE_ENGINE_VECTOR
+        ).pack(anchor='w', padx=10, pady=(0, 5))
+        
+        # 이미지로 변환할 때의 인코딩 프로필 (용량/화질)
+        encoding_frame = ttk.LabelFrame(main_frame, text='이미지 인코딩 (이미지로 변환 시)')
+        encoding_frame.pack(fill='x', padx=10, pady=(0, 10))
+        
+        labels = {profile['label']: name for name, profile in ENCODING_PROFILES.items()}
+        encoding_var = tk.StringVar(value=ENCODING_PROFILES[DEFAULT_ENCODING_PROFILE]['label'])
+        ttk.Combobox(
+            encoding_frame,
+            textvariable=encoding_var,
+            values=list(labels),
+            state='readonly',
+            width=40
+        ).pack(anchor='w', padx=10, pady=5)
+        
+        # 이전에 저장한 최신 출력 건너뛰기
+        skip_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            main_frame,
+            text='변경되지 않은 PDF는 건너뛰기 (이전 저장 기록 사용)',
+            variable=skip_var
+        ).pack(anchor='w', padx=10, pady=(0, 5))
         
-        # 체크박스
+        # 작업 보고서 저장 여부
+        report_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(
             main_frame,
-            text='다중 페이지 PDF의 모든 페이지에 이미지 삽입',
-            variable=all_pages_var
-        ).pack(anchor='w', padx=10, pady=10)
+            text=f'단계별 처리 시간 보고서 저장 ({BATCH_REPORT_NAME})',
+            variable=report_var
+        ).pack(anchor='w', padx=10, pady=(0, 10))
         
         # 버튼 프레임
         btn_frame = ttk.Frame(main_frame)
@@ -205,7 +347,16 @@ class SaveManager:
         
         # 확인 버튼
         def on_ok():
-            options['all_pages'] = all_pages_var.get()
+            try:
+                parse_page_rule(pages_var.get())
+            except ValueError as e:
+                messagebox.showerror('오류', str(e), parent=dialog)
+                return
+            options['pages'] = pages_var.get().strip()
+            options['engine'] = engine_var.get()
+            options['encoding'] = labels[encoding_var.get()]
+            options['report'] = report_var.get()
+            options['skip_unchanged'] = skip_var.get()
             dialog.destroy()
             
         ttk.Button(
@@ -222,7 +373,7 @@ class SaveManager:
         
         return options if options else None
 
-    def _show_completion_dialog(self, save_dir, success_count, total_count):
+    def _show_completion_dialog(self, save_dir, success_count, total_count, skipped_count=0):
         """저장 완료 다이얼로그를 표시하고 폴더 열기 버튼을 제공합니다."""
         # root 객체 가져오기
         root = self.parent.root if hasattr(self.parent, 'root') else self.parent
@@ -246,7 +397,9 @@ class SaveManager:
         # 정보 레이블 - 왼쪽 정렬
         ttk.Label(
             main_frame, 
-            text=f'전체 {total_count}개 중 {success_count}개 저장 완료\n저장 폴더: {save_dir}',
+            text=f'전체 {total_count}개 중 {success_count}개 저장 완료'
+                 + (f', {skipped_count}개는 변경 없어 건너뜀' if skipped_count else '')
+                 + f'\n저장 폴더: {save_dir}',
             justify='left'
         ).pack(anchor='w', padx=10, pady=10)
         
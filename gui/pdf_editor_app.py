@@ -12,13 +12,22 @@ class PDFEditorApp:
         self._build_ui()
         
         # 컴포넌트 초기화
-        self.pdf_manager = PDFManager(self.root, self.pdf_listbox, self.canvas, self.status_label)
+        self.pdf_manager = PDFManager(self.root, self.pdf_tree, self.canvas, self.status_label)
         self.image_manager = ImageManager(self.root, self.img_listbox, self.canvas)
         self.canvas_manager = CanvasManager(self.canvas)
         self.save_manager = SaveManager(self, self.status_label)  # self를 전달하여 pdf_manager에 접근 가능하게 함
         
+        # 백그라운드에서 미리보기가 준비되면 캔버스 다시 그리기
+        self.pdf_manager.on_pdf_loaded = self._redraw_canvas
+        
+        # 크기 조절 후 고품질 이미지가 준비되면 해당 항목만 갱신
+        self.image_manager.on_image_updated = self._update_image_item
+        
         # 이벤트 바인딩
         self._bind_events()
+        
+        # 창을 닫으면 백그라운드 작업을 멈추고 종료 (남은 메타데이터 읽기를 기다리지 않음)
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
     
     def _build_ui(self):
         # 메인 프레임
@@ -31,6 +40,8 @@ class PDFEditorApp:
         
         ttk.Button(btn_frame, text='PDF 불러오기', command=self.load_pdfs).pack(side='left', padx=5)
         ttk.Button(btn_frame, text='이미지 불러오기', command=self.insert_image).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text='레이아웃 저장', command=self.save_layout).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text='레이아웃 불러오기', command=self.load_layout).pack(side='left', padx=5)
         ttk.Button(btn_frame, text='일괄 저장', command=self.batch_save).pack(side='left', padx=5)
         
         self.status_label = ttk.Label(btn_frame, text='PDF를 먼저 불러오세요')
@@ -44,7 +55,7 @@ class PDFEditorApp:
         left_frame = ttk.LabelFrame(content_frame, text='PDF 목록')
         left_frame.pack(side='left', fill='y', padx=(0, 10), pady=5)
         
-        # PDF 리스트박스와 스크롤바를 포함할 프레임
+        # PDF 목록과 스크롤바를 포함할 프레임
         pdf_list_frame = ttk.Frame(left_frame)
         pdf_list_frame.pack(fill='both', expand=True, padx=5, pady=5)
         
@@ -52,16 +63,29 @@ class PDFEditorApp:
         pdf_scrollbar = ttk.Scrollbar(pdf_list_frame)
         pdf_scrollbar.pack(side='right', fill='y')
         
-        # 리스트박스 생성 및 스크롤바 연결
-        self.pdf_listbox = tk.Listbox(pdf_list_frame, width=30, yscrollcommand=pdf_scrollbar.set)
-        self.pdf_listbox.pack(side='left', fill='both', expand=True)
+        # 파일명 + 페이지 수/크기 열을 가진 목록 생성 및 스크롤바 연결
+        self.pdf_tree = ttk.Treeview(
+            pdf_list_frame,
+            columns=('pages', 'page_size', 'file_size'),
+            selectmode='browse',
+            yscrollcommand=pdf_scrollbar.set
+        )
+        self.pdf_tree.heading('#0', text='파일명', anchor='w')
+        self.pdf_tree.heading('pages', text='페이지')
+        self.pdf_tree.heading('page_size', text='크기')
+        self.pdf_tree.heading('file_size', text='용량')
+        self.pdf_tree.column('#0', width=180, stretch=True)
+        self.pdf_tree.column('pages', width=55, anchor='e', stretch=False)
+        self.pdf_tree.column('page_size', width=90, anchor='center', stretch=False)
+        self.pdf_tree.column('file_size', width=65, anchor='e', stretch=False)
+        self.pdf_tree.pack(side='left', fill='both', expand=True)
         
         # PDF 컨텍스트 메뉴 생성
         self.pdf_context_menu = Menu(self.root, tearoff=0)
         self.pdf_context_menu.add_command(label="삭제", command=self.delete_pdf)
         
-        # 스크롤바에 리스트박스 연결
-        pdf_scrollbar.config(command=self.pdf_listbox.yview)
+        # 스크롤바에 목록 연결
+        pdf_scrollbar.config(command=self.pdf_tree.yview)
         
         # 중앙: 이미지 목록
         middle_frame = ttk.LabelFrame(content_frame, text='삽입된 이미지 목록')
@@ -98,9 +122,9 @@ class PDFEditorApp:
         self.canvas.pack(fill='both', expand=True)
     
     def _bind_events(self):
-        # PDF 리스트박스 이벤트
-        self.pdf_listbox.bind('<<ListboxSelect>>', self.on_pdf_select)
-        self.pdf_listbox.bind('<Button-3>', self.show_pdf_context_menu)
+        # PDF 목록 이벤트
+        self.pdf_tree.bind('<<TreeviewSelect>>', self.on_pdf_select)
+        self.pdf_tree.bind('<Button-3>', self.show_pdf_context_menu)
         
         # 이미지 리스트박스 이벤트
         self.img_listbox.bind('<<ListboxSelect>>', self.on_image_select)
@@ -110,6 +134,7 @@ class PDFEditorApp:
         self.canvas.bind('<ButtonPress-1>', self.on_canvas_press)
         self.canvas.bind('<B1-Motion>', self.on_canvas_drag)
         self.canvas.bind('<ButtonRelease-1>', self.on_canvas_release)
+        self.canvas.bind('<Motion>', self.image_manager.on_canvas_motion)
     
     # PDF 관련 함수들
     def load_pdfs(self):
@@ -132,8 +157,21 @@ class PDFEditorApp:
         inserted_images, selected_image_idx = self.image_manager.insert_image(self.pdf_manager.pdf_list)
         self._redraw_canvas()
     
+    def save_layout(self):
+        self.image_manager.save_layout(self._display_size())
+    
+    def load_layout(self):
+        self.image_manager.load_layout(self.pdf_manager.pdf_list, self._display_size())
+        self._redraw_canvas()
+    
+    def _display_size(self):
+        pdf_image = self.pdf_manager.pdf_image
+        return pdf_image.size if pdf_image else None
+    
     def on_image_select(self, event):
         selected_image_idx = self.image_manager.on_image_select(event)
+        if selected_image_idx is not None:
+            self.status_label.config(text=self.image_manager.describe_image(selected_image_idx))
         self._redraw_canvas()
     
     def show_image_context_menu(self, event):
@@ -151,13 +189,20 @@ class PDFEditorApp:
     
     def on_canvas_drag(self, event):
         inserted_images = self.canvas_manager.on_canvas_drag(event, self.image_manager)
-        self._redraw_canvas()
+        # 드래그 중에는 선택된 이미지의 캔버스 항목만 이동/갱신
+        idx = self.image_manager.selected_image_idx
+        if inserted_images and idx is not None:
+            self.canvas_manager.update_image(idx, inserted_images[idx])
     
     def on_canvas_release(self, event):
         self.canvas_manager.on_canvas_release(event, self.image_manager)
     
+    def _update_image_item(self, idx):
+        self.canvas_manager.update_image(idx, self.image_manager.inserted_images[idx])
+    
     def _redraw_canvas(self):
-        self.canvas_manager._redraw_canvas(
+        # 바뀐 항목만 갱신 (PDF나 이미지 목록이 바뀌면 전체 다시 그리기)
+        self.canvas_manager.refresh(
             self.pdf_manager.pdf_image_tk, 
             self.image_manager.inserted_images, 
             self.image_manager.selected_image_idx
@@ -170,6 +215,10 @@ class PDFEditorApp:
             self.image_manager.inserted_images
         )
     
+    def on_close(self):
+        self.pdf_manager.close()
+        self.root.destroy()
+    
     def run(self):
         """애플리케이션 실행"""
         self.root.mainloop() 
\ No newline at end of file
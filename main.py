@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 from gui import PDFEditorApp
 
@@ -7,4 +8,6 @@ def main():
     app.run()
 
 if __name__ == '__main__':
+    # 일괄 저장 작업자 프로세스 지원 (Windows 실행 파일 빌드 포함)
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
@@ -0,0 +1,37 @@
+import pytest
+import PyPDF2
+from PIL import Image
+from PyPDF2.generic import RectangleObject
+
+
+def write_pdf(path, pages):
+    """빈 페이지로 테스트용 PDF를 만듦
+
+    Args:
+        pages: [{ 'size': (width, height), 'rotation': 0, 'crop': (left, bottom, right, top) 또는 None }, ...]
+    """
+    writer = PyPDF2.PdfWriter()
+    for spec in pages:
+        page = PyPDF2.PageObject.create_blank_page(width=spec['size'][0], height=spec['size'][1])
+        if spec.get('crop'):
+            page.cropbox = RectangleObject(spec['crop'])
+        if spec.get('rotation'):
+            page.rotate(spec['rotation'])
+        writer.add_page(page)
+    with open(path, 'wb') as file:
+        writer.write(file)
+    return str(path)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    def make(pages, name='input.pdf'):
+        return write_pdf(tmp_path / name, pages)
+    return make
+
+
+@pytest.fixture
+def stamp_path(tmp_path):
+    path = tmp_path / 'stamp.png'
+    Image.new('RGBA', (40, 20), (255, 0, 0, 255)).save(path)
+    return str(path)
@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import pytest
+import cli
+from core import batch, pdf_overlay
+from core.batch import output_path_for
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('doc.pdf', 'doc_edited.pdf'),
+    ('SCAN.PDF', 'SCAN_edited.PDF'),
+    ('report.pdf.final.pdf', 'report.pdf.final_edited.pdf'),
+    ('notes.Pdf', 'notes_edited.Pdf'),
+])
+def test_output_path_for_names(tmp_path, name, expected):
+    output = output_path_for(str(tmp_path / 'in' / name), str(tmp_path / 'out'))
+    assert output == str(tmp_path / 'out' / expected)
+
+
+def test_output_path_for_never_returns_input(tmp_path):
+    pdf_path = str(tmp_path / 'X.PDF')
+    assert output_path_for(pdf_path, str(tmp_path)) != pdf_path
+
+
+def test_output_path_for_mirrors_subfolders(tmp_path):
+    root = tmp_path / 'in'
+    output = output_path_for(str(root / 'a' / 'b' / 'doc.pdf'), str(tmp_path / 'out'), str(root))
+    assert output == os.path.join(str(tmp_path / 'out'), 'a', 'b', 'doc_edited.pdf')
+
+
+def _spec(pdf_paths, output_dir):
+    return {'pdf_paths': pdf_paths, 'output_dir': output_dir, 'stamps': [], 'dpi': 72,
+            'pages': 'first', 'engine': 'vector', 'encoding': 'standard'}
+
+
+def test_build_jobs_keeps_same_names_in_different_folders(tmp_path):
+    pdf_paths = [str(tmp_path / 'in' / 'a' / 'doc.pdf'), str(tmp_path / 'in' / 'b' / 'doc.pdf')]
+    jobs = cli.build_jobs(_spec(pdf_paths, str(tmp_path / 'out')))
+    assert [job['save_path'] for job in jobs] == [
+        str(tmp_path / 'out' / 'a' / 'doc_edited.pdf'),
+        str(tmp_path / 'out' / 'b' / 'doc_edited.pdf'),
+    ]
+
+
+def test_build_jobs_single_folder_writes_to_output_root(tmp_path):
+    jobs = cli.build_jobs(_spec([str(tmp_path / 'in' / 'doc.pdf')], str(tmp_path / 'out')))
+    assert jobs[0]['save_path'] == str(tmp_path / 'out' / 'doc_edited.pdf')
+
+
+def test_load_job_spec_rejects_unknown_engine(tmp_path):
+    spec_path = tmp_path / 'job.json'
+    spec_path.write_text('{"inputs": [], "engine": "vectr"}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        cli.load_job_spec(str(spec_path))
+
+
+@pytest.mark.parametrize('stamp, message', [
+    ({'path': 'a.png', 'x': 0, 'width': 0.1, 'height': 0.1}, '스탬프 1: 필수 항목이 없습니다 (y)'),
+    ({'path': 'a.png', 'x': 'left', 'y': 0, 'width': 0.1, 'height': 0.1}, '스탬프 1: x 값이 숫자가 아닙니다'),
+])
+def test_load_job_spec_rejects_bad_stamp(tmp_path, stamp, message):
+    spec_path = tmp_path / 'job.json'
+    spec_path.write_text(json.dumps({'inputs': [], 'stamps': [stamp]}), encoding='utf-8')
+    with pytest.raises(ValueError, match=re.escape(message)):
+        cli.load_job_spec(str(spec_path))
+
+
+def test_build_jobs_rejects_colliding_outputs(tmp_path):
+    pdf_path = str(tmp_path / 'in' / 'doc.pdf')
+    with pytest.raises(ValueError):
+        cli.build_jobs(_spec([pdf_path, pdf_path], str(tmp_path / 'out')))
+
+
+def test_cancelled_batch_reports_every_started_job(make_pdf, stamp_path, tmp_path):
+    jobs = []
+    for i in range(6):
+        pdf_path = make_pdf([{'size': (200, 300)}] * 3, f'doc{i}.pdf')
+        jobs.append({'pdf_path': pdf_path, 'save_path': str(tmp_path / f'doc{i}_edited.pdf'),
+                     'stamps': [{'path': stamp_path, 'x': 0.1, 'y': 0.1, 'width': 0.2, 'height': 0.1}],
+                     'dpi': 72, 'pages': 'all', 'engine': 'vector'})
+    executor = batch.BatchExecutor(jobs, max_workers=1)
+    executor.start()
+    executor.cancel()
+    events = [executor.events.get(timeout=60) for _ in range(executor.expected_events())]
+    assert len({index for _, index, _, _ in events}) == len(events)
+    assert executor.events.empty()
+
+
+def test_failed_vector_write_leaves_no_partial_output(make_pdf, stamp_path, tmp_path, monkeypatch):
+    def broken_write(self, stream):
+        stream.write(b'%PDF-1.3\n')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(pdf_overlay.PyPDF2.PdfWriter, 'write', broken_write)
+    output_path = tmp_path / 'out.pdf'
+    infos = [{'path': stamp_path, 'pos': (10, 10), 'size': (40, 20)}]
+    with pytest.raises(OSError):
+        pdf_overlay.overlay_images_on_pdf(make_pdf([{'size': (200, 300)}]), infos, str(output_path), dpi=72)
+    assert not output_path.exists()
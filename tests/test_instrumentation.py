@@ -0,0 +1,19 @@
+import pytest
+from core import instrumentation
+
+
+@pytest.mark.skipif(not instrumentation.reset_peak_rss(), reason='최대 RSS를 초기화할 수 없는 환경')
+def test_stage_memory_is_measured_per_stage():
+    profiler = instrumentation.JobProfiler('doc.pdf')
+    with instrumentation.activate(profiler):
+        with instrumentation.stage('big'):
+            block = bytearray(64 * 1024 * 1024)
+            block[::4096] = b'\1' * len(block[::4096])
+            del block
+        with instrumentation.stage('small'):
+            pass
+    report = profiler.finish()
+    big = report['stages']['big']['window_peak_rss_bytes']
+    small = report['stages']['small']['window_peak_rss_bytes']
+    assert big - small > 32 * 1024 * 1024
+    assert report['window_peak_rss_bytes'] >= big
@@ -0,0 +1,90 @@
+import os
+import pytest
+from core import layout
+from core.manifest import JobManifest, input_signature
+
+
+@pytest.fixture
+def job(tmp_path, make_pdf, stamp_path):
+    pdf_path = make_pdf([{'size': (595, 842)}])
+    return {
+        'pdf_path': pdf_path,
+        'save_path': str(tmp_path / 'out' / 'input_edited.pdf'),
+        'stamps': [{'path': stamp_path, 'x': 0.1, 'y': 0.1, 'width': 0.2, 'height': 0.1}],
+        'dpi': 300,
+        'pages': 'first',
+        'engine': 'vector',
+        'encoding': 'standard',
+    }
+
+
+def _finish(manifest, job):
+    """작업자가 출력을 쓰고 입력 해시를 보고한 것처럼 기록"""
+    os.makedirs(os.path.dirname(job['save_path']), exist_ok=True)
+    with open(job['save_path'], 'wb') as file:
+        file.write(b'%PDF-1.4 output')
+    signature = input_signature(job['pdf_path'], layout.file_sha256(job['pdf_path']))
+    manifest.record(job, 'done', {'input': signature})
+    manifest.save(force=True)
+
+
+def _reload(job):
+    return JobManifest(os.path.dirname(job['save_path']))
+
+
+def test_unchanged_job_is_skipped_after_reload(job):
+    _finish(JobManifest(os.path.dirname(job['save_path'])), job)
+    pending, skipped = _reload(job).split([job])
+    assert pending == [] and skipped == [job]
+
+
+def test_changed_option_is_reprocessed(job):
+    _finish(JobManifest(os.path.dirname(job['save_path'])), job)
+    assert not _reload(job).is_up_to_date(dict(job, dpi=150))
+    assert not _reload(job).is_up_to_date(dict(job, pages='all'))
+
+
+def test_non_output_keys_do_not_change_fingerprint(job):
+    manifest = JobManifest(os.path.dirname(job['save_path']))
+    assert manifest.fingerprint(job) == manifest.fingerprint(dict(job, measure_savings=True, hash_input=True))
+
+
+def test_changed_stamp_content_is_reprocessed(job):
+    _finish(JobManifest(os.path.dirname(job['save_path'])), job)
+    with open(job['stamps'][0]['path'], 'ab') as file:
+        file.write(b'\0')
+    assert not _reload(job).is_up_to_date(job)
+
+
+def test_changed_input_is_reprocessed(job):
+    _finish(JobManifest(os.path.dirname(job['save_path'])), job)
+    with open(job['pdf_path'], 'ab') as file:
+        file.write(b'\n% changed\n')
+    assert not _reload(job).is_up_to_date(job)
+
+
+def test_touched_input_with_same_content_is_skipped(job):
+    _finish(JobManifest(os.path.dirname(job['save_path'])), job)
+    stat = os.stat(job['pdf_path'])
+    os.utime(job['pdf_path'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    manifest = _reload(job)
+    assert manifest.is_up_to_date(job)
+    # 새 수정 시각을 기록해 다음 비교에서는 해시를 다시 계산하지 않음
+    assert manifest.entries[os.path.abspath(job['pdf_path'])]['input']['mtime'] == os.stat(job['pdf_path']).st_mtime_ns
+
+
+def test_missing_or_modified_output_is_reprocessed(job):
+    _finish(JobManifest(os.path.dirname(job['save_path'])), job)
+    with open(job['save_path'], 'ab') as file:
+        file.write(b'extra')
+    assert not _reload(job).is_up_to_date(job)
+    os.remove(job['save_path'])
+    assert not _reload(job).is_up_to_date(job)
+
+
+def test_failed_job_is_retried(job):
+    manifest = JobManifest(os.path.dirname(job['save_path']))
+    os.makedirs(os.path.dirname(job['save_path']), exist_ok=True)
+    manifest.record(job, 'error', None, 'boom')
+    manifest.save(force=True)
+    assert not _reload(job).is_up_to_date(job)
@@ -0,0 +1,48 @@
+import pytest
+from core.page_selection import parse_page_rule, rule_from_options, select_pages
+
+A4 = (595.0, 842.0)
+A4_LANDSCAPE = (842.0, 595.0)
+LETTER = (612.0, 792.0)
+SIZES = [A4, A4_LANDSCAPE, LETTER, A4, A4_LANDSCAPE, A4]
+
+
+@pytest.mark.parametrize('rule, expected', [
+    ('first', [0]),
+    ('last', [5]),
+    ('all', [0, 1, 2, 3, 4, 5]),
+    ('odd', [0, 2, 4]),
+    ('even', [1, 3, 5]),
+    ('landscape', [1, 4]),
+    ('portrait', [0, 2, 3, 5]),
+    ('3', [2]),
+    ('2-4', [1, 2, 3]),
+    ('5-', [4, 5]),
+    ('-2', [0, 1]),
+    ('size:A4', [0, 1, 3, 4, 5]),
+    ('size:letter', [2]),
+    ('size:612x792', [2]),
+    ('first,last', [0, 5]),
+    ('odd&size:A4', [0, 4]),
+    ('1-3,odd&landscape', [0, 1, 2, 4]),
+    (' First , LAST ', [0, 5]),
+    ('7', []),
+])
+def test_select_pages(rule, expected):
+    assert select_pages(rule, SIZES) == expected
+
+
+def test_size_tolerance_ignores_rounding():
+    assert select_pages('size:A4', [(595.28, 841.89)]) == [0]
+
+
+@pytest.mark.parametrize('rule', ['', ' , ', 'middle', 'size:B0', 'size:axb', '3-x', '0', '0-3', '-0', '5-2', '1,4-3'])
+def test_invalid_rules_raise(rule):
+    with pytest.raises(ValueError):
+        parse_page_rule(rule)
+
+
+def test_rule_from_options():
+    assert rule_from_options('2-3', all_pages=True) == '2-3'
+    assert rule_from_options(None, all_pages=True) == 'all'
+    assert rule_from_options(None, all_pages=False) == 'first'
@@ -0,0 +1,104 @@
+import pytest
+from core import batch
+from core.pdf_metadata import read_pdf_metadata
+from core.placement import PlacementPlanner
+
+STAMPS = [{'path': 'stamp.png', 'x': 0.7, 'y': 0.8, 'width': 0.2, 'height': 0.1}]
+
+# (미디어박스 크기, 회전, 크롭박스)
+GEOMETRIES = [
+    ((595, 842), 0, None),
+    ((612, 792), 90, None),
+    ((842, 1191), 180, None),
+    ((595, 842), 270, None),
+    ((595, 842), 0, (50, 50, 545, 792)),
+    ((595, 842), 90, (40, 60, 500, 800)),
+]
+
+
+def _user_to_display(box, rotation, x, y):
+    """PDF 사용자 공간 좌표를 화면(왼쪽 위 원점, pt) 좌표로 변환 (pdf_overlay._display_to_user의 역변환)"""
+    left, bottom, right, top = box
+    if rotation == 90:
+        return y - bottom, x - left
+    if rotation == 180:
+        return right - x, y - bottom
+    if rotation == 270:
+        return top - y, right - x
+    return x - left, top - y
+
+
+def _apply(matrix, u, v):
+    a, b, c, d, e, f = matrix
+    return a * u + c * v + e, b * u + d * v + f
+
+
+@pytest.mark.parametrize('size, rotation, crop', GEOMETRIES)
+def test_vector_matrix_matches_raster_position(make_pdf, size, rotation, crop):
+    dpi = 150
+    pdf_path = make_pdf([{'size': size, 'rotation': rotation, 'crop': crop}])
+    metadata = read_pdf_metadata(pdf_path)
+    plan = PlacementPlanner(STAMPS, dpi).plan(metadata, [0])
+    transform = plan['classes'][plan['pages'][0]]
+    info, matrix = transform['insert_infos'][0], transform['matrices'][0]
+
+    scale = 72.0 / dpi
+    x, y = info['pos'][0] * scale, info['pos'][1] * scale
+    w, h = info['size'][0] * scale, info['size'][1] * scale
+    # 이미지 단위 정사각형의 모서리: (0,1)=왼쪽 위, (1,0)=오른쪽 아래
+    corners = {(0, 1): (x, y), (1, 0): (x + w, y + h), (0, 0): (x, y + h), (1, 1): (x + w, y)}
+    for (u, v), expected in corners.items():
+        actual = _user_to_display(transform['box'], rotation, *_apply(matrix, u, v))
+        assert actual == pytest.approx(expected, abs=1e-6)
+
+
+def test_displayed_size_uses_crop_box_and_rotation(make_pdf):
+    pdf_path = make_pdf([{'size': (595, 842), 'rotation': 90, 'crop': (50, 50, 545, 792)}])
+    assert read_pdf_metadata(pdf_path)['page_sizes'] == [(742.0, 495.0)]
+
+
+def test_same_geometry_shares_one_transform(make_pdf):
+    pdf_path = make_pdf([{'size': (595, 842)}, {'size': (612, 792), 'rotation': 90}, {'size': (595, 842)}])
+    planner = PlacementPlanner(STAMPS, 72)
+    plan = planner.plan(read_pdf_metadata(pdf_path), [0, 1, 2])
+    assert len(plan['classes']) == 2
+    assert plan['pages'] == {0: 0, 1: 1, 2: 0}
+    assert planner.geometry_count == 2
+
+
+def _stamp_bbox(pdf_path, page):
+    """렌더링한 페이지에서 빨간 스탬프가 차지하는 영역 (72dpi 픽셀)"""
+    pdfium = pytest.importorskip('pypdfium2')
+    document = pdfium.PdfDocument(pdf_path)
+    try:
+        image = document[page].render(scale=1).to_pil().convert('RGB')
+    finally:
+        document.close()
+    r, g, b = image.split()
+    red = r.point(lambda value: 255 if value > 200 else 0)
+    not_green = g.point(lambda value: 255 if value < 80 else 0)
+    mask = red.copy()
+    mask.paste(0, mask=not_green.point(lambda value: 255 - value))
+    return mask.getbbox()
+
+
+def test_raster_and_vector_engines_place_stamps_identically(tmp_path, make_pdf, stamp_path):
+    pytest.importorskip('pypdfium2')
+    pdf_path = make_pdf([{'size': size, 'rotation': rotation, 'crop': crop} for size, rotation, crop in GEOMETRIES])
+    stamps = [dict(STAMPS[0], path=stamp_path)]
+    outputs = {}
+    for engine in ('raster', 'vector'):
+        outputs[engine] = str(tmp_path / f'{engine}.pdf')
+        batch.process_pdf({'pdf_path': pdf_path, 'save_path': outputs[engine], 'stamps': stamps,
+                           'dpi': 72, 'pages': 'all', 'engine': engine, 'encoding': 'standard'})
+
+    metadata = read_pdf_metadata(pdf_path)
+    for page, (width, height) in enumerate(metadata['page_sizes']):
+        raster = _stamp_bbox(outputs['raster'], page)
+        vector = _stamp_bbox(outputs['vector'], page)
+        assert raster is not None and vector is not None
+        for raster_edge, vector_edge in zip(raster, vector):
+            assert abs(raster_edge - vector_edge) <= 2
+        # 스탬프가 페이지 상대 위치(0.7, 0.8)에 있는지 확인
+        assert abs(vector[0] - 0.7 * width) <= 2
+        assert abs(vector[1] - 0.8 * height) <= 2
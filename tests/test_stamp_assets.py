@@ -0,0 +1,30 @@
+from PIL import Image
+from core.stamp_assets import StampAsset
+
+
+def _gradient(size):
+    """알파가 낮은 영역이 있는 RGBA 그라데이션"""
+    width, height = size
+    image = Image.new('RGBA', size)
+    image.putdata([(x * 255 // width, y * 255 // height, 128, (x + y) * 255 // (width + height))
+                   for y in range(height) for x in range(width)])
+    return image
+
+
+def test_export_render_matches_direct_lanczos():
+    image = _gradient((400, 300))
+    asset = StampAsset('sha', image)
+    for size in ((200, 150), (90, 40), (400, 300), (640, 480)):
+        assert asset.render(size).tobytes() == image.resize(size, Image.LANCZOS).tobytes()
+
+
+def test_mip_levels_exclude_full_size():
+    asset = StampAsset('sha', _gradient((400, 300)))
+    assert [level.size for level in asset.mip_levels()] == [(200, 150), (100, 75), (50, 38)]
+    assert asset.memory_bytes() == (400 * 300 + 200 * 150 + 100 * 75 + 50 * 38) * 4
+
+
+def test_fast_render_uses_reduced_level():
+    asset = StampAsset('sha', _gradient((400, 300)))
+    preview = asset.render((100, 75), Image.BILINEAR, fast=True)
+    assert preview.mode == 'RGBA' and preview.size == (100, 75)